@@ -0,0 +1,63 @@
+"""
+Tunable parameters of the simulated annealing solver and the space the tuner searches.
+"""
+import json
+from typing import Any, Dict, Optional
+
+# Hand-picked defaults; SimulatedAnnealing(**DEFAULT_CONFIG) behaves exactly like the untuned solver
+DEFAULT_CONFIG: Dict[str, Any] = {
+    "initial_temp": 100.0,
+    "cooling_rate": 0.95,
+    "large_cooling_rate": 0.98,
+    "min_temp": 0.1,
+    "reheat_interval": 1000,
+    "large_threshold": 100,         # n or m above this switches to the large-instance strategies
+    "max_stagnation": 2000,
+    "large_max_stagnation": 5000,
+    "move_probs": None,             # Fixed (remove, add, swap) probabilities, None for the adaptive ones
+}
+
+# name -> (kind, low, high); "log" parameters are sampled uniformly in log space
+PARAM_SPACE = {
+    "initial_temp": ("log", 1.0, 1000.0),
+    "cooling_rate": ("real", 0.8, 0.999),
+    "large_cooling_rate": ("real", 0.9, 0.9999),
+    "min_temp": ("log", 0.001, 1.0),
+    "reheat_interval": ("int", 100, 10000),
+    "large_threshold": ("int", 20, 1000),
+    "max_stagnation": ("int", 500, 20000),
+    "large_max_stagnation": ("int", 1000, 50000),
+    "move_probs": ("simplex", 0.05, 0.9),
+}
+
+
+def validate_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Defaults completed with the given values, rejecting unknown names and malformed move probabilities."""
+    unknown = sorted(set(config) - set(DEFAULT_CONFIG))
+    if unknown:
+        raise ValueError(f"Unknown SA parameters: {', '.join(unknown)}")
+    merged = dict(DEFAULT_CONFIG)
+    merged.update(config)
+    probs = merged["move_probs"]
+    if probs is not None:
+        if len(probs) != 3 or min(probs) < 0 or abs(sum(probs) - 1.0) > 1e-6:
+            raise ValueError(f"move_probs must be three non-negative probabilities summing to 1, got {probs}")
+        merged["move_probs"] = tuple(probs)
+    return merged
+
+
+def load_config(path: str) -> Dict[str, Any]:
+    """Read a tuned configuration file; the parameters sit under "config"."""
+    with open(path, "r") as f:
+        data = json.load(f)
+    return validate_config(data.get("config", data))
+
+
+def save_config(config: Dict[str, Any], path: str, meta: Optional[Dict[str, Any]] = None):
+    """Write a configuration, with optional tuning metadata alongside it."""
+    data = {"config": validate_config(config)}
+    if meta:
+        data["meta"] = meta
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
@@ -2,7 +2,15 @@
 Neighborhood generation for the simulated annealing algorithm.
 """
 import random
-from typing import List, Set, Tuple
+from bisect import bisect
+from itertools import accumulate
+from typing import Dict, List, Optional, Tuple
+
+from LS1.solution import NO_SUBSET, Solution
+from core.tabu import TabuList
+
+# Random draws attempted before accepting a tabu subset anyway
+TABU_DRAWS = 3
 
 def get_move_probabilities(iter_count: int, sol_size: int, is_large: bool) -> Tuple[float, float, float]:
     """Get dynamic move probabilities based on solution state."""
@@ -23,133 +31,123 @@ def get_move_probabilities(iter_count: int, sol_size: int, is_large: bool) -> Tu
         # Later stage - balanced approach
         return 0.4, 0.4, 0.2
 
-def generate_neighbor(curr_sol: List[int], subsets: List[Set[int]], universe: Set[int], 
-                      iter_count: int, is_large: bool) -> List[int]:
-    """Create neighboring solution through strategic moves."""
-    # Make a copy to avoid modifying the original
-    neighbor = curr_sol.copy()
+def _weighted_top_choice(gains: Dict[int, float], tabu: Optional[TabuList], rng: random.Random) -> int:
+    """Pick among the best-covering candidates with probability proportional to coverage."""
+    if tabu is None:
+        candidates = sorted(gains.items(), key=lambda x: x[1], reverse=True)
+    else:
+        # Break coverage ties in favour of the longest-unmoved subsets
+        candidates = sorted(gains.items(), key=lambda x: (-x[1], tabu.age_key(x[0])))
+    top_k = candidates[:max(3, len(candidates)//5)]
+    # The draw random.choices(k=1) makes, without building its population and weight lists
+    cum_weights = list(accumulate(c[1] for c in top_k))
+    return top_k[bisect(cum_weights, rng.random() * cum_weights[-1], 0, len(top_k) - 1)][0]
+
+def _random_member(sol: Solution, tabu: Optional[TabuList], iter_count: int) -> int:
+    """Random selected subset, redrawing a few times to avoid tabu ones."""
+    idx = sol.random_member()
+    if tabu is not None:
+        for _ in range(TABU_DRAWS):
+            if tabu.can_remove(idx, iter_count):
+                break
+            idx = sol.random_member()
+    return idx
+
+def _random_non_member(sol: Solution, tabu: Optional[TabuList], iter_count: int) -> int:
+    """Random unselected subset, redrawing a few times to avoid tabu ones."""
+    idx = sol.random_non_member()
+    if tabu is not None:
+        for _ in range(TABU_DRAWS):
+            if tabu.can_add(idx, iter_count):
+                break
+            idx = sol.random_non_member()
+    return idx
+
+def generate_move(sol: Solution, elem_subsets: List[List[int]], iter_count: int,
+                  is_large: bool, tabu: Optional[TabuList] = None,
+                  multipliers: Optional[List[float]] = None,
+                  move_probs: Optional[Tuple[float, float, float]] = None) -> Tuple[int, int]:
+    """Choose a strategic (out_idx, in_idx) move to apply to the solution in place.
+
+    When a TabuList is given, subsets it forbids are filtered out of the candidate lists.
+    With Lagrangian multipliers, each element a candidate would cover counts 1 + u_e instead
+    of 1, so candidates covering hard-to-cover elements are preferred. Fixed move_probs
+    replace the adaptive move-type probabilities. Random draws come from the solution's rng.
+    """
+    subsets = sol.subsets
+    count = sol.cover_count
+    rng = sol.rng
     
     # Determine move type probabilities
-    remove_prob, add_prob, swap_prob = get_move_probabilities(iter_count, len(neighbor), is_large)
+    if move_probs is None:
+        move_probs = get_move_probabilities(iter_count, len(sol), is_large)
+    remove_prob, add_prob, swap_prob = move_probs
     
     # Select a move type randomly according to probabilities
-    move_type = random.random()
+    move_type = rng.random()
     
     # ===== REMOVAL MOVE =====
-    if move_type < remove_prob and len(neighbor) > 0:
-        # Look for redundant subsets (those we can safely remove)
-        redundant = []
-        for idx in neighbor:
-            # Check if solution remains valid without this subset
-            temp_sol = [i for i in neighbor if i != idx]
-            if temp_sol:
-                covered = set().union(*[subsets[i] for i in temp_sol])
-                if covered == universe:
-                    redundant.append(idx)
-        
-        if redundant:
-            # Prefer removing redundant subsets most of the time
-            # but occasionally remove randomly to escape local optima
-            idx_to_remove = random.choice(redundant if random.random() < 0.7 else neighbor)
-            neighbor.remove(idx_to_remove)
-        else:
-            # No redundant subset - remove randomly and accept if feasible
-            idx_to_remove = random.choice(neighbor)
-            neighbor.remove(idx_to_remove)
+    if move_type < remove_prob and len(sol) > 0:
+        # Redundant subsets (safe to remove) are those whose elements are all covered twice
+        if rng.random() < 0.7:
+            redundant = [idx for idx in sol.members()
+                         if all(count[e] > 1 for e in subsets[idx])
+                         and (tabu is None or tabu.can_remove(idx, iter_count))]
+            if redundant:
+                return rng.choice(redundant), NO_SUBSET
+        # No redundant subset or escaping local optima - remove randomly and accept if feasible
+        return _random_member(sol, tabu, iter_count), NO_SUBSET
     
     # ===== ADDITION MOVE =====
     elif move_type < remove_prob + add_prob:
-        # Calculate current coverage
-        curr_covered = set().union(*[subsets[i] for i in neighbor]) if neighbor else set()
-        uncovered = universe - curr_covered
-        
         # If some elements are uncovered, try to target them
-        if uncovered and random.random() < 0.8:
-            # Find subsets that cover at least one uncovered element
-            candidates = []
-            for i in range(len(subsets)):
-                if i not in neighbor and subsets[i] & uncovered:
-                    # Score by how many uncovered elements this subset covers
-                    uncovered_count = len(subsets[i] & uncovered)
-                    candidates.append((i, uncovered_count))
+        if sol.uncovered and rng.random() < 0.8:
+            # Score subsets not in solution by how many uncovered elements they cover
+            gains = {}
+            for e in range(1, len(count)):
+                if count[e] == 0:
+                    for i in elem_subsets[e]:
+                        if i not in sol and (tabu is None or tabu.can_add(i, iter_count)):
+                            gains[i] = gains.get(i, 0) + (1 if multipliers is None else 1 + multipliers[e])
             
-            if candidates:
-                # Sort by coverage and select from top candidates
-                # with preference to those covering more elements
-                candidates.sort(key=lambda x: x[1], reverse=True)
-                top_k = candidates[:max(3, len(candidates)//5)]
-                idx_to_add = random.choices(
-                    [c[0] for c in top_k],
-                    weights=[c[1] for c in top_k],
-                    k=1
-                )[0]
-                neighbor.append(idx_to_add)
-                return neighbor
+            if gains:
+                return NO_SUBSET, _weighted_top_choice(gains, tabu, rng)
         
         # Otherwise, add a random subset not already in solution
-        available = list(set(range(len(subsets))) - set(neighbor))
-        if available:
-            idx_to_add = random.choice(available)
-            neighbor.append(idx_to_add)
+        if len(sol) < sol.m:
+            return NO_SUBSET, _random_non_member(sol, tabu, iter_count)
     
     # ===== SWAP MOVE =====
     else:
-        if len(neighbor) > 0:
-            # Get available subsets (not in solution)
-            available = list(set(range(len(subsets))) - set(neighbor))
-            if available:
-                # For large instances, try more intelligent swaps
-                if is_large and random.random() < 0.7:
-                    # Calculate uniqueness of each subset in solution
-                    # (how many elements would become uncovered if removed)
-                    unique_scores = []
-                    for idx in neighbor:
-                        subset = subsets[idx]
-                        unique_count = 0
-                        # Count elements uniquely covered by this subset
-                        for elem in subset:
-                            covered_elsewhere = sum(1 for i in neighbor if i != idx and elem in subsets[i])
-                            if covered_elsewhere == 0:
-                                unique_count += 1
-                        unique_scores.append((idx, unique_count))
-                    
-                    # Prefer to swap out less critical subsets
-                    unique_scores.sort(key=lambda x: x[1])
-                    idx_to_remove = unique_scores[0][0] if unique_scores else random.choice(neighbor)
-                    position = neighbor.index(idx_to_remove)
-                else:
-                    # Random selection for small instances
-                    position = random.choice(range(len(neighbor)))
-                    idx_to_remove = neighbor[position]
-                
-                # Choose replacement intelligently for large instances
-                if is_large and random.random() < 0.7:
-                    # Check what would be uncovered after removal
-                    temp_sol = [i for i in neighbor if i != idx_to_remove]
-                    temp_covered = set().union(*[subsets[i] for i in temp_sol]) if temp_sol else set()
-                    needed_coverage = universe - temp_covered
-                    
-                    # Find subsets that help cover the gap
-                    swap_candidates = []
-                    for idx in available:
-                        coverage = len(subsets[idx] & needed_coverage)
-                        if coverage > 0:
-                            swap_candidates.append((idx, coverage))
-                    
-                    if swap_candidates:
-                        # Choose based on coverage with some randomness
-                        swap_candidates.sort(key=lambda x: x[1], reverse=True)
-                        top_candidates = swap_candidates[:max(3, len(swap_candidates)//5)]
-                        idx_to_add = random.choices(
-                            [c[0] for c in top_candidates],
-                            weights=[c[1] for c in top_candidates],
-                            k=1
-                        )[0]
-                        neighbor[position] = idx_to_add
-                        return neighbor
+        if 0 < len(sol) < sol.m:
+            # For large instances, try more intelligent swaps
+            if is_large and rng.random() < 0.7:
+                # Prefer to swap out the subset covering the fewest elements uniquely
+                # (how many elements would become uncovered if removed)
+                members = sol.members()
+                if tabu is not None:
+                    members = [idx for idx in members if tabu.can_remove(idx, iter_count)] or members
+                idx_to_remove = min(members,
+                                    key=lambda idx: sum(1 for e in subsets[idx] if count[e] == 1))
+            else:
+                # Random selection for small instances
+                idx_to_remove = _random_member(sol, tabu, iter_count)
+            
+            # Choose replacement intelligently for large instances
+            if is_large and rng.random() < 0.7:
+                # Find subsets that help cover what the removal would leave uncovered
+                gains = {}
+                for e in subsets[idx_to_remove]:
+                    if count[e] == 1:
+                        for i in elem_subsets[e]:
+                            if i not in sol and (tabu is None or tabu.can_add(i, iter_count)):
+                                gains[i] = gains.get(i, 0) + (1 if multipliers is None else 1 + multipliers[e])
                 
-                # Fall back to random choice
-                idx_to_add = random.choice(available)
-                neighbor[position] = idx_to_add
+                if gains:
+                    # Choose based on coverage with some randomness
+                    return idx_to_remove, _weighted_top_choice(gains, tabu, rng)
+            
+            # Fall back to random choice
+            return idx_to_remove, _random_non_member(sol, tabu, iter_count)
     
-    return neighbor 
\ No newline at end of file
+    return NO_SUBSET, NO_SUBSET
@@ -3,17 +3,30 @@ Core implementation of simulated annealing for the Minimum Set Cover problem.
 """
 import time
 import random
-from typing import List, Set, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
-from LS1.solution import get_initial_solution, evaluate_solution
-from LS1.neighborhood import generate_neighbor
+from LS1.config import validate_config
+from LS1.solution import NO_SUBSET, Solution, get_initial_solution
+from LS1.neighborhood import generate_move
 from LS1.temperature import calculate_acceptance_probability, update_temperature
+from core.instance import build_element_index
+from core.tabu import DEFAULT_TENURE, TabuList
+
+# Iterations between two checks of a checkpoint's interval or the shared incumbent
+CHECKPOINT_CHECK_ITERS = 256
 
 class SimulatedAnnealing:
     """Simulated annealing solver for Minimum Set Cover."""
     
     def __init__(self, n: int, subsets: List[Set[int]], initial_temp: float = 100.0,
-                 cooling_rate: float = 0.95, min_temp: float = 0.1, seed: int = 42):
+                 cooling_rate: float = 0.95, min_temp: float = 0.1, seed: int = 42,
+                 use_tabu: bool = False, tabu_tenure: int = DEFAULT_TENURE,
+                 multipliers: Optional[List[float]] = None,
+                 elem_subsets: Optional[List[List[int]]] = None,
+                 large_cooling_rate: float = 0.98, reheat_interval: int = 1000,
+                 large_threshold: int = 100, max_stagnation: int = 2000,
+                 large_max_stagnation: int = 5000,
+                 move_probs: Optional[Tuple[float, float, float]] = None):
         # Initialize problem parameters
         self.n = n
         self.subsets = subsets
@@ -25,63 +38,130 @@ class SimulatedAnnealing:
         self.min_temp = min_temp
         self.seed = seed
         
-        # Set random seed for reproducibility
-        random.seed(self.seed)
+        # Fixed (remove, add, swap) probabilities; None keeps the adaptive ones
+        self.move_probs = move_probs
+        
+        # Anti-cycling memory (tabu tenure + configuration checking)
+        self.use_tabu = use_tabu
+        self.tabu_tenure = tabu_tenure
+        
+        # Lagrangian multipliers used to prioritize candidates (see core/lagrangian.py)
+        self.multipliers = multipliers
+        
+        # Own random stream, so runs in one process do not disturb each other's draws
+        self.rng = random.Random(self.seed)
         
         # Precompute metrics to speed up evaluation
         self.subset_sizes = [len(s) for s in subsets]
         self.indices = list(range(len(subsets)))
         self.coverage_ratio = [len(s) / n for s in subsets]
         
-        # Calculate frequency of each element for smarter moves
-        self.elem_freq = {}
-        for e in self.universe:
-            self.elem_freq[e] = sum(1 for s in subsets if e in s)
+        # Subsets containing each element (reused when the caller already maintains it), and the
+        # resulting element frequencies
+        self.elem_subsets = elem_subsets if elem_subsets is not None else build_element_index(n, subsets)
+        self.elem_freq = {e: len(self.elem_subsets[e]) for e in self.universe}
             
         # Params for large instances
-        self.reheat_interval = 1000
-        self.is_large = n > 100 or len(subsets) > 100
+        self.reheat_interval = reheat_interval
+        self.is_large = n > large_threshold or len(subsets) > large_threshold
+        self.max_stagnation = large_max_stagnation if self.is_large else max_stagnation
         if self.is_large:
             # Use slower cooling for large instances
-            self.cool_rate = 0.98
+            self.cool_rate = large_cooling_rate
     
-    def solve(self, cutoff_time: float, start_time: float) -> Tuple[int, List[int], List[Tuple[float, int]]]:
-        # Reset random seed for each run
-        random.seed(self.seed)
-        
-        # Get greedy starting solution
-        curr_sol = get_initial_solution(self.n, self.subsets, self.is_large)
-        curr_cost, curr_feasible = evaluate_solution(curr_sol, self.subsets, self.universe)
-        
-        # Initialize best solution tracking
-        best_sol = curr_sol.copy()
-        best_cost = curr_cost
+    @classmethod
+    def from_config(cls, n: int, subsets: List[Set[int]], config: Dict[str, Any], **kwargs) -> "SimulatedAnnealing":
+        """Solver with the parameters of a (tuned) configuration, see LS1/config.py."""
+        return cls(n, subsets, **validate_config(config), **kwargs)
+    
+    def solve(self, cutoff_time: float, start_time: float, initial_solution: Optional[List[int]] = None,
+              checkpoint=None, incumbent=None,
+              lower_bound: Optional[int] = None) -> Tuple[int, List[int], List[Tuple[float, int]]]:
+        """Anneal until the cutoff, the minimum temperature or stagnation.
         
-        # Set up temperature and progress tracking
-        temp = self.init_temp
-        trace = [(time.time() - start_time, best_cost)]
+        With a core.checkpoint.Checkpoint the run state (current solution layout, best solution,
+        temperature, RNG state, counters, tabu memory) is saved every interval, and a resumed
+        state is picked up in place of a fresh start. With a core.incumbent.SharedIncumbent new best
+        covers are published, a better shared cover becomes the current solution, and the run ends
+        once another solver finishes it. A cover reaching lower_bound (see core/bounds.py) is
+        optimal and ends the run at once.
+        """
+        # Restart the stream for each run
+        self.rng.seed(self.seed)
         
-        # Iteration counters
-        iter_count = 0
-        plateau_len = 0
-        last_improv = 0
+        # Fresh tabu memory per run; plateau moves are always taken when it guards against cycling
+        tabu = TabuList(self.subsets, self.elem_subsets, self.tabu_tenure) if self.use_tabu else None
+        plateau_prob = 1.0 if self.use_tabu else 0.5
         
-        # Set stopping criteria based on problem size
-        max_stagnation = 5000 if self.is_large else 2000
+        resumed = checkpoint.resumed if checkpoint is not None else None
+        if resumed is not None:
+            # Continue exactly where the checkpointed run stopped, on the clock of the whole run
+            start_time = time.time() - resumed["elapsed"]
+            curr_sol = Solution(self.n, self.subsets, resumed["order"][:resumed["size"]], self.rng)
+            curr_sol.reorder(resumed["order"])
+            best_sol, best_cost, trace = resumed["best_sol"], resumed["best_cost"], resumed["trace"]
+            temp = resumed["temp"]
+            iter_count, plateau_len, last_improv = resumed["counters"]
+            self.rng.setstate(resumed["rng"])
+            if tabu is not None and resumed["tabu"] is not None:
+                tabu.tabu_until, tabu.conf_changed, tabu.last_moved = resumed["tabu"]
+        else:
+            # Start from the given cover (e.g. a cached one), or a greedy one
+            if initial_solution is None:
+                initial_solution = get_initial_solution(self.n, self.subsets, self.is_large)
+            curr_sol = Solution(self.n, self.subsets, initial_solution, self.rng)
+            
+            # Initialize best solution tracking
+            best_sol = curr_sol.members()
+            best_cost = len(curr_sol)
+            
+            # Set up temperature and progress tracking
+            temp = self.init_temp
+            trace = [(time.time() - start_time, best_cost)]
+            
+            # Iteration counters
+            iter_count = 0
+            plateau_len = 0
+            last_improv = 0
+        curr_cost, curr_feasible = len(curr_sol), curr_sol.is_feasible()
         
         # Main SA loop
-        while time.time() - start_time < cutoff_time and temp > self.min_temp:
-            # Get neighboring solution
-            neighbor = generate_neighbor(
+        proven = lower_bound is not None and best_cost <= lower_bound
+        while not proven and time.time() - start_time < cutoff_time and temp > self.min_temp:
+            if checkpoint is not None and iter_count % CHECKPOINT_CHECK_ITERS == 0 and checkpoint.due():
+                checkpoint.save({
+                    "order": curr_sol.order, "size": len(curr_sol),
+                    "best_sol": best_sol, "best_cost": best_cost, "trace": trace,
+                    "temp": temp, "counters": (iter_count, plateau_len, last_improv),
+                    "rng": self.rng.getstate(),
+                    "tabu": (tabu.tabu_until, tabu.conf_changed, tabu.last_moved) if tabu is not None else None,
+                    "elapsed": time.time() - start_time,
+                })
+            if incumbent is not None and iter_count % CHECKPOINT_CHECK_ITERS == 0:
+                if incumbent.finished():
+                    break
+                if incumbent.best_size() < best_cost:
+                    # Another solver holds a better cover: continue from it
+                    best_cost, best_sol = incumbent.fetch()
+                    curr_sol = Solution(self.n, self.subsets, best_sol, self.rng)
+                    curr_cost, curr_feasible = best_cost, True
+                    proven = lower_bound is not None and best_cost <= lower_bound
+                    last_improv = iter_count
+            
+            # Move to the neighboring solution in place
+            move = generate_move(
                 curr_sol, 
-                self.subsets, 
-                self.universe, 
+                self.elem_subsets, 
                 iter_count, 
-                self.is_large
+                self.is_large,
+                tabu,
+                self.multipliers,
+                self.move_probs
             )
+            curr_sol.apply(move)
             
             # Evaluate new solution
-            neighbor_cost, neighbor_feasible = evaluate_solution(neighbor, self.subsets, self.universe)
+            neighbor_cost, neighbor_feasible = len(curr_sol), curr_sol.is_feasible()
             
             # Calculate probability of accepting this neighbor
             accept_prob = calculate_acceptance_probability(
@@ -91,30 +171,41 @@ class SimulatedAnnealing:
                 neighbor_feasible, 
                 temp, 
                 iter_count, 
-                self.is_large
+                self.is_large,
+                plateau_prob
             )
             
             # Decide whether to accept the neighbor
-            if random.random() < accept_prob:
-                curr_sol = neighbor
+            if self.rng.random() < accept_prob:
                 curr_cost = neighbor_cost
                 curr_feasible = neighbor_feasible
                 
+                # Remember the flipped subsets
+                if tabu is not None:
+                    for idx in move:
+                        if idx != NO_SUBSET:
+                            tabu.record(idx, iter_count)
+                
                 # Check if we found a better solution
                 if curr_feasible and curr_cost <= best_cost:
                     if curr_cost < best_cost:
                         # New best solution found
-                        best_sol = curr_sol.copy()
+                        best_sol = curr_sol.members()
                         best_cost = curr_cost
                         trace.append((time.time() - start_time, best_cost))
+                        if incumbent is not None:
+                            incumbent.offer(best_sol)
+                        if lower_bound is not None and best_cost <= lower_bound:
+                            # Proven optimal, nothing left to improve
+                            break
                         plateau_len = 0
                         last_improv = iter_count
                     elif curr_cost == best_cost:
                         # Equal quality solution found
                         plateau_len += 1
-                        # Store alternative solutions occasionally
-                        if plateau_len % 100 == 0 and curr_sol != best_sol:
-                            alt_sol = curr_sol.copy()
+            else:
+                # Rejected - step back to the current solution
+                curr_sol.undo(move)
             
             # Cool down temperature according to schedule
             temp = update_temperature(
@@ -130,7 +221,7 @@ class SimulatedAnnealing:
             iter_count += 1
             
             # Early stopping if no improvement for a while
-            if iter_count - last_improv > max_stagnation:
+            if iter_count - last_improv > self.max_stagnation:
                 break
         
         # Return (cost, solution, history)
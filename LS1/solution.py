@@ -3,13 +3,136 @@ Solution creation and evaluation for the Minimum Set Cover problem.
 """
 import heapq
 import random
-from typing import List, Set, Tuple
+from array import array
+from typing import Iterable, List, Optional, Sequence, Set, Tuple
 
-def get_initial_solution(n: int, subsets: List[Set[int]], is_large: bool = False, seed: int = 42) -> List[int]:
-    """Generate initial solution using greedy strategy."""
-    # Set random seed for reproducibility
-    random.seed(seed)
-    
+# Moves are (out_idx, in_idx) pairs; NO_SUBSET marks the missing side of an add or remove
+NO_SUBSET = -1
+
+
+class Solution:
+    """Mutable cover with O(1) membership, add, remove and random sampling.
+
+    The first `size` entries of `order` are the selected subsets and the rest are the
+    unselected ones, with `pos` mapping each subset to its slot. Per-element cover counts
+    keep feasibility up to date incrementally, so neighbors are applied in place and
+    undone on rejection instead of being copied. Random sampling and the moves generated
+    on the solution draw from `rng`, the stream of the solver that owns it.
+    """
+
+    __slots__ = ("subsets", "m", "order", "pos", "size", "selected", "cover_count", "uncovered", "rng")
+
+    def __init__(self, n: int, subsets: Sequence[Set[int]], indices: Iterable[int] = (),
+                 rng: Optional[random.Random] = None):
+        self.subsets = subsets
+        self.rng = rng if rng is not None else random.Random()
+        self.m = len(subsets)
+        self.order = array("i", range(self.m))
+        self.pos = array("i", range(self.m))
+        self.size = 0
+        self.selected = bytearray(self.m)       # Membership bitmap
+        self.cover_count = array("i", [0]) * (n + 1)
+        self.uncovered = n
+        for i in indices:
+            self.add(i)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, i: int) -> bool:
+        return self.selected[i] == 1
+
+    def _swap_slots(self, i: int, slot: int):
+        """Move subset i into `slot`, sending the subset there to i's old slot."""
+        other = self.order[slot]
+        old = self.pos[i]
+        self.order[old] = other
+        self.pos[other] = old
+        self.order[slot] = i
+        self.pos[i] = slot
+
+    def add(self, i: int):
+        self._swap_slots(i, self.size)
+        self.size += 1
+        self.selected[i] = 1
+        count = self.cover_count
+        for e in self.subsets[i]:
+            if count[e] == 0:
+                self.uncovered -= 1
+            count[e] += 1
+
+    def remove(self, i: int):
+        self.size -= 1
+        self._swap_slots(i, self.size)
+        self.selected[i] = 0
+        count = self.cover_count
+        for e in self.subsets[i]:
+            count[e] -= 1
+            if count[e] == 0:
+                self.uncovered += 1
+
+    def apply(self, move: Tuple[int, int]):
+        out_idx, in_idx = move
+        if out_idx != NO_SUBSET:
+            self.remove(out_idx)
+        if in_idx != NO_SUBSET:
+            self.add(in_idx)
+
+    def undo(self, move: Tuple[int, int]):
+        out_idx, in_idx = move
+        if in_idx != NO_SUBSET:
+            self.remove(in_idx)
+        if out_idx != NO_SUBSET:
+            self.add(out_idx)
+
+    def is_feasible(self) -> bool:
+        return self.size > 0 and self.uncovered == 0
+
+    def random_member(self) -> int:
+        return self.order[self.rng.randrange(self.size)]
+
+    def random_non_member(self) -> int:
+        return self.order[self.size + self.rng.randrange(self.m - self.size)]
+
+    def members(self) -> List[int]:
+        """Snapshot of the selected subset indices."""
+        return self.order[:self.size].tolist()
+
+    def reorder(self, order: Sequence[int]):
+        """Adopt a saved slot layout with the same members first, as random sampling depends on it."""
+        self.order = array("i", order)
+        for slot, i in enumerate(self.order):
+            self.pos[i] = slot
+
+    def grow_subsets(self):
+        """Make room for a subset appended to `subsets` (it starts unselected)."""
+        self.order.append(self.m)
+        self.pos.append(self.m)
+        self.selected.append(0)
+        self.m += 1
+
+    def shrink_subsets(self):
+        """Forget the last subset, which must not be selected."""
+        last = self.m - 1
+        self._swap_slots(last, last)
+        self.order.pop()
+        self.pos.pop()
+        self.selected.pop()
+        self.m = last
+
+    def grow_elements(self):
+        """Track a new, still uncovered element n + 1."""
+        self.cover_count.append(0)
+        self.uncovered += 1
+
+    def shrink_elements(self):
+        """Forget the last element, which must no longer be in any selected subset."""
+        if self.cover_count.pop() == 0:
+            self.uncovered -= 1
+
+
+def get_initial_solution(n: int, subsets: List[Set[int]], is_large: bool = False) -> List[int]:
+    """Generate initial solution using greedy strategy (deterministic, it draws no random numbers)."""
     # Setup
     universe = set(range(1, n + 1))
     selected = []
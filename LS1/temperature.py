@@ -4,7 +4,7 @@ Temperature control functions for simulated annealing.
 import math
 
 def calculate_acceptance_probability(old_cost, new_cost, old_feasible, new_feasible, 
-                                    temp, iter_count, is_large):
+                                    temp, iter_count, is_large, plateau_prob=0.5):
     """Calculate probability of accepting a new solution."""
     # Always accept if new solution is better and feasible
     if new_feasible and (not old_feasible or new_cost < old_cost):
@@ -14,10 +14,10 @@ def calculate_acceptance_probability(old_cost, new_cost, old_feasible, new_feasi
     if not new_feasible:
         return 0.0
     
-    # Accept equally good solutions with medium probability
-    # This helps explore plateaus in the solution space
+    # Accept equally good solutions with medium probability (always when tabu
+    # memory prevents cycling). This helps explore plateaus in the solution space
     if new_cost == old_cost:
-        return 0.5
+        return plateau_prob
     
     # Standard Metropolis criterion for worse solutions
     delta = old_cost - new_cost
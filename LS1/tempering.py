@@ -0,0 +1,203 @@
+"""
+Parallel tempering (replica exchange) on top of the simulated annealing moves.
+
+N replicas run Metropolis chains at fixed, geometrically spaced temperatures, each in its own process
+attached to one shared-memory copy of the instance (core/shm.py). After every swap_interval moves the
+replicas report their cover sizes, and neighbouring temperature levels attempt a Metropolis swap of
+their configurations, accepted with probability min(1, exp((1/T_i - 1/T_j) * (E_i - E_j))). Swapping is
+done by exchanging the temperatures of the two replicas, which is equivalent and moves no solution
+between processes. Cold replicas refine good covers while hot ones keep exploring and hand their
+finds down the ladder.
+
+Of a tuned LS1 configuration (LS1/config.py) the replicas use the parts that do not concern the cooling
+schedule, large_threshold and move_probs, and with use_tabu each replica keeps its own tabu memory.
+"""
+import math
+import multiprocessing as mp
+import random
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from core.instance import Instance, build_element_index
+from core.shm import attach, detach, publish
+from core.tabu import DEFAULT_TENURE, TabuList
+from LS1.config import validate_config
+from LS1.neighborhood import generate_move
+from LS1.solution import NO_SUBSET, Solution, get_initial_solution
+from LS1.temperature import calculate_acceptance_probability
+
+DEFAULT_REPLICAS = 4
+DEFAULT_T_MIN = 0.3
+DEFAULT_T_MAX = 5.0
+DEFAULT_SWAP_INTERVAL = 500    # Moves per replica between swap attempts
+
+
+def temperature_ladder(replicas: int, t_min: float, t_max: float) -> List[float]:
+    """Geometrically spaced temperatures from t_min (coldest) to t_max."""
+    if replicas == 1:
+        return [t_min]
+    ratio = (t_max / t_min) ** (1 / (replicas - 1))
+    return [t_min * ratio ** k for k in range(replicas)]
+
+
+class Replica:
+    """One fixed-temperature chain, kept alive across swap rounds."""
+
+    def __init__(self, n: int, subsets, initial: List[int], is_large: bool,
+                 multipliers: Optional[List[float]] = None, seed: int = 42,
+                 move_probs: Optional[Tuple[float, float, float]] = None, tabu_tenure: Optional[int] = None):
+        self.rng = random.Random(seed)
+        self.sol = Solution(n, subsets, initial, self.rng)
+        self.elem_subsets = build_element_index(n, subsets)
+        self.is_large = is_large
+        self.multipliers = multipliers
+        self.move_probs = move_probs
+        # Tabu memory when a tenure is given; plateau moves are then always taken, as in SimulatedAnnealing
+        self.tabu = TabuList(subsets, self.elem_subsets, tabu_tenure) if tabu_tenure is not None else None
+        self.plateau_prob = 1.0 if self.tabu is not None else 0.5
+        self.cost = len(self.sol)
+        self.best_cost = self.cost
+        self.best_sol = self.sol.members()
+        self.iter_count = 0
+
+    def run(self, temp: float, moves: int, deadline: float) -> bool:
+        """Make up to `moves` Metropolis moves at temp; returns True if the best cover improved."""
+        improved = False
+        sol = self.sol
+        for step in range(moves):
+            if step % 64 == 0 and time.time() >= deadline:
+                break
+            move = generate_move(sol, self.elem_subsets, self.iter_count, self.is_large, self.tabu,
+                                 self.multipliers, self.move_probs)
+            sol.apply(move)
+            new_cost, feasible = len(sol), sol.is_feasible()
+            # Chains stay feasible, so the cover size is the energy
+            accept_prob = calculate_acceptance_probability(self.cost, new_cost, True, feasible, temp,
+                                                           self.iter_count, self.is_large, self.plateau_prob)
+            if self.rng.random() < accept_prob:
+                self.cost = new_cost
+                if self.tabu is not None:
+                    for idx in move:
+                        if idx != NO_SUBSET:
+                            self.tabu.record(idx, self.iter_count)
+                if new_cost < self.best_cost:
+                    self.best_cost = new_cost
+                    self.best_sol = sol.members()
+                    improved = True
+            else:
+                sol.undo(move)
+            self.iter_count += 1
+        return improved
+
+
+def _replica_main(conn, shm_name: str, seed: int, initial: List[int], is_large: bool,
+                  multipliers: Optional[List[float]], move_probs: Optional[Tuple[float, float, float]],
+                  tabu_tenure: Optional[int]):
+    """Worker process: serve ("run", temp, moves, deadline, start_time) requests until ("stop",)."""
+    instance = attach(shm_name)
+    # The chain only iterates over subsets, so it reads them straight from the shared block
+    replica = Replica(instance.n, instance.views(), initial, is_large, multipliers, seed, move_probs, tabu_tenure)
+    while True:
+        request = conn.recv()
+        if request[0] == "stop":
+            break
+        _, temp, moves, deadline, start_time = request
+        improved = replica.run(temp, moves, deadline)
+        conn.send((replica.cost, replica.best_cost, replica.best_sol if improved else None,
+                   time.time() - start_time))
+    conn.close()
+    replica = None
+    detach(instance)
+
+
+class ParallelTempering:
+    """Replica-exchange solver with the same solve() contract as SimulatedAnnealing."""
+
+    def __init__(self, n: int, subsets: List[Set[int]], replicas: int = DEFAULT_REPLICAS,
+                 t_min: float = DEFAULT_T_MIN, t_max: float = DEFAULT_T_MAX,
+                 swap_interval: int = DEFAULT_SWAP_INTERVAL, seed: int = 42,
+                 multipliers: Optional[List[float]] = None, use_tabu: bool = False,
+                 tabu_tenure: int = DEFAULT_TENURE, large_threshold: int = 100,
+                 move_probs: Optional[Tuple[float, float, float]] = None):
+        self.n = n
+        self.subsets = subsets
+        self.replicas = max(1, replicas)
+        self.temps = temperature_ladder(self.replicas, t_min, t_max)
+        self.swap_interval = swap_interval
+        self.seed = seed
+        self.multipliers = multipliers
+        self.tabu_tenure = tabu_tenure if use_tabu else None
+        self.move_probs = move_probs
+        self.is_large = n > large_threshold or len(subsets) > large_threshold
+
+    @classmethod
+    def from_config(cls, n: int, subsets: List[Set[int]], config: Dict[str, Any], **kwargs) -> "ParallelTempering":
+        """Solver using the large_threshold and move_probs of an LS1 configuration; the temperatures are the ladder's."""
+        config = validate_config(config)
+        return cls(n, subsets, large_threshold=config["large_threshold"], move_probs=config["move_probs"], **kwargs)
+
+    def solve(self, cutoff_time: float, start_time: float, initial_solution: Optional[List[int]] = None,
+              lower_bound: Optional[int] = None) -> Tuple[int, List[int], List[Tuple[float, int]]]:
+        """Run the replicas until the cutoff, or until the best cover reaches lower_bound (proven optimal)."""
+        rng = random.Random(self.seed)
+        if initial_solution is None:
+            initial_solution = get_initial_solution(self.n, self.subsets, self.is_large)
+        initial_solution = list(initial_solution)
+        best_cost, best_sol = len(initial_solution), sorted(initial_solution)
+        trace = [(time.time() - start_time, best_cost)]
+
+        shm = publish(Instance.from_subsets(self.n, self.subsets))
+        conns, procs = [], []
+        try:
+            for r in range(self.replicas):
+                parent, child = mp.Pipe()
+                proc = mp.Process(target=_replica_main, daemon=True,
+                                  args=(child, shm.name, self.seed + r, initial_solution, self.is_large,
+                                        self.multipliers, self.move_probs, self.tabu_tenure))
+                proc.start()
+                child.close()
+                conns.append(parent)
+                procs.append(proc)
+
+            # level[r] is the temperature index held by replica r
+            level = list(range(self.replicas))
+            costs = [best_cost] * self.replicas
+            deadline = start_time + cutoff_time
+            round_idx = 0
+            while time.time() < deadline and (lower_bound is None or best_cost > lower_bound):
+                for r, conn in enumerate(conns):
+                    conn.send(("run", self.temps[level[r]], self.swap_interval, deadline, start_time))
+                for r, conn in enumerate(conns):
+                    cost, replica_best, replica_sol, elapsed = conn.recv()
+                    costs[r] = cost
+                    if replica_sol is not None and replica_best < best_cost:
+                        best_cost, best_sol = replica_best, sorted(replica_sol)
+                        trace.append((elapsed, best_cost))
+
+                # Swap attempts between neighbouring levels, alternating even and odd pairs
+                holder = sorted(range(self.replicas), key=level.__getitem__)
+                for k in range(round_idx % 2, self.replicas - 1, 2):
+                    a, b = holder[k], holder[k + 1]
+                    delta = (1 / self.temps[k] - 1 / self.temps[k + 1]) * (costs[a] - costs[b])
+                    if delta >= 0 or rng.random() < math.exp(delta):
+                        level[a], level[b] = level[b], level[a]
+                round_idx += 1
+        finally:
+            for conn in conns:
+                try:
+                    conn.send(("stop",))
+                except (BrokenPipeError, OSError):
+                    pass
+            for proc in procs:
+                proc.join(timeout=5)
+            shm.close()
+            shm.unlink()
+
+        # Replica results arrive out of order across rounds; keep the trace improving over time
+        trace.sort()
+        cleaned = []
+        for t, q in trace:
+            if not cleaned or q < cleaned[-1][1]:
+                cleaned.append((t, q))
+        return best_cost, best_sol, cleaned
+
@@ -1,21 +1,12 @@
 """
 File handling utilities for the Minimum Set Cover problem.
 """
+from core.loader import load_instance
 
 def read_instance(filename):
-    """Parse problem instance from file."""
-    with open(filename, 'r') as f:
-        # Get universe size and subset count
-        n, m = map(int, f.readline().strip().split())
-        
-        # Read each subset
-        subsets = []
-        for _ in range(m):
-            # Convert line to set of integers
-            subset = set(map(int, f.readline().strip().split()))
-            subsets.append(subset)
-            
-    return n, subsets
+    """Parse problem instance from file (the leading count of each line is not an element)."""
+    instance = load_instance(filename)
+    return instance.n, instance.sets()
 
 def write_solution(filename, obj_value, solution, trace):
     """Save solution to output file."""
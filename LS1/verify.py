@@ -3,16 +3,11 @@ import sys
 import time
 import glob
 from sa_core import SimulatedAnnealing
+from core.loader import load_instance
 
 def read_instance(filename):
-    with open(filename, 'r') as f:
-        lines = f.readlines()
-        n, m = map(int, lines[0].strip().split())
-        subsets = []
-        for i in range(1, m + 1):
-            subset = set(map(int, lines[i].strip().split()))
-            subsets.append(subset)
-    return n, subsets
+    instance = load_instance(filename)
+    return instance.n, instance.sets()
 
 def read_optimal_solution(filename):
     with open(filename, 'r') as f:
@@ -6,6 +6,9 @@ on the input seed, then output the best solution found when reaching a local opt
 import random
 import time
 
+from core.instance import build_element_index
+from core.tabu import DEFAULT_TENURE, TabuList
+
 def is_cover(universe, subsets, selected):
     """Check if the selected subsets cover the universe"""
     covered = set()
@@ -19,33 +22,67 @@ def evaluate(subsets, solution):
     return len(selected), selected
 
 def get_random_solution(universe, subsets, seed):
-    """Generate a random initial solution that covers the universe"""
-    random.seed(seed)
+    """Generate a random initial solution that covers the universe, drawing from a stream seeded with seed"""
+    rng = random.Random(seed)
     solution = [False] * len(subsets)
     covered = set()
     # Randomly add subsets until we cover the universe
     while not covered.issuperset(universe):
-        idx = random.randint(0, len(subsets) - 1)
+        idx = rng.randint(0, len(subsets) - 1)
         solution[idx] = True
         covered.update(subsets[idx])
     return solution
 
-def hill_climbing(universe, subsets, cutoff_time, seed):
-    """Hill climbing local search algorithm"""
+def hill_climbing(universe, subsets, cutoff_time, seed, tabu=None, initial=None, incumbent=None, lower_bound=None):
+    """Hill climbing local search algorithm
+
+    Without a TabuList the search stops at the first local optimum. With one it keeps
+    going until the cutoff: when no subset can be dropped it adds the longest-unmoved
+    subset allowed by the tabu/configuration-checking rules, and tabu subsets are never
+    dropped, so the walk moves across plateaus instead of cycling.
+
+    With a core.incumbent.SharedIncumbent, improvements are published, the walk jumps to
+    a better shared cover, and it stops once the cooperative run is finished. It also
+    stops when the best cover reaches lower_bound, which proves it optimal.
+    """
     start_time = time.time()
     trace = []
     
-    # Initialize with a random feasible solution
-    current_sol = get_random_solution(universe, subsets, seed)
+    # Initialize with the given cover (subset indices) or a random feasible solution
+    if initial is not None and is_cover(universe, subsets, initial):
+        current_sol = [False] * len(subsets)
+        for idx in initial:
+            current_sol[idx] = True
+    else:
+        current_sol = get_random_solution(universe, subsets, seed)
     best_size, best_selected = evaluate(subsets, current_sol)
+    curr_size = best_size
     trace.append((time.time() - start_time, best_size))
     
+    iter_count = 0
     improved = True
-    while improved and (time.time() - start_time) < cutoff_time:
+    while (improved or tabu is not None) and (time.time() - start_time) < cutoff_time:
+        if lower_bound is not None and best_size <= lower_bound:
+            break
         improved = False
         
+        if incumbent is not None:
+            if incumbent.finished():
+                break
+            if incumbent.best_size() < best_size:
+                # Continue from the better cover another solver found
+                best_size, best_selected = incumbent.fetch()
+                current_sol = [False] * len(subsets)
+                for idx in best_selected:
+                    current_sol[idx] = True
+                curr_size = best_size
+        
         # Evaluate all possible single-flip neighbors
         for i in range(len(subsets)):
+            # Skip dropping subsets that were flipped too recently
+            if tabu is not None and current_sol[i] and not tabu.can_remove(i, iter_count):
+                continue
+            
             # Flip the i-th subset
             neighbor = current_sol.copy()
             neighbor[i] = not neighbor[i]
@@ -54,17 +91,38 @@ def hill_climbing(universe, subsets, cutoff_time, seed):
             n_size, n_selected = evaluate(subsets, neighbor)
             if is_cover(universe, subsets, n_selected):
                 # If neighbor is better, move to it
-                if n_size < best_size:
+                if n_size < curr_size:
                     current_sol = neighbor
-                    best_size = n_size
-                    best_selected = n_selected
-                    trace.append((time.time() - start_time, best_size))
+                    curr_size = n_size
+                    if tabu is not None:
+                        tabu.record(i, iter_count)
+                        iter_count += 1
+                    if curr_size < best_size:
+                        best_size = curr_size
+                        best_selected = n_selected
+                        trace.append((time.time() - start_time, best_size))
+                        if incumbent is not None:
+                            incumbent.offer(best_selected)
                     improved = True
                     break  # First-improvement strategy
         
+        if not improved and tabu is not None:
+            # Local optimum - step sideways by adding a subset the tabu memory allows
+            idx = tabu.oldest(i for i in range(len(subsets))
+                              if not current_sol[i] and tabu.can_add(i, iter_count))
+            if idx is None:
+                break
+            current_sol[idx] = True
+            curr_size += 1
+            tabu.record(idx, iter_count)
+            iter_count += 1
+        
     return best_size, best_selected, trace
 
-def LS2(n, subsets, time, seed):
+def LS2(n, subsets, time, seed, use_tabu=False, tabu_tenure=DEFAULT_TENURE, initial_solution=None, incumbent=None,
+        lower_bound=None):
     universe = set(range(1, n + 1))
-    solution_size, selected_subsets, trace = hill_climbing(universe, subsets, time, seed)
+    tabu = TabuList(subsets, build_element_index(n, subsets), tabu_tenure) if use_tabu else None
+    solution_size, selected_subsets, trace = hill_climbing(universe, subsets, time, seed, tabu, initial_solution,
+                                                           incumbent, lower_bound)
     return solution_size, selected_subsets, trace
\ No newline at end of file
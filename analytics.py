@@ -0,0 +1,269 @@
+"""
+Run-time and solution-quality analytics computed from the .trace files written by exec.py.
+
+Each trace holds the (time, best score) improvements of one run, so unlike the final rows in
+experiment_data/*.csv it tells when a run first reached a given quality. Optimal values are
+read from data/*.out. All per-run work is done with NumPy on the whole trace at once, so
+thousands of traces are processed in seconds.
+
+Usage:
+python analytics.py -traces output -data data -alg LS1 LS2 -inst large1 large10
+"""
+
+import os
+import argparse
+from collections import namedtuple
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+from core.output import PROVEN_MARKER, read_archive
+
+# A single run: instance/algorithm/cutoff/seed come from the trace file name
+Run = namedtuple("Run", ["instance", "alg", "cutoff", "seed", "times", "scores"])
+
+
+def read_optima(data_dir="data"):
+    """Map every instance name to the optimal value stored in its .out file"""
+    optima = {}
+    for name in os.listdir(data_dir):
+        if not name.endswith(".out"):
+            continue
+        with open(os.path.join(data_dir, name), 'r') as f:
+            first = f.readline().split()
+        if first:
+            optima[name[:-4]] = int(first[0])
+    return optima
+
+
+def parse_trace_name(filename):
+    """Split <instance>_<alg>_<cutoff>[_<seed>].trace into its parts"""
+    parts = os.path.basename(filename)[:-len(".trace")].split('_')
+    instance, alg, cutoff = parts[0], parts[1], parts[2]
+    seed = int(parts[3]) if len(parts) > 3 else None
+    return instance, alg, int(cutoff), seed
+
+
+def load_archive_traces(path, instances=None, algorithms=None):
+    """Read the traced runs bundled in an output archive (see core/output.py) into a list of Runs"""
+    runs = []
+    for run in read_archive(path):
+        if run.times is None or len(run.times) == 0:
+            continue
+        if instances is not None and run.instance not in instances:
+            continue
+        if algorithms is not None and run.alg not in algorithms:
+            continue
+        scores = np.minimum.accumulate(np.frombuffer(run.scores, dtype=np.int64).astype(float))
+        runs.append(Run(run.instance, run.alg, int(run.cutoff), run.seed,
+                        np.frombuffer(run.times, dtype=np.float64), scores))
+    return runs
+
+
+def load_traces(trace_dir="output", instances=None, algorithms=None):
+    """Read every matching .trace file in trace_dir (or the runs of an archive file) into a list of Runs"""
+    if os.path.isfile(trace_dir):
+        return load_archive_traces(trace_dir, instances, algorithms)
+
+    runs = []
+    for name in sorted(os.listdir(trace_dir)):
+        if not name.endswith(".trace"):
+            continue
+        instance, alg, cutoff, seed = parse_trace_name(name)
+        if instances is not None and instance not in instances:
+            continue
+        if algorithms is not None and alg not in algorithms:
+            continue
+
+        with open(os.path.join(trace_dir, name), 'r') as f:
+            text = f.read().replace(',', ' ')
+        # Runs proven optimal end with a marker line (see core/output.py)
+        text = text.rstrip()
+        if text.endswith(PROVEN_MARKER):
+            text = text[:-len(PROVEN_MARKER)]
+        values = np.fromstring(text, sep=' ')
+        if values.size == 0:
+            continue
+
+        # Traces written with a known lower bound carry a third (gap) column
+        values = values.reshape(-1, len(text.split('\n', 1)[0].split()))
+
+        # Traces record improvements, but keep the running best in case a writer logged otherwise
+        scores = np.minimum.accumulate(values[:, 1])
+        runs.append(Run(instance, alg, cutoff, seed, values[:, 0], scores))
+    return runs
+
+
+def time_to_targets(run, optimal, q_stars):
+    """Time at which the run first got within each relative error q* of the optimum (inf if never)"""
+    q_stars = np.asarray(q_stars, dtype=float)
+    rel_err = (run.scores - optimal) / optimal
+
+    # rel_err is non-increasing, so -rel_err is sorted and searchsorted finds the first hit
+    idx = np.searchsorted(-rel_err, -q_stars, side='left')
+    reached = idx < len(rel_err)
+    ttt = np.full(q_stars.shape, np.inf)
+    ttt[reached] = run.times[idx[reached]]
+    return ttt
+
+
+def quality_at_times(run, optimal, cutoffs):
+    """Relative error of the run's best solution at each time cutoff (nan before the first solution)"""
+    cutoffs = np.asarray(cutoffs, dtype=float)
+    idx = np.searchsorted(run.times, cutoffs, side='right') - 1
+    quality = np.full(cutoffs.shape, np.nan)
+    found = idx >= 0
+    quality[found] = (run.scores[idx[found]] - optimal) / optimal
+    return quality
+
+
+def run_time_distribution(runs, optimal, q_stars):
+    """Matrix of time-to-target, one row per run and one column per q*"""
+    if not runs:
+        return np.empty((0, len(q_stars)))
+    return np.vstack([time_to_targets(run, optimal, q_stars) for run in runs])
+
+
+def solution_quality_distribution(runs, optimal, cutoffs):
+    """Matrix of relative error, one row per run and one column per time cutoff"""
+    if not runs:
+        return np.empty((0, len(cutoffs)))
+    return np.vstack([quality_at_times(run, optimal, cutoffs) for run in runs])
+
+
+def empirical_cdf(samples, total=None):
+    """Sorted finite samples and the fraction of all runs (including unsolved) at or below each"""
+    samples = np.asarray(samples, dtype=float)
+    total = len(samples) if total is None else total
+    xs = np.sort(samples[np.isfinite(samples)])
+    ys = np.arange(1, len(xs) + 1) / max(total, 1)
+    return xs, ys
+
+
+def ttt_points(times):
+    """Time-to-target plot points: observed times against exponential theoretical quantiles"""
+    times = np.sort(np.asarray(times, dtype=float))
+    times = times[np.isfinite(times)]
+    probs = (np.arange(1, len(times) + 1) - 0.5) / max(len(times), 1)
+    quantiles = -np.log(1 - probs)
+    return times, probs, quantiles
+
+
+def plot_qrtd(runs_by_alg, instance, optimal, q_stars, output_dir="graphs"):
+    """Plot the qualified run-time distribution of each algorithm for one instance"""
+    plt.figure(figsize=(8, 6))
+    for alg, runs in runs_by_alg.items():
+        rtd = run_time_distribution(runs, optimal, q_stars)
+        linestyle = '-' if alg == "LS1" else '--'
+        for j, q_star in enumerate(q_stars):
+            xs, ys = empirical_cdf(rtd[:, j])
+            plt.step(xs, ys, where='post', label=f"{alg}, q*={q_star*100:.1f}%", linestyle=linestyle)
+
+    plt.title(f"QRTD for {instance}")
+    plt.xlabel("Time (s)")
+    plt.ylabel("P(solve within q*)")
+    plt.grid(True)
+    plt.legend()
+    plt.tight_layout()
+    path = os.path.join(output_dir, f"qrtd_{instance}.png")
+    plt.savefig(path)
+    plt.close()
+    return path
+
+
+def plot_sqd(runs_by_alg, instance, optimal, cutoffs, output_dir="graphs"):
+    """Plot the solution quality distribution of each algorithm at each time cutoff"""
+    plt.figure(figsize=(8, 6))
+    for alg, runs in runs_by_alg.items():
+        sqd = solution_quality_distribution(runs, optimal, cutoffs)
+        linestyle = '-' if alg == "LS1" else '--'
+        for j, cutoff in enumerate(cutoffs):
+            column = sqd[:, j]
+            xs, ys = empirical_cdf(column[~np.isnan(column)], total=len(column))
+            plt.step(xs * 100, ys, where='post', label=f"{alg}, t={cutoff}s", linestyle=linestyle)
+
+    plt.title(f"SQD for {instance}")
+    plt.xlabel("Relative error (%)")
+    plt.ylabel("P(relative error ≤ x)")
+    plt.grid(True)
+    plt.legend()
+    plt.tight_layout()
+    path = os.path.join(output_dir, f"sqd_{instance}.png")
+    plt.savefig(path)
+    plt.close()
+    return path
+
+
+def plot_ttt(runs_by_alg, instance, optimal, q_star, output_dir="graphs"):
+    """Time-to-target plot (observed vs exponential quantiles) for a single target quality"""
+    fig, (ax_cdf, ax_qq) = plt.subplots(1, 2, figsize=(12, 5))
+    for alg, runs in runs_by_alg.items():
+        rtd = run_time_distribution(runs, optimal, [q_star])
+        times, probs, quantiles = ttt_points(rtd[:, 0])
+        if len(times) == 0:
+            continue
+        ax_cdf.plot(times, probs, 'o', label=alg)
+        ax_qq.plot(quantiles, times, 'o', label=alg)
+
+        # Shifted exponential fitted through the first and third quartiles
+        exp_q = np.quantile(quantiles, [0.25, 0.75])
+        time_q = np.quantile(times, [0.25, 0.75])
+        slope = (time_q[1] - time_q[0]) / (exp_q[1] - exp_q[0]) if exp_q[1] > exp_q[0] else 0.0
+        if slope > 0:
+            shift = time_q[0] - slope * exp_q[0]
+            ax_qq.plot(quantiles, shift + slope * quantiles, '-')
+            grid = np.linspace(0, times[-1], 100)
+            ax_cdf.plot(grid, 1 - np.exp(-np.maximum(grid - shift, 0) / slope), '-')
+
+    ax_cdf.set_title(f"TTT plot for {instance}, q*={q_star*100:.1f}%")
+    ax_cdf.set_xlabel("Time to target (s)")
+    ax_cdf.set_ylabel("Cumulative probability")
+    ax_qq.set_title("Q-Q plot vs exponential")
+    ax_qq.set_xlabel("Exponential quantiles")
+    ax_qq.set_ylabel("Measured times (s)")
+    for ax in (ax_cdf, ax_qq):
+        ax.grid(True)
+        if ax.get_legend_handles_labels()[0]:
+            ax.legend()
+    fig.tight_layout()
+    path = os.path.join(output_dir, f"ttt_{instance}_{q_star}.png")
+    fig.savefig(path)
+    plt.close(fig)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-traces", type=str, default="output", help="Directory containing .trace files, or an output archive")
+    parser.add_argument("-data", type=str, default="data", help="Directory containing .out optima")
+    parser.add_argument("-alg", type=str, nargs='+', default=["LS1", "LS2"], help="Algorithms to compare")
+    parser.add_argument("-inst", type=str, nargs='+', default=None, help="Instances to plot (default: all traced)")
+    parser.add_argument("-q", type=float, nargs='+', default=[0.5, 0.25, 0.1], help="Relative error targets q*")
+    parser.add_argument("-t", type=float, nargs='+', default=[5, 10, 15, 20], help="SQD time cutoffs (s)")
+    parser.add_argument("-out", type=str, default="graphs", help="Directory for the plots")
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    optima = read_optima(args.data)
+    runs = load_traces(args.traces, instances=args.inst, algorithms=args.alg)
+
+    instances = args.inst or sorted({run.instance for run in runs})
+    for instance in instances:
+        if instance not in optima:
+            print(f"[!] No optimum for {instance}, skipping")
+            continue
+        runs_by_alg = {alg: [r for r in runs if r.instance == instance and r.alg == alg] for alg in args.alg}
+        runs_by_alg = {alg: r for alg, r in runs_by_alg.items() if r}
+        if not runs_by_alg:
+            print(f"[!] No traces found for {instance}")
+            continue
+
+        optimal = optima[instance]
+        plot_qrtd(runs_by_alg, instance, optimal, args.q, args.out)
+        plot_sqd(runs_by_alg, instance, optimal, args.t, args.out)
+        plot_ttt(runs_by_alg, instance, optimal, min(args.q), args.out)
+        print(f"[✓] Saved QRTD, SQD and TTT plots for {instance}")
+
+
+if __name__ == "__main__":
+    main()
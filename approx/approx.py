@@ -6,71 +6,75 @@ write its solution as a .sol file in the output directory
 
 import sys
 import time
-import random
 import os
+import heapq
+
+from core.loader import load_instance
 
 """
-Determine the input size and subsets from the first line of the input file
+Determine the input size and subsets from the input file (parsed once per process by the shared loader)
 """
 def parse_input(path):
-    with open(path, 'r') as f:
-        lines = f.readlines()
-
-        n, m = map(int, lines[0].split())
-
-        # form the subsets from which we want to select
-        subsets = []
-
-        # make subsets in an integer form where each space separated number is added
-        for l in lines[1:]:
-            t = list(map(int, l.split()))
-            subsets.append(set(t[1:]))
-    
-    return n, subsets
+    instance = load_instance(path)
+    return instance.n, instance.sets()
 
 """
-Perform minimum set cover approximation based on the size and subsets given
+Greedily pick subsets until every element of uncovered is covered (or no subset helps anymore) and return their
+0-based indices. Gains only ever shrink, so a lazy max-heap keyed by (gain, tie-break) re-scores a subset only when it
+reaches the top. Without tiebreak, ties go to the lowest index; tiebreak[i] overrides that order (used by randomized
+constructions). With elem_subsets (element -> subsets containing it) only subsets touching uncovered are scored
 """
-def set_cover(n, subsets):
-    # form indexed list to make it easier to parse
-    subsets = list(enumerate(subsets))
+def greedy_cover(subsets, uncovered, elem_subsets=None, tiebreak=None):
+    unc = set(uncovered)
+
+    if elem_subsets is not None:
+        candidates = {i for e in unc for i in elem_subsets[e]}
+    else:
+        candidates = range(len(subsets))
+
+    # heap of (-gain, tie-break, index); gains stored in the heap may be stale (too high)
+    heap = []
+    for i in candidates:
+        gain = len(subsets[i] & unc)
+        if gain:
+            heap.append((-gain, tiebreak[i] if tiebreak is not None else i, i))
+    heapq.heapify(heap)
 
     sel_ind = []
+    while unc and heap:
+        neg_gain, tb, i = heapq.heappop(heap)
+        gain = len(subsets[i] & unc)
+        if gain == 0:
+            continue
 
-    # uncovered set, initialized to all elements being uncovered
-    unc = set(range(1, n+1))
-
-    # continue loop until there is nothing left in uncovered (ie all elements have been covered)
-    while unc:
-        # find best subset containing the most elements that are also in uncovered set
-        best = max(subsets, key=lambda x: len(x[1] & unc))
-        index, s = best
-
-        # if there is no best subset, then there is no need to continue the problem, automatically break out
-        if not s & unc:
-            break
+        # stale entry, put it back with its real gain unless it still beats everything else
+        if gain != -neg_gain and heap and (-gain, tb) > heap[0][:2]:
+            heapq.heappush(heap, (-gain, tb, i))
+            continue
 
-        # remove now covered elements from the uncovered set
-        unc -= s
-
-        # remove the selected subset from the list of subsets to choose
-        subsets.remove(best)
-
-        # add the index of the subset that we determine as part of the approximation solution
-        sel_ind.append(index+1)
+        unc -= subsets[i]
+        sel_ind.append(i)
 
     return sel_ind
 
 """
-Main function that calls helper functions to parse inputs, perform minimum set cover approximation, and output results
-based on the specified format
+Perform minimum set cover approximation based on the size and subsets given
 """
-def perform_approx(path, time, seed):
+def set_cover(n, subsets):
+    # add the index of each subset that we determine as part of the approximation solution (1-based)
+    return [index+1 for index in greedy_cover(subsets, range(1, n+1))]
 
-    random.seed(seed)
+"""
+Main function that calls helper functions to parse inputs, perform minimum set cover approximation, and output results
+based on the specified format. An already loaded instance can be passed in to skip parsing the file again
+"""
+def perform_approx(path, time, seed, instance=None):
 
     # perform the approximation algorithm
-    n, subsets = parse_input(path)
+    if instance is None:
+        n, subsets = parse_input(path)
+    else:
+        n, subsets = instance.n, instance.sets()
     sel_ind = set_cover(n, subsets)
 
     inst = path.split('/')[-1].split(".")[0]
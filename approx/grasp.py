@@ -0,0 +1,151 @@
+"""
+GRASP: randomized greedy constructions restarted until the cutoff, keeping the best cover.
+
+Each construction is the Approx greedy with a restricted candidate list (RCL): at every step it picks
+uniformly among the subsets whose gain is at least (1 - alpha) times the best gain. Constructions run in
+batches of k in lockstep, in NumPy: the gains of all subsets in every construction of the batch form one
+k x m matrix, so a step finds the best gains, the RCLs and the picks of all k constructions with a few
+whole-matrix operations, and covering the new elements is one gather over the rows (CSR) of the picked
+subsets and one scatter-subtract over the columns (subsets of each element) of the newly covered
+elements. After the construction a redundancy pass drops, smallest first, every subset whose elements
+are all covered at least twice, again for the whole batch at once, one position of the size-ordered
+covers per step.
+"""
+import time
+from typing import List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from core.lagrangian import CSR
+
+DEFAULT_ALPHA = 0.1
+DEFAULT_BATCH = 32      # Constructions run in lockstep
+
+
+def _gather(indptr: np.ndarray, indices: np.ndarray, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Entries of the given rows back to back, with the position in rows each entry comes from."""
+    starts = indptr[rows]
+    lengths = indptr[rows + 1] - starts
+    owner = np.repeat(np.arange(len(rows)), lengths)
+    offsets = np.arange(len(owner)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return owner, indices[np.repeat(starts, lengths) + offsets]
+
+
+class Grasp:
+    """Multi-start randomized greedy over batched gain vectors."""
+
+    def __init__(self, n: int, subsets: Sequence[Set[int]], seed: int = 42, alpha: float = DEFAULT_ALPHA,
+                 batch: int = DEFAULT_BATCH):
+        self.n = n
+        self.m = len(subsets)
+        self.seed = seed
+        self.alpha = alpha
+        self.batch = batch
+        self.rng = np.random.default_rng(seed)
+        self.constructions = 0
+
+        # Rows (elements of each subset) and columns (subsets of each element) of the incidence matrix
+        csr = CSR(subsets)
+        self.indptr, self.indices, self.sizes = csr.indptr, csr.indices, csr.sizes
+        order = np.argsort(self.indices, kind="stable")
+        self.col_indices = np.repeat(np.arange(self.m), self.sizes)[order]
+        self.col_indptr = np.zeros(n + 2, dtype=np.int64)
+        np.cumsum(np.bincount(self.indices, minlength=n + 1), out=self.col_indptr[1:])
+        self.coverable = bool(np.all(np.diff(self.col_indptr)[1:] > 0))
+
+    def construct_batch(self, k: int) -> Optional[List[List[int]]]:
+        """k randomized greedy covers, or None if some element is in no subset."""
+        if not self.coverable:
+            return None
+        m, rng = self.m, self.rng
+        gains = np.tile(self.sizes, (k, 1))
+        flat_gains = gains.reshape(-1)
+        uncovered = np.ones((k, self.n + 1), dtype=bool)
+        uncovered[:, 0] = False
+        remaining = np.full(k, self.n)
+        picked_rows, picked = [], []
+        while True:
+            rows = np.flatnonzero(remaining)
+            if not len(rows):
+                break
+            g = gains if len(rows) == k else gains[rows]
+            best = g.max(axis=1)
+
+            # RCL of every construction, and a uniform pick among its members
+            threshold = np.maximum(1, best - (self.alpha * best).astype(best.dtype))
+            rcl = np.flatnonzero(g >= threshold[:, None])
+            first = np.searchsorted(rcl, np.arange(len(rows) + 1) * m)
+            size = np.diff(first)
+            js = rcl[first[:-1] + (rng.random(len(rows)) * size).astype(first.dtype)] % m
+            picked_rows.append(rows)
+            picked.append(js)
+
+            # Newly covered elements of each construction, and one less gain for every subset containing one
+            owner, elements = _gather(self.indptr, self.indices, js)
+            owner = rows[owner]
+            newly = uncovered[owner, elements]
+            owner, elements = owner[newly], elements[newly]
+            uncovered[owner, elements] = False
+            remaining -= np.bincount(owner, minlength=k)
+            col_owner, cols = _gather(self.col_indptr, self.col_indices, elements)
+            np.subtract.at(flat_gains, owner[col_owner] * m + cols, 1)
+
+        return self.drop_redundant(np.concatenate(picked_rows), np.concatenate(picked), k)
+
+    def drop_redundant(self, rows: np.ndarray, picked: np.ndarray, k: int) -> List[List[int]]:
+        """Split the picks into the k covers and remove, smallest first, the subsets all of whose elements
+        other subsets of the same cover also cover.
+
+        rows[i] is the construction that picked subset picked[i], in pick order.
+        """
+        n1 = self.n + 1
+        # Covers side by side in a k x longest matrix, each row by subset size then pick order, -1 padded
+        order = np.lexsort((np.arange(len(picked)), self.sizes[picked], rows))
+        rows, picked = rows[order], picked[order]
+        lengths = np.bincount(rows, minlength=k)
+        position = np.arange(len(rows)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        covers = np.full((k, int(lengths.max(initial=0))), -1, dtype=np.int64)
+        covers[rows, position] = picked
+
+        owner, elements = _gather(self.indptr, self.indices, picked)
+        count = np.bincount(rows[owner] * n1 + elements, minlength=k * n1).reshape(k, n1)
+        for t in range(covers.shape[1]):
+            live = np.flatnonzero(covers[:, t] >= 0)
+            js = covers[live, t]
+            owner, elements = _gather(self.indptr, self.indices, js)
+            seen = count[live[owner], elements]
+            # Picked subsets are never empty, so every one of them has a segment to reduce
+            starts = np.cumsum(self.sizes[js]) - self.sizes[js]
+            drop = np.minimum.reduceat(seen, starts) >= 2
+            if drop.any():
+                hit = drop[owner]
+                count[live[owner[hit]], elements[hit]] -= 1
+                covers[live[drop], t] = -1
+        return [row[row >= 0].tolist() for row in covers]
+
+    def construct(self) -> Optional[List[int]]:
+        """One randomized greedy cover, or None if some element is in no subset."""
+        covers = self.construct_batch(1)
+        return None if covers is None else covers[0]
+
+    def solve(self, cutoff_time: float, start_time: float, lower_bound: Optional[int] = None
+              ) -> Tuple[int, List[int], List[Tuple[float, int]]]:
+        """Construct covers until the cutoff (or until one reaches lower_bound); returns the best."""
+        self.rng = np.random.default_rng(self.seed)
+        best_cost, best_sol = float("inf"), []
+        trace = []
+        constructions = 0
+        while time.time() - start_time < cutoff_time or constructions == 0:
+            covers = self.construct_batch(self.batch)
+            if covers is None:
+                constructions += 1
+                break
+            constructions += len(covers)
+            cover = min(covers, key=len)
+            if len(cover) < best_cost:
+                best_cost, best_sol = len(cover), cover
+                trace.append((time.time() - start_time, best_cost))
+                if lower_bound is not None and best_cost <= lower_bound:
+                    break
+        self.constructions = constructions
+        return best_cost, sorted(best_sol), trace
@@ -0,0 +1,199 @@
+"""
+This file solves many small instances in one go. Instances come from a directory of .in files or from a
+single stream file in which each instance is preceded by a line "@ <name>". They are dispatched in chunks
+to a pool of worker processes, so imports, process start-up and scheduling are paid once per chunk
+instead of once per instance. Only a few chunks per worker are read ahead, so a stream of any length is
+solved in bounded memory, and every result goes to one consolidated output file (or stdout), as soon as
+its chunk is done, as a line
+
+    <name> <size> <seconds> <1-based subset indices...>
+
+instead of a .sol and a .trace file per instance. Instances that fail to parse are reported as
+"<name> ERROR <message>".
+
+Usage:
+python batch.py -inst <directory_or_stream_file> -alg <Approx|LS1|LS2> -time <cutoff_per_instance> [-seed <seed>] [-j <workers>] [-chunk <size>] [-out <file or ->]
+"""
+
+import os
+import sys
+import time
+import argparse
+from itertools import islice
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from core.bounds import instance_bound
+from core.loader import load_instance, parse_instance
+from approx.approx import greedy_cover
+from LS1.sa_core import SimulatedAnnealing
+from LS2.hillclimbing import LS2
+
+ALGORITHMS = ("Approx", "LS1", "LS2")
+
+# Instances per task sent to a worker, when not given
+DEFAULT_CHUNK = 64
+
+# Chunks submitted per worker before waiting for one to finish
+CHUNKS_IN_FLIGHT = 2
+
+# Marks the start of an instance in a stream file
+STREAM_MARKER = "@"
+
+
+"""
+Yield (name, text) for every instance of a stream file, reading it line by line
+"""
+def read_stream(path):
+    name, lines = None, []
+    with open(path, 'r') as f:
+        for line in f:
+            if line.startswith(STREAM_MARKER):
+                if name is not None:
+                    yield name, "".join(lines)
+                name, lines = line[len(STREAM_MARKER):].strip(), []
+            elif name is not None:
+                lines.append(line)
+            elif line.strip():
+                raise ValueError(f"{path}: data before the first '{STREAM_MARKER} <name>' line")
+    if name is not None:
+        yield name, "".join(lines)
+
+
+"""
+Write the .in files of a directory as one stream file
+"""
+def write_stream(inst_dir, path):
+    with open(path, 'w') as out:
+        for in_file in sorted(os.listdir(inst_dir)):
+            if in_file.endswith(".in"):
+                with open(os.path.join(inst_dir, in_file), 'r') as f:
+                    text = f.read()
+                out.write(f"{STREAM_MARKER} {in_file.split('.')[0]}\n{text}")
+                if not text.endswith("\n"):
+                    out.write("\n")
+
+
+"""
+Run one algorithm on (n, subsets) and return the cover as 0-based indices. The local searches stop early
+once their cover reaches lower_bound
+"""
+def solve(alg, n, subsets, time_limit, seed, lower_bound=None):
+    start_time = time.time()
+    if alg == "Approx":
+        return greedy_cover(subsets, range(1, n + 1))
+    if alg == "LS1":
+        return SimulatedAnnealing(n, subsets, seed=seed).solve(time_limit, start_time, lower_bound=lower_bound)[1]
+    if alg == "LS2":
+        return LS2(n, subsets, time_limit, seed, lower_bound=lower_bound)[1]
+    raise ValueError(f"Algorithm {alg} is not supported in batch mode.")
+
+
+"""
+Solve one item, either (name, path) of an .in file or (name, text) from a stream; runs in a worker process
+"""
+def solve_item(item, alg, time_limit, seed, from_stream):
+    name, source = item
+    start_time = time.time()
+    try:
+        instance = parse_instance(source, name) if from_stream else load_instance(source)
+        cover = solve(alg, instance.n, instance.sets(), time_limit, seed, instance_bound(instance).value)
+    except (ValueError, OSError) as e:
+        return name, None, 0.0, str(e)
+    return name, sorted(cover), time.time() - start_time, None
+
+
+def _solve_chunk(items, alg, time_limit, seed, from_stream):
+    return [solve_item(item, alg, time_limit, seed, from_stream) for item in items]
+
+
+def _chunks(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+"""
+Solve every item and yield (name, cover, seconds, error). With workers == 1 everything runs in this process,
+in input order; otherwise chunks of items are spread over a process pool and their results come in the order
+the chunks finish. Items are consumed lazily, at most CHUNKS_IN_FLIGHT chunks per worker at a time
+"""
+def solve_batch(items, alg, time_limit, seed=42, workers=None, chunksize=DEFAULT_CHUNK, from_stream=False):
+    if alg not in ALGORITHMS:
+        raise ValueError(f"Algorithm {alg} is not supported in batch mode.")
+
+    if workers == 1:
+        for item in items:
+            yield solve_item(item, alg, time_limit, seed, from_stream)
+        return
+
+    chunks = _chunks(items, chunksize)
+    limit = CHUNKS_IN_FLIGHT * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {pool.submit(_solve_chunk, chunk, alg, time_limit, seed, from_stream)
+                   for chunk in islice(chunks, limit)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            # Refill before handing results out, so the workers stay busy while they are written
+            pending |= {pool.submit(_solve_chunk, chunk, alg, time_limit, seed, from_stream)
+                        for chunk in islice(chunks, len(done))}
+            for job in done:
+                yield from job.result()
+
+
+"""
+Write the consolidated result lines and return the number of failures
+"""
+def write_results(results, out):
+    failed = 0
+    for name, cover, seconds, error in results:
+        if error is not None:
+            failed += 1
+            out.write(f"{name} ERROR {error}\n")
+        else:
+            out.write(f"{name} {len(cover)} {seconds:.4f} {' '.join(str(i + 1) for i in cover)}\n")
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-inst", type=str, required=True, help="Directory of .in files or a stream file")
+    parser.add_argument("-alg", type=str, required=True, choices=ALGORITHMS)
+    parser.add_argument("-time", type=float, required=True, help="Cutoff per instance in seconds")
+    parser.add_argument("-seed", type=int, default=42)
+    parser.add_argument("-j", type=int, default=None, help="Number of worker processes (1 runs in-process)")
+    parser.add_argument("-chunk", type=int, default=DEFAULT_CHUNK, help="Instances per task sent to a worker")
+    parser.add_argument("-out", type=str, default=None, help="Output file, '-' for stdout "
+                        "(default output/batch_<alg>_<time>_<seed>.txt)")
+    args = parser.parse_args()
+
+    if os.path.isdir(args.inst):
+        items = [(in_file.split('.')[0], os.path.join(args.inst, in_file))
+                 for in_file in sorted(os.listdir(args.inst)) if in_file.endswith(".in")]
+        from_stream = False
+    elif os.path.isfile(args.inst):
+        items = read_stream(args.inst)
+        from_stream = True
+    else:
+        print(f"{args.inst} not valid")
+        sys.exit(1)
+
+    out_path = args.out or os.path.join("output", f"batch_{args.alg}_{args.time:g}_{args.seed}.txt")
+    start_time = time.time()
+    results = solve_batch(items, args.alg, args.time, args.seed, args.j, args.chunk, from_stream)
+    if out_path == "-":
+        failed = write_results(results, sys.stdout)
+    else:
+        os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+        with open(out_path, 'w') as out:
+            failed = write_results(results, out)
+        print(f"Wrote {out_path} in {time.time() - start_time:.2f} seconds")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,131 +1,209 @@
+import math
 import time
 
-def greedy_lower_bound(universe, subsets, covered):
-    """
-    Computes a greedy lower bound for the minimum number of subsets needed
-    to cover the remaining elements in the universe not yet covered.
-
-    Parameters:
-    - universe: Set of all elements to be covered.
-    - subsets: List of subsets available for covering the universe.
-    - covered: Set of elements already covered.
-
-    Returns:
-    - A lower bound estimate (int) of the additional subsets needed to cover the remaining elements.
-    - Returns float('inf') if it's impossible to cover all remaining elements.
-    """
-    remaining = universe - covered
-    count = 0
+from approx.approx import set_cover
+from core.lagrangian import EPS
+from LS1.sa_core import SimulatedAnnealing
+from LS2.hillclimbing import LS2
+from bnb.state import INCLUDE, SearchState, decode_entry
 
-    # Filter subsets to keep only those that cover some of the remaining elements
-    subsets = [s for s in subsets if s & remaining]
+# Share of the cutoff handed to a local search warm start before the tree search begins
+WARM_START_FRACTION = 0.1
 
-    while remaining:
-        # Choose the subset that covers the largest number of uncovered elements
-        best_subset = max(subsets, key=lambda s: len(s & remaining), default=None)
+# Nodes between two checks of the cutoff
+TIME_CHECK_NODES = 256
 
-        # If its not possible
-        if not best_subset or not (best_subset & remaining):
-            return float("inf")  
 
-        remaining -= best_subset
-        count += 1
-
-    return count
+def warm_start(n, subsets, method, cutoff_time, start_time, seed=42):
+    """
+    Computes an initial incumbent for branch_and_bound using a fast heuristic.
 
+    Parameters:
+    - n: Number of elements in the universe (1 to n).
+    - subsets: List of sets, each representing a subset of the universe.
+    - method: One of "Approx", "LS1" or "LS2".
+    - cutoff_time: Cutoff of the whole BnB run; local searches get WARM_START_FRACTION of it.
+    - start_time: Time when the BnB run started.
+    - seed: Random seed for the local searches.
 
-def branch_and_bound(n, subsets, cutoff_time, start_time):
+    Returns:
+    - score: Size of the cover found, or float('inf') if the heuristic did not produce a cover.
+    - solution: List of 0-based indices of the subsets in the cover.
+    """
+    time_slice = cutoff_time * WARM_START_FRACTION
+
+    if method == "Approx":
+        solution = [i - 1 for i in set_cover(n, subsets)]
+    elif method == "LS1":
+        sa = SimulatedAnnealing(n, subsets, seed=seed)
+        _, solution, _ = sa.solve(time_slice, start_time)
+    elif method == "LS2":
+        _, solution, _ = LS2(n, subsets, time_slice, seed)
+    else:
+        raise ValueError(f"Warm start method {method} not recognized.")
+
+    # Only hand over a real cover, otherwise BnB would prune against a bogus bound
+    covered = set().union(*[subsets[i] for i in solution]) if solution else set()
+    if not covered.issuperset(range(1, n + 1)):
+        return float("inf"), []
+    return len(solution), sorted(solution)
+
+
+def branch_and_bound(n, subsets, cutoff_time, start_time, initial_score=float("inf"), initial_solution=None,
+                     multipliers=None, checkpoint=None, incumbent=None, lower_bound=None):
     """
     Solves the Set Cover problem using a branch-and-bound approach.
 
+    Every node branches on the uncovered element with the fewest candidate subsets: each child selects
+    one of them, and later siblings exclude the ones already tried, so no cover is enumerated twice.
+    The search runs on a single reversible SearchState (see bnb/state.py), so a node only applies and
+    undoes its own changes instead of copying the covered set and the selection.
+
     Parameters:
     - n: Number of elements in the universe (1 to n).
     - subsets: List of sets, each representing a subset of the universe.
     - cutoff_time: Maximum allowed time for execution (in seconds).
     - start_time: Time when the algorithm started running.
+    - initial_score: Size of a known cover used as the starting upper bound (see warm_start).
+    - initial_solution: List of subset indices of that known cover.
+    - multipliers: Lagrangian multipliers per element (see core/lagrangian.py); when given, every node is
+      also pruned by the Lagrangian bound of its residual problem.
+    - checkpoint: core.checkpoint.Checkpoint to save the search to periodically. The open nodes are fully
+      described by the undo trail of the current path (per level: the siblings already excluded, then the
+      subset being explored), so a checkpoint is the trail plus the incumbent, trace and node counts. If
+      the checkpoint holds a resumed state, the search replays that path and carries on from it.
+    - incumbent: core.incumbent.SharedIncumbent of a cooperative run. Covers found are offered to it,
+      better shared covers tighten the upper bound, and a completed search finishes the run as proven.
+    - lower_bound: Valid lower bound on the cover size (see core/bounds.py); the search stops as soon as
+      the incumbent reaches it, since no smaller cover exists.
 
     Returns:
     - best_score: Minimum number of subsets needed to cover the universe.
     - best_solution: List of indices of the subsets forming the best solution.
     - trace: List of tuples (elapsed_time, current_best_score) recorded during search.
+    - proven: Whether best_solution is proven optimal, the tree having been searched to the end (by this
+      search or, through incumbent, another one) or the incumbent having reached lower_bound.
     """
-    universe = set(range(1, n + 1))  # Define the universe of elements to cover
-    best_score = float("inf")       # REPLACE WITH TIGHTER UPPER BOUND FROM APPROX
-    best_solution = []              # Best set of subset indices found so far
+    best_score = initial_score      # Upper bound, tightened by a warm start when one is given
+    best_solution = list(initial_solution or [])  # Best set of subset indices found so far
     trace = []                      # Track (elapsed_time, score) updates for analysis
 
-    # Sort for slightly faster convergence
-    subsets = sorted(enumerate(subsets), key=lambda x: -len(x[1]))
-
-    # Memoization dictionary
-    memo = {}
-
-    def recurse(index, covered, selected_indices):
+    # Record the warm start incumbent so the trace starts from it
+    if best_score != float("inf"):
+        trace.append((time.time() - start_time, best_score))
+
+    state = SearchState(n, subsets)
+    nodes = 0
+    pruned = 0
+    stopped = False
+    proven = lower_bound is not None and best_score <= lower_bound
+
+    # Path to replay when resuming: per level, the excluded siblings and the subset that was being explored
+    replay = []
+    resumed = checkpoint.resumed if checkpoint is not None else None
+    if resumed is not None:
+        best_score, best_solution, trace = resumed["best_score"], resumed["best_solution"], resumed["trace"]
+        nodes, pruned = resumed["nodes"], resumed["pruned"]
+        # Carry the elapsed time over so the cutoff and trace times are those of the whole run
+        start_time = time.time() - resumed["elapsed"]
+        excluded = []
+        for entry in resumed["trail"]:
+            op, j = decode_entry(entry)
+            if op == INCLUDE:
+                replay.append((excluded, j))
+                excluded = []
+            else:
+                excluded.append(j)
+        replay.reverse()
+
+    def save_checkpoint():
+        checkpoint.save({"trail": state.trail, "best_score": best_score, "best_solution": best_solution,
+                         "trace": trace, "nodes": nodes, "pruned": pruned,
+                         "elapsed": time.time() - start_time})
+
+    def recurse():
         """
-        Recursive function for exploring subset combinations using branch-and-bound.
-
-        Parameters:
-        - index: Current index in the sorted subset list.
-        - covered: Set of elements currently covered.
-        - selected_indices: List of selected subset indices so far.
+        Explore the subtree below the current state; returns with the state unchanged.
         """
-        nonlocal best_score, best_solution, trace
-
-        # End if time limit is exceeded
-        if time.time() - start_time > cutoff_time:
-            return
-
-        # Found a valid solution covering the universe
-        if covered == universe:
-            if len(selected_indices) < best_score or (
-                len(selected_indices) == best_score and selected_indices < best_solution
-            ):
-                best_score = len(selected_indices)
-                best_solution = selected_indices[:]
-                trace.append((time.time() - start_time, best_score))
-            return
-
-        # Exhausted all subsets without covering the universe
-        if index == len(subsets):
-            return
-
-        # Memoization check
-        key = (index, frozenset(covered))
-        if key in memo and len(selected_indices) >= memo[key]:
+        nonlocal best_score, best_solution, nodes, pruned, stopped, proven
+
+        # End if time limit is exceeded (checked every TIME_CHECK_NODES nodes, along with the checkpoint
+        # and the shared incumbent)
+        nodes += 1
+        if nodes % TIME_CHECK_NODES == 0:
+            if time.time() - start_time > cutoff_time:
+                stopped = True
+            elif checkpoint is not None and checkpoint.due():
+                save_checkpoint()
+            if incumbent is not None:
+                if incumbent.finished():
+                    stopped = True
+                elif incumbent.best_size() < best_score:
+                    best_score, best_solution = incumbent.fetch()
+        if stopped:
             return
-        memo[key] = len(selected_indices)
-
-        # Compute a greedy lower bound from current state
-        remaining_subsets = subsets[index:]
-        lb = greedy_lower_bound(universe, [s for _, s in remaining_subsets], covered)
-
-        if lb == 0:
-            # All remaining elements can be covered with no additional subset
-            recurse(len(subsets), universe, selected_indices)
-            return
-
-        # Prune the branch if even the best-case estimate exceeds the best score found
-        if len(selected_indices) + lb >= best_score:
-            return
-
-        subset_idx, subset = subsets[index]
-
-        # Include the current subset in the solution
-        recurse(
-            index + 1,
-            covered | subset,
-            selected_indices + [subset_idx]
-        )
-
-        # Exclude the current subset and move to the next
-        recurse(
-            index + 1,
-            covered,
-            selected_indices
-        )
 
-    recurse(0, set(), [])
+        depth = len(state.selected)
+        if replay:
+            # Nodes on the resumed path were open when the checkpoint was taken, so they are not re-pruned
+            excluded, j = replay.pop()
+            e = state.branch_element()
+            mark = state.mark()
+            for k in excluded:
+                state.exclude(k)
+            child = state.mark()
+            state.include(j)
+            recurse()
+            state.undo(child)
+            state.exclude(j)
+        else:
+            # Found a valid solution covering the universe
+            if state.n_uncovered == 0:
+                if depth < best_score:
+                    best_score = depth
+                    best_solution = state.selected[:]
+                    trace.append((time.time() - start_time, best_score))
+                    if incumbent is not None:
+                        incumbent.offer(best_solution)
+                    if lower_bound is not None and best_score <= lower_bound:
+                        # Matches the bound: optimal, no need to search further
+                        proven = stopped = True
+                return
+
+            # Prune the branch if even the best case cannot beat the best score found
+            if depth + state.lower_bound() >= best_score:
+                pruned += 1
+                return
+            if multipliers is not None:
+                lag = state.lagrangian_bound(multipliers)
+                if depth + math.ceil(lag - EPS) >= best_score:
+                    pruned += 1
+                    return
+
+            e = state.branch_element()
+            mark = state.mark()
+        while depth + 1 < best_score and not stopped:
+            # Most promising remaining candidate: the one covering the most uncovered elements
+            j = state.best_candidate(e)
+            if j < 0:
+                break
+
+            # Select j, search below it, then exclude it for the remaining siblings
+            child = state.mark()
+            state.include(j)
+            recurse()
+            state.undo(child)
+            state.exclude(j)
+        state.undo(mark)
+
+    if not proven:
+        recurse()
+
+    # An exhausted tree proves the best cover optimal, so the other solvers can stop
+    proven = proven or not stopped
+    if incumbent is not None and proven:
+        incumbent.finish(proven=True)
 
     # Return the best result found within the cutoff time
     best_solution.sort()
-    return best_score, best_solution, trace
+    return best_score, best_solution, trace, proven
@@ -0,0 +1,187 @@
+"""
+Reversible search state for branch and bound.
+
+All node-to-node changes happen in place on one set of arrays and are recorded on an undo trail, so
+moving down a branch and backtracking cost O(changes) and allocate nothing:
+
+- count[e]          number of selected subsets covering element e
+- uncovered         sparse set of the elements with count 0: the first n_uncovered entries of
+                    `dense` are uncovered, `where[e]` is e's slot. Removals swap e to the end of
+                    the live part, so undoing them in LIFO order only moves the boundary back.
+- candidates[e]     number of active subsets (neither selected nor excluded) containing e, over
+                    the fixed element -> subsets lists, which are sorted largest subset first
+- gain[j]           uncovered elements of subset j
+"""
+import math
+from array import array
+from typing import List, Sequence, Set, Tuple
+
+from core.instance import build_element_index
+
+# Trail entries are (op << 32) | subset
+INCLUDE, EXCLUDE = 1, 2
+_SHIFT = 32
+_MASK = (1 << _SHIFT) - 1
+
+
+def decode_entry(entry: int) -> Tuple[int, int]:
+    """(op, subset) of a trail entry."""
+    return entry >> _SHIFT, entry & _MASK
+
+
+class SearchState:
+    """Cover under construction with include/exclude moves and an undo trail."""
+
+    def __init__(self, n: int, subsets: Sequence[Set[int]]):
+        self.n = n
+        self.m = len(subsets)
+        self.sets = [tuple(s) for s in subsets]
+        self.elem_subsets = build_element_index(n, self.sets)
+        for owners in self.elem_subsets:
+            owners.sort(key=lambda j: -len(self.sets[j]))
+
+        self.count = array("i", [0]) * (n + 1)
+        self.dense = array("i", range(1, n + 1))
+        self.where = array("i", [0]) + array("i", range(n))
+        self.n_uncovered = n
+        self.candidates = array("i", [len(owners) for owners in self.elem_subsets])
+        self.gain = array("i", [len(s) for s in self.sets])
+        self.active = bytearray([1]) * self.m
+        self.selected: List[int] = []
+        self.trail = array("q")
+
+        # Scratch for the lower bound: a subset is marked when stamp[j] == current stamp
+        self.stamp = array("q", [0]) * self.m
+        self.stamp_value = 0
+
+    def _deactivate(self, j: int):
+        self.active[j] = 0
+        candidates = self.candidates
+        for e in self.sets[j]:
+            candidates[e] -= 1
+
+    def _reactivate(self, j: int):
+        self.active[j] = 1
+        candidates = self.candidates
+        for e in self.sets[j]:
+            candidates[e] += 1
+
+    def include(self, j: int):
+        """Select subset j."""
+        self._deactivate(j)
+        self.selected.append(j)
+        count, where, dense, gain = self.count, self.where, self.dense, self.gain
+        for e in self.sets[j]:
+            count[e] += 1
+            if count[e] == 1:
+                # Swap e with the last uncovered element and shrink the live part
+                last = self.n_uncovered - 1
+                other = dense[last]
+                slot = where[e]
+                dense[slot], dense[last] = other, e
+                where[other], where[e] = slot, last
+                self.n_uncovered = last
+                for k in self.elem_subsets[e]:
+                    gain[k] -= 1
+        self.trail.append((INCLUDE << _SHIFT) | j)
+
+    def exclude(self, j: int):
+        """Forbid subset j for the rest of the branch."""
+        self._deactivate(j)
+        self.trail.append((EXCLUDE << _SHIFT) | j)
+
+    def _undo_include(self, j: int):
+        count, gain = self.count, self.gain
+        for e in reversed(self.sets[j]):
+            if count[e] == 1:
+                # e sits right after the live part: moving the boundary back restores it
+                self.n_uncovered += 1
+                for k in self.elem_subsets[e]:
+                    gain[k] += 1
+            count[e] -= 1
+        self.selected.pop()
+        self._reactivate(j)
+
+    def mark(self) -> int:
+        return len(self.trail)
+
+    def undo(self, mark: int):
+        """Revert every move made since mark()."""
+        trail = self.trail
+        while len(trail) > mark:
+            entry = trail.pop()
+            j = entry & _MASK
+            if entry >> _SHIFT == INCLUDE:
+                self._undo_include(j)
+            else:
+                self._reactivate(j)
+
+    def branch_element(self) -> int:
+        """Uncovered element with the fewest active candidates (0 if everything is covered)."""
+        best_e, best_c = 0, self.m + 1
+        dense, candidates = self.dense, self.candidates
+        for i in range(self.n_uncovered):
+            e = dense[i]
+            c = candidates[e]
+            if c < best_c:
+                best_e, best_c = e, c
+                if c <= 1:
+                    break
+        return best_e
+
+    def lower_bound(self) -> float:
+        """Valid bound on the subsets still needed, inf if some uncovered element has no candidate.
+
+        Maximum of two bounds: uncovered elements whose candidate subsets are pairwise disjoint
+        each need their own subset, and no subset covers more than the largest active gain.
+        """
+        if self.n_uncovered == 0:
+            return 0
+        self.stamp_value += 1
+        stamp, value = self.stamp, self.stamp_value
+        dense, active, gain = self.dense, self.active, self.gain
+        independent, max_gain = 0, 0
+        for i in range(self.n_uncovered):
+            e = dense[i]
+            free, any_candidate = True, False
+            for j in self.elem_subsets[e]:
+                if active[j]:
+                    any_candidate = True
+                    if stamp[j] == value:
+                        free = False
+                    if gain[j] > max_gain:
+                        max_gain = gain[j]
+            if not any_candidate:
+                return math.inf
+            if free:
+                independent += 1
+                for j in self.elem_subsets[e]:
+                    if active[j]:
+                        stamp[j] = value
+        return max(independent, math.ceil(self.n_uncovered / max_gain))
+
+    def lagrangian_bound(self, u: List[float]) -> float:
+        """Lagrangian bound L(u) of covering the uncovered elements with the active subsets."""
+        self.stamp_value += 1
+        stamp, value = self.stamp, self.stamp_value
+        dense, active, count = self.dense, self.active, self.count
+        total = 0.0
+        for i in range(self.n_uncovered):
+            e = dense[i]
+            total += u[e]
+            for j in self.elem_subsets[e]:
+                if active[j] and stamp[j] != value:
+                    stamp[j] = value
+                    c = 1.0 - sum(u[f] for f in self.sets[j] if count[f] == 0)
+                    if c < 0:
+                        total += c
+        return total
+
+    def best_candidate(self, e: int) -> int:
+        """Active subset containing e with the largest gain (ties to the larger subset), -1 if none."""
+        best_j, best_gain = -1, 0
+        active, gain = self.active, self.gain
+        for j in self.elem_subsets[e]:
+            if active[j] and gain[j] > best_gain:
+                best_j, best_gain = j, gain[j]
+        return best_j
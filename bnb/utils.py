@@ -1,24 +1,19 @@
 import os
 
+from core.loader import load_instance
+from core.output import format_solution, format_trace, run_name, trace_columns
+
 def read_instance(relative_path):
     # Resolve the full path relative to this script's location
     base_dir = os.path.dirname(__file__)
     full_path = os.path.join(base_dir, "..", relative_path)
 
-    with open(full_path, "r") as f:
-        lines = f.readlines()
-        n, m = map(int, lines[0].strip().split())
-        subsets = []
-        for i in range(1, m + 1): # First value is count
-            subset = set(map(int, lines[i].strip().split()[1:]))
-            subsets.append(subset)
-    return n, subsets
+    # Parsed once per process; subsets are the instance's shared frozensets
+    instance = load_instance(full_path)
+    return instance.n, instance.sets()
 
 def write_solution(file_prefix, method, cutoff, solution, used_indices, seed=None):
-    name_parts = [file_prefix, method, str(cutoff)]
-    if seed is not None:
-        name_parts.append(str(seed))
-    sol_filename = f"{'_'.join(name_parts)}.sol"
+    sol_filename = f"{run_name(file_prefix, method, cutoff, seed)}.sol"
 
     # Navigate to project root and output folder
     project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -26,20 +21,16 @@ def write_solution(file_prefix, method, cutoff, solution, used_indices, seed=Non
     os.makedirs(output_dir, exist_ok=True)
     
     with open(os.path.join(output_dir, sol_filename), "w") as f:
-        f.write(f"{solution}\n")
-        f.write(" ".join(str(i + 1) for i in used_indices) + "\n")
+        f.write(format_solution(solution, used_indices))
 
-def write_trace(file_prefix, method, cutoff, trace_list, seed=None):
-    name_parts = [file_prefix, method, str(cutoff)]
-    if seed is not None:
-        name_parts.append(str(seed))
-    trace_filename = f"{'_'.join(name_parts)}.trace"
+def write_trace(file_prefix, method, cutoff, trace_list, seed=None, lower_bound=None):
+    trace_filename = f"{run_name(file_prefix, method, cutoff, seed)}.trace"
 
     # Navigate to project root and output folder
     project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
     output_dir = os.path.join(project_root, "output")
     os.makedirs(output_dir, exist_ok=True)
 
+    # Whole trace formatted from its columns and written at once
     with open(os.path.join(output_dir, trace_filename), "w") as f:
-        for t, q in trace_list:
-            f.write(f"{t:.2f} {q}\n")
+        f.write(format_trace(*trace_columns(trace_list), lower_bound))
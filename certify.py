@@ -0,0 +1,135 @@
+"""
+This file certifies the .sol files written by the solvers against the instances they claim to solve.
+For every solution it checks that the indices are valid and distinct, that the reported count matches
+them, and that the selected subsets really cover the universe, then compares the size with the
+optimum in data/*.out. Solutions are grouped by instance so each instance is parsed once, and groups
+are checked in parallel.
+
+Usage:
+python certify.py -sol output -data data [-j <workers>]
+"""
+
+import os
+import sys
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from core.loader import load_instance
+
+
+"""
+Read the reported count and the 1-based subset indices from a .sol file (later lines, such as the
+trace appended by LS1/main.py, are ignored)
+"""
+def read_solution(path):
+    with open(path, 'r') as f:
+        count_line = f.readline().split()
+        index_line = f.readline().split()
+    reported = int(count_line[0]) if count_line else None
+    return reported, [int(tok) for tok in index_line]
+
+
+"""
+Check one solution against a loaded instance and return the list of problems found (empty if valid)
+"""
+def check_solution(inst, masks, reported, indices):
+    problems = []
+
+    bad = [i for i in indices if not 1 <= i <= inst.m]
+    if bad:
+        problems.append(f"indices out of range 1..{inst.m}: {bad[:5]}")
+
+    if len(set(indices)) != len(indices):
+        problems.append("duplicate indices")
+
+    if reported is None:
+        problems.append("missing count line")
+    elif reported != len(indices):
+        problems.append(f"reported {reported} sets but lists {len(indices)}")
+
+    covered = 0
+    for i in indices:
+        if 1 <= i <= inst.m:
+            covered |= masks[i - 1]
+    missing = inst.universe_mask() & ~covered
+    if missing:
+        problems.append(f"{bin(missing).count('1')} elements uncovered")
+
+    return problems
+
+
+"""
+Certify every solution of one instance; runs in a worker process
+"""
+def certify_instance(inst_path, sol_paths, optimum):
+    inst = load_instance(inst_path)
+    masks = inst.masks()
+
+    results = []
+    for sol_path in sol_paths:
+        try:
+            reported, indices = read_solution(sol_path)
+            problems = check_solution(inst, masks, reported, indices)
+        except (ValueError, OSError) as e:
+            reported, indices, problems = None, [], [f"unreadable: {e}"]
+
+        size = len(set(indices))
+        if not problems and optimum is not None and size < optimum:
+            problems.append(f"smaller than reference optimum {optimum}")
+        results.append((sol_path, size, optimum, problems))
+    return results
+
+
+"""
+Group the .sol files in sol_dir by instance and certify them in parallel
+"""
+def certify_directory(sol_dir, data_dir, workers=None):
+    groups = {}
+    for name in sorted(os.listdir(sol_dir)):
+        if name.endswith(".sol"):
+            groups.setdefault(name.split('_')[0], []).append(os.path.join(sol_dir, name))
+
+    results, jobs = [], []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for instance, sol_paths in groups.items():
+            inst_path = os.path.join(data_dir, f"{instance}.in")
+            if not os.path.isfile(inst_path):
+                results.extend((p, 0, None, [f"no instance {inst_path}"]) for p in sol_paths)
+                continue
+
+            optimum = None
+            out_path = os.path.join(data_dir, f"{instance}.out")
+            if os.path.isfile(out_path):
+                with open(out_path, 'r') as f:
+                    optimum = int(f.readline().split()[0])
+
+            jobs.append(pool.submit(certify_instance, inst_path, sol_paths, optimum))
+
+        for job in jobs:
+            results.extend(job.result())
+
+    return sorted(results)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-sol", type=str, default="output", help="Directory containing .sol files")
+    parser.add_argument("-data", type=str, default="data", help="Directory containing .in/.out files")
+    parser.add_argument("-j", type=int, default=None, help="Number of worker processes")
+    args = parser.parse_args()
+
+    results = certify_directory(args.sol, args.data, args.j)
+
+    failed = 0
+    for sol_path, size, optimum, problems in results:
+        gap = f"{(size - optimum) / optimum * 100:.2f}%" if optimum else "-"
+        status = "OK" if not problems else "FAIL"
+        failed += bool(problems)
+        print(f"{status:<5} {os.path.basename(sol_path):<30} {size:<6} {gap:<8} {'; '.join(problems)}")
+
+    print(f"\n{len(results) - failed}/{len(results)} solutions certified")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Cheap valid lower bounds on the minimum cover size, computed once per instance.
+
+Three bounds, all O(nnz):
+- trivial   a nonempty universe needs at least one subset,
+- size      no subset covers more than max |S| elements, so ceil(n / max |S|) subsets are needed,
+- packing   elements taken greedily (rarest first) such that no two share a subset each need a
+            subset of their own.
+
+Solvers given the best of them stop as soon as their cover reaches it, since the cover is then
+proven optimal.
+"""
+import math
+from collections import namedtuple
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from core.instance import Instance, build_element_index
+
+# value is the bound, source the name of the bound that gave it
+LowerBound = namedtuple("LowerBound", ["value", "source"])
+
+# Bounds of the instances seen by this process (the loader keeps them alive anyway)
+_bounds: Dict[int, Tuple[Instance, LowerBound]] = {}
+
+
+def packing_bound(n: int, subsets: Sequence[Set[int]], elem_subsets: Optional[List[List[int]]] = None) -> int:
+    """Size of a greedy set of elements no two of which lie in a common subset."""
+    if elem_subsets is None:
+        elem_subsets = build_element_index(n, subsets)
+    used = bytearray(len(subsets))
+    packed = 0
+    # Rare elements block few subsets, so trying them first packs more elements
+    for e in sorted(range(1, n + 1), key=lambda e: len(elem_subsets[e])):
+        owners = elem_subsets[e]
+        if owners and not any(used[j] for j in owners):
+            packed += 1
+            for j in owners:
+                used[j] = 1
+    return packed
+
+
+def easy_bound(n: int, subsets: Sequence[Set[int]], elem_subsets: Optional[List[List[int]]] = None) -> LowerBound:
+    """Best of the trivial, size and packing bounds."""
+    if n == 0:
+        return LowerBound(0, "trivial")
+    best = LowerBound(1, "trivial")
+    largest = max((len(s) for s in subsets), default=0)
+    if largest and math.ceil(n / largest) > best.value:
+        best = LowerBound(math.ceil(n / largest), "size")
+    packed = packing_bound(n, subsets, elem_subsets)
+    if packed > best.value:
+        best = LowerBound(packed, "packing")
+    return best
+
+
+def instance_bound(instance: Instance) -> LowerBound:
+    """easy_bound of an instance, computed on first use."""
+    entry = _bounds.get(id(instance))
+    if entry is None or entry[0] is not instance:
+        entry = (instance, easy_bound(instance.n, instance.sets()))
+        _bounds[id(instance)] = entry
+    return entry[1]
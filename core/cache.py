@@ -0,0 +1,124 @@
+"""
+Persistent cache of the best known cover per instance, stored in SQLite.
+
+Entries are keyed by a hash of the instance content (n and every subset's sorted elements, in file
+order), so renamed or re-submitted copies of an instance hit the same entry. Each entry records
+the cover, whether it is proven optimal, and which algorithm found it in how long. Proven entries
+let a solve return immediately; the others serve as warm starts. Old and least recently used
+entries are evicted to keep the cache within its age and size limits.
+"""
+import hashlib
+import os
+import sqlite3
+import time
+from array import array
+from typing import List, Optional
+
+from core.instance import Instance
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "solutions.sqlite")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_AGE_DAYS = 30.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS solutions (
+    key       TEXT PRIMARY KEY,
+    n         INTEGER NOT NULL,
+    m         INTEGER NOT NULL,
+    size      INTEGER NOT NULL,
+    cover     BLOB NOT NULL,
+    optimal   INTEGER NOT NULL,
+    algorithm TEXT NOT NULL,
+    runtime   REAL NOT NULL,
+    created   REAL NOT NULL,
+    accessed  REAL NOT NULL
+)
+"""
+
+
+def instance_key(instance: Instance) -> str:
+    """Canonical content hash of an instance."""
+    h = hashlib.sha256()
+    h.update(array("q", [instance.n, instance.m]).tobytes())
+    for i in range(instance.m):
+        elems = sorted(instance.elements(i))
+        h.update(array("q", [len(elems)]).tobytes())
+        h.update(array("i", elems).tobytes())
+    return h.hexdigest()
+
+
+class CacheEntry:
+    """Best known cover of one instance."""
+
+    __slots__ = ("key", "size", "cover", "optimal", "algorithm", "runtime")
+
+    def __init__(self, key: str, size: int, cover: List[int], optimal: bool, algorithm: str, runtime: float):
+        self.key = key
+        self.size = size
+        self.cover = cover          # 0-based subset indices
+        self.optimal = optimal
+        self.algorithm = algorithm
+        self.runtime = runtime
+
+
+class SolutionCache:
+    """SQLite-backed map from instance hash to its best known cover."""
+
+    def __init__(self, path: str = DEFAULT_PATH, max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_age_days: float = DEFAULT_MAX_AGE_DAYS):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age_days * 86400
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(_SCHEMA)
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def lookup(self, key: str) -> Optional[CacheEntry]:
+        row = self.conn.execute(
+            "SELECT size, cover, optimal, algorithm, runtime FROM solutions WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        self.conn.execute("UPDATE solutions SET accessed = ? WHERE key = ?", (time.time(), key))
+        self.conn.commit()
+        size, cover, optimal, algorithm, runtime = row
+        indices = array("i")
+        indices.frombytes(cover)
+        return CacheEntry(key, size, indices.tolist(), bool(optimal), algorithm, runtime)
+
+    def store(self, key: str, instance: Instance, cover: List[int], optimal: bool,
+              algorithm: str, runtime: float) -> bool:
+        """Record a cover unless the cache already holds a better (or equally good, proven) one."""
+        current = self.conn.execute("SELECT size, optimal FROM solutions WHERE key = ?", (key,)).fetchone()
+        size = len(cover)
+        if current is not None:
+            old_size, old_optimal = current
+            if old_size < size or (old_size == size and (old_optimal or not optimal)):
+                return False
+
+        now = time.time()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO solutions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, instance.n, instance.m, size, array("i", sorted(cover)).tobytes(), int(optimal),
+             algorithm, runtime, now, now),
+        )
+        self.conn.commit()
+        self.evict()
+        return True
+
+    def evict(self):
+        """Drop entries unused for longer than max_age, then least recently used ones beyond max_bytes."""
+        self.conn.execute("DELETE FROM solutions WHERE accessed < ?", (time.time() - self.max_age,))
+        total = self.conn.execute("SELECT COALESCE(SUM(LENGTH(cover)), 0) FROM solutions").fetchone()[0]
+        if total > self.max_bytes:
+            rows = self.conn.execute("SELECT key, LENGTH(cover) FROM solutions ORDER BY accessed").fetchall()
+            for key, nbytes in rows:
+                if total <= self.max_bytes:
+                    break
+                self.conn.execute("DELETE FROM solutions WHERE key = ?", (key,))
+                total -= nbytes
+        self.conn.commit()
@@ -0,0 +1,69 @@
+"""
+Periodic checkpoints of a running solver, so long runs survive being killed and can be resumed.
+
+A solver that takes a Checkpoint asks due() at the points where it already checks the clock, and when
+the interval has passed hands save() a small dict of its search state (see branch_and_bound and
+SimulatedAnnealing.solve for what each one keeps). The state is pickled next to a header naming the
+instance, algorithm and seed, written to a temporary file, synced and renamed over the previous
+checkpoint, so a kill at any moment leaves either the old or the new checkpoint intact. Writes only
+happen once per interval, which keeps their cost out of the search loops.
+
+On resume, load() returns the saved state if the header matches the run, and the solver picks up from
+it with its elapsed time carried over, so the cutoff and the trace times stay those of the whole run.
+"""
+import os
+import pickle
+import time
+from typing import Any, Dict, Optional
+
+DEFAULT_INTERVAL = 60.0     # Seconds between two checkpoints
+_FORMAT = 1
+
+
+class Checkpoint:
+    """Checkpoint file of one run (instance, algorithm, seed)."""
+
+    def __init__(self, path: str, key: str, alg: str, seed=None, interval: float = DEFAULT_INTERVAL):
+        self.path = path
+        self.header = {"format": _FORMAT, "key": key, "alg": alg, "seed": seed}
+        self.interval = interval
+        self.next_save = time.time() + interval
+        self.resumed: Optional[Dict[str, Any]] = None     # State loaded by load(), for the solver to pick up
+        self.saves = 0
+
+    def due(self) -> bool:
+        return time.time() >= self.next_save
+
+    def save(self, state: Dict[str, Any]):
+        """Atomically replace the checkpoint with `state`."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump((self.header, state), f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self.saves += 1
+        self.next_save = time.time() + self.interval
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Saved state of this run, or None if there is no checkpoint or it belongs to another run."""
+        try:
+            with open(self.path, "rb") as f:
+                header, state = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (pickle.UnpicklingError, EOFError, ValueError) as exc:
+            print(f"Ignoring unreadable checkpoint {self.path}: {exc}")
+            return None
+        if header != self.header:
+            print(f"Ignoring checkpoint {self.path}: it was written by a different run")
+            return None
+        self.resumed = state
+        return state
+
+    def clear(self):
+        """Remove the checkpoint once the run has finished."""
+        for path in (self.path, self.path + ".tmp"):
+            if os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,162 @@
+"""
+Decomposition of an instance into independent blocks.
+
+Elements that share a subset belong to the same connected component of the element-subset bipartite
+graph, found with union-find over the elements. A minimum cover is the union of minimum covers of the
+components, so each one is solved on its own: small components inline, larger ones across a process
+pool, each with a share of the cutoff proportional to its number of nonzeros. The sub-covers are mapped
+back to the original subset indices, and the component traces are merged into one trace of the total
+cover size.
+"""
+import math
+import os
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Set, Tuple
+
+from core.bounds import easy_bound
+from core.restricted import Solver
+
+# Components with at most this many nonzeros are solved in the calling process
+SMALL_COMPONENT = 2000
+
+
+class Component:
+    """One block: its elements, its subsets (original indices) and the relabelled sub-instance."""
+
+    __slots__ = ("elements", "subset_ids", "nnz")
+
+    def __init__(self, elements: List[int], subset_ids: List[int], nnz: int):
+        self.elements = elements
+        self.subset_ids = subset_ids
+        self.nnz = nnz
+
+    def sub_instance(self, subsets: Sequence[Set[int]]) -> Tuple[int, List[frozenset]]:
+        """(n, subsets) of the component with its elements renumbered 1..k."""
+        label = {e: i for i, e in enumerate(self.elements, 1)}
+        return len(self.elements), [frozenset(label[e] for e in subsets[j]) for j in self.subset_ids]
+
+
+def find_components(n: int, subsets: Sequence[Set[int]]) -> List[Component]:
+    """Connected components, largest first. Elements in no subset form components without subsets."""
+    parent = array("i", range(n + 1))
+    size = array("i", [1]) * (n + 1)
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]   # Path halving
+            x = parent[x]
+        return x
+
+    for s in subsets:
+        it = iter(s)
+        first = next(it, None)
+        if first is None:
+            continue
+        root = find(first)
+        for e in it:
+            other = find(e)
+            if other != root:
+                # Union by size
+                if size[other] > size[root]:
+                    root, other = other, root
+                parent[other] = root
+                size[root] += size[other]
+
+    groups = {}
+    for e in range(1, n + 1):
+        groups.setdefault(find(e), ([], [], [0]))[0].append(e)
+    for j, s in enumerate(subsets):
+        if s:
+            group = groups[find(next(iter(s)))]
+            group[1].append(j)
+            group[2][0] += len(s)
+    components = [Component(elements, subset_ids, nnz[0]) for elements, subset_ids, nnz in groups.values()]
+    components.sort(key=lambda c: -c.nnz)
+    return components
+
+
+def merge_traces(traces: List[List[Tuple[float, int]]]) -> List[Tuple[float, int]]:
+    """Trace of the summed cover size, starting once every component has a cover."""
+    events = sorted((t, i, q) for i, trace in enumerate(traces) for t, q in trace)
+    current = [math.inf] * len(traces)
+    merged = []
+    for t, i, q in events:
+        if q >= current[i]:
+            continue
+        current[i] = q
+        total = sum(current)
+        if total != math.inf and (not merged or total < merged[-1][1]):
+            merged.append((t, total))
+    return merged
+
+
+def _solve_component(solver: Solver, n: int, subsets: List[frozenset], cutoff_time: float, start_time: float):
+    # A subset covering the whole component is an optimal cover of it
+    for j, s in enumerate(subsets):
+        if len(s) == n:
+            return 1, [j], [(time.time() - start_time, 1)], True
+    # The component's own bound: the instance's one bounds the sum over components, not each of them
+    return solver(n, subsets, cutoff_time, start_time, easy_bound(n, subsets).value)
+
+
+def solve_components(n: int, subsets: Sequence[Set[int]], solver: Solver, cutoff_time: float, start_time: float,
+                     workers: Optional[int] = None, components: Optional[List[Component]] = None,
+                     lower_bound: Optional[int] = None):
+    """Solve every component separately and stitch the results.
+
+    lower_bound is a bound of the full instance, passed on when it is a single component; several
+    components are each solved down to a bound of their own.
+
+    Returns (best_score, best_solution, trace, proven) in the indices of the full instance, best_score being
+    inf if some element is in no subset or a component could not be covered, and proven telling whether the
+    solver proved the cover of every component optimal.
+    """
+    if components is None:
+        components = find_components(n, subsets)
+    if any(not c.subset_ids for c in components):
+        return math.inf, [], [], False
+    if len(components) == 1:
+        # Nothing to split: run the solver on the instance itself
+        return solver(n, subsets, cutoff_time, start_time, lower_bound)
+
+    # Cutoff shares proportional to size; with w workers, w components run at the same time
+    remaining = max(0.0, cutoff_time - (time.time() - start_time))
+    total_nnz = sum(c.nnz for c in components) or 1
+    parallel = workers or os.cpu_count() or 1
+    small = [c for c in components if c.nnz <= SMALL_COMPONENT]
+    large = [c for c in components if c.nnz > SMALL_COMPONENT]
+
+    results = {}
+    jobs = {}
+    pool = ProcessPoolExecutor(max_workers=workers) if len(large) > 1 else None
+    try:
+        for c in large:
+            share = min(remaining, remaining * c.nnz / total_nnz * (parallel if pool else 1))
+            k, sub = c.sub_instance(subsets)
+            cutoff = time.time() - start_time + share
+            if pool is not None:
+                jobs[id(c)] = pool.submit(_solve_component, solver, k, sub, cutoff, start_time)
+            else:
+                results[id(c)] = _solve_component(solver, k, sub, cutoff, start_time)
+        for c in small:
+            k, sub = c.sub_instance(subsets)
+            cutoff = time.time() - start_time + remaining * c.nnz / total_nnz
+            results[id(c)] = _solve_component(solver, k, sub, cutoff, start_time)
+        for key, job in jobs.items():
+            results[key] = job.result()
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    best_solution, traces, proven = [], [], True
+    for c in components:
+        score, solution, trace, component_proven = results[id(c)]
+        if score == math.inf or not solution:
+            return math.inf, [], [], False
+        best_solution.extend(c.subset_ids[j] for j in solution)
+        traces.append(trace)
+        proven = proven and component_proven
+    best_solution.sort()
+    return len(best_solution), best_solution, merge_traces(traces), proven
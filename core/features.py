@@ -0,0 +1,78 @@
+"""
+Instance features for algorithm selection (core/selection.py).
+
+All of them come from one pass over the subsets plus the union-find of core/decompose.py, so extraction is
+O(nnz) up to the inverse Ackermann factor and takes a fraction of the time of any solver run:
+- size        n, m, nnz and the density nnz / (n * m),
+- subsets     mean, coefficient of variation, min and max of the subset sizes,
+- elements    the same for the element frequencies (number of subsets containing each element), and the
+              number of elements in no subset,
+- structure   the number of forced subsets (the only subset of some element, so part of every cover) and
+              the number of connected components.
+"""
+import math
+from array import array
+from typing import Dict, List, Sequence, Set
+
+from core.decompose import find_components
+from core.instance import Instance
+
+# Features the selection model measures distances on, in this order
+MODEL_FEATURES = (
+    "log_n", "log_m", "log_nnz", "density",
+    "size_mean", "size_cv", "freq_mean", "freq_cv",
+    "forced_ratio", "log_components",
+)
+
+
+def _spread(values: Sequence[int]):
+    """(mean, coefficient of variation, min, max) of a nonempty sequence."""
+    total = sum(values)
+    mean = total / len(values)
+    variance = sum(v * v for v in values) / len(values) - mean * mean
+    cv = math.sqrt(max(0.0, variance)) / mean if mean else 0.0
+    return mean, cv, min(values), max(values)
+
+
+def extract_features(n: int, subsets: Sequence[Set[int]]) -> Dict[str, float]:
+    """Features of the instance (n, subsets), keyed by name."""
+    m = len(subsets)
+    sizes = [len(s) for s in subsets] or [0]
+    freq = array("i", [0]) * (n + 1)
+    owner = array("i", [-1]) * (n + 1)
+    for j, s in enumerate(subsets):
+        for e in s:
+            freq[e] += 1
+            owner[e] = j
+    element_freq: List[int] = freq[1:].tolist() or [0]
+    nnz = sum(sizes)
+
+    size_mean, size_cv, size_min, size_max = _spread(sizes)
+    freq_mean, freq_cv, freq_min, freq_max = _spread(element_freq)
+    forced = len({owner[e] for e in range(1, n + 1) if freq[e] == 1})
+    components = len(find_components(n, subsets)) if n else 0
+
+    features = {
+        "n": n, "m": m, "nnz": nnz,
+        "density": nnz / (n * m) if n and m else 0.0,
+        "size_mean": size_mean, "size_cv": size_cv, "size_min": size_min, "size_max": size_max,
+        "freq_mean": freq_mean, "freq_cv": freq_cv, "freq_min": freq_min, "freq_max": freq_max,
+        "uncovered": sum(1 for f in element_freq if f == 0) if n else 0,
+        "forced": forced,
+        "forced_ratio": forced / m if m else 0.0,
+        "components": components,
+    }
+    # Counts span orders of magnitude between instances, so distances use their logarithms
+    for name in ("n", "m", "nnz", "components"):
+        features["log_" + name] = math.log1p(features[name])
+    return features
+
+
+def instance_features(instance: Instance) -> Dict[str, float]:
+    """extract_features of a loaded instance."""
+    return extract_features(instance.n, instance.sets())
+
+
+def feature_vector(features: Dict[str, float]) -> List[float]:
+    """The MODEL_FEATURES of a feature dict, as a list."""
+    return [float(features[name]) for name in MODEL_FEATURES]
@@ -0,0 +1,113 @@
+"""
+Cooperative hybrid run: greedy, local search and branch and bound on one instance within one cutoff.
+
+The greedy cover is computed first and becomes the shared incumbent (core/incumbent.py). LS1, LS2 and BnB
+then run at the same time in a process pool whose workers attach to one shared-memory copy of the
+instance. Every improvement goes through the incumbent, so the local searches continue from each other's
+covers and BnB prunes with the best cover any of them has found; when BnB exhausts its tree the incumbent
+is proven optimal and every worker returns, as they also do once the incumbent reaches the instance's
+lower bound. LS1 restarts from the incumbent with a new seed whenever it stagnates before the cutoff.
+
+The component traces are merged into one trace of the run, each point labelled with the component that
+produced the improvement.
+"""
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Set, Tuple
+
+from approx.approx import set_cover
+from bnb.bnb import branch_and_bound
+from core.incumbent import NO_COVER, SharedIncumbent
+from core.instance import Instance
+from core.shm import attach, publish
+from LS1.sa_core import SimulatedAnnealing
+from LS2.hillclimbing import LS2
+
+HYBRID_COMPONENTS = ("LS1", "LS2", "BnB")
+
+# Per-worker state, set by _init_worker
+_incumbent = None
+_instance = None
+
+
+def _init_worker(shm_name: str, incumbent: SharedIncumbent):
+    global _incumbent, _instance
+    _incumbent = incumbent
+    # Kept attached for the life of the worker: the components read the shared block directly
+    _instance = attach(shm_name)
+
+
+def _run_component(name: str, cutoff_time: float, start_time: float, seed: int) -> List[Tuple[float, int]]:
+    """Run one component against the shared incumbent; returns its trace on the shared clock."""
+    n, subsets = _instance.n, _instance.views()
+    incumbent = _incumbent
+    if incumbent.fetch()[0] == NO_COVER:
+        # Not even the greedy cover covers the instance, so no cover exists
+        return []
+    if name == "BnB":
+        size, cover = incumbent.fetch()
+        init_score = size if size != NO_COVER else float("inf")
+        return branch_and_bound(n, subsets, cutoff_time, start_time, init_score, cover, incumbent=incumbent)[2]
+    if name == "LS1":
+        trace = []
+        while time.time() - start_time < cutoff_time and not incumbent.finished():
+            # Every restart continues from the best cover known to any component
+            size, cover = incumbent.fetch()
+            sa = SimulatedAnnealing(n, subsets, seed=seed)
+            trace.extend(sa.solve(cutoff_time, start_time, cover if size != NO_COVER else None,
+                                  incumbent=incumbent)[2])
+            seed += 1
+        return trace
+    # LS2 keeps its own clock, shift its trace onto the shared one
+    offset = time.time() - start_time
+    size, cover = incumbent.fetch()
+    trace = LS2(n, subsets, cutoff_time - offset, seed, use_tabu=True,
+                initial_solution=cover if size != NO_COVER else None, incumbent=incumbent)[2]
+    return [(t + offset, q) for t, q in trace]
+
+
+def merge_labelled(traces: Sequence[Tuple[str, List[Tuple[float, int]]]]) -> Tuple[List[Tuple[float, int]], List[str]]:
+    """Improving points of all component traces in time order, with the component behind each point."""
+    events = sorted((t, q, name) for name, trace in traces for t, q in trace)
+    merged, sources = [], []
+    for t, q, name in events:
+        if not merged or q < merged[-1][1]:
+            merged.append((t, q))
+            sources.append(name)
+    return merged, sources
+
+
+def solve_hybrid(n: int, subsets: Sequence[Set[int]], cutoff_time: float, start_time: float, seed: int = 42,
+                 components: Sequence[str] = HYBRID_COMPONENTS, lower_bound: Optional[int] = None):
+    """Run the components cooperatively.
+
+    Returns (best_score, best_set, trace, sources, proven): sources[i] names the component that found
+    trace[i], and proven tells whether best_set was proven optimal (by BnB or by reaching lower_bound).
+    """
+    incumbent = SharedIncumbent(len(subsets), lower_bound)
+    greedy = sorted(i - 1 for i in set_cover(n, subsets))
+    greedy_trace = []
+    if len(set().union(*(subsets[i] for i in greedy))) == n:
+        incumbent.offer(greedy)
+        greedy_trace.append((time.time() - start_time, len(greedy)))
+
+    if incumbent.finished():
+        # The greedy cover already meets the lower bound
+        return len(greedy), greedy, *merge_labelled([("Approx", greedy_trace)]), True
+
+    shm = publish(Instance.from_subsets(n, subsets))
+    try:
+        with ProcessPoolExecutor(max_workers=len(components), initializer=_init_worker,
+                                 initargs=(shm.name, incumbent)) as pool:
+            jobs = [(name, pool.submit(_run_component, name, cutoff_time, start_time, seed))
+                    for name in components]
+            traces = [("Approx", greedy_trace)] + [(name, job.result()) for name, job in jobs]
+    finally:
+        shm.close()
+        shm.unlink()
+
+    size, cover = incumbent.fetch()
+    trace, sources = merge_labelled(traces)
+    if size == NO_COVER:
+        return float("inf"), [], trace, sources, False
+    return size, sorted(cover), trace, sources, bool(incumbent.proven.value)
@@ -0,0 +1,168 @@
+"""
+Incremental re-solving for streams of instances that differ by a few subsets or elements.
+
+An IncrementalSolver owns a mutable copy of the instance, its element index and the current cover as
+an LS1 Solution, and updates all three in place for each delta:
+
+    add_subset(elements)       append a subset, returns its index
+    remove_subset(i)           the last subset moves into slot i
+    add_element(subset_ids)    new element n + 1 contained in the given subsets
+    remove_element(e)          element n is renumbered to e
+
+Removals swap the last subset or element into the freed slot, so only the entries touching the two
+ids change. resolve() then repairs the previous best cover (greedy cover of the elements that lost
+coverage, redundant subsets dropped) and continues LS1 or LS2 from it for a short cutoff instead of
+starting over.
+"""
+import time
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from approx.approx import greedy_cover
+from core.instance import build_element_index
+from LS1.sa_core import SimulatedAnnealing
+from LS1.solution import Solution
+from LS2.hillclimbing import LS2
+
+ALGORITHMS = ("LS1", "LS2")
+
+
+class IncrementalSolver:
+    """Instance, element index and cover kept in step under subset and element deltas."""
+
+    def __init__(self, n: int, subsets: Sequence[Iterable[int]], cover: Iterable[int] = (),
+                 alg: str = "LS1", seed: int = 42, use_tabu: bool = False):
+        if alg not in ALGORITHMS:
+            raise ValueError(f"Incremental re-solve supports {', '.join(ALGORITHMS)}, not {alg}")
+        self.n = n
+        self.subsets: List[frozenset] = [frozenset(s) for s in subsets]
+        self.elem_subsets = build_element_index(n, self.subsets)
+        self.sol = Solution(n, self.subsets, cover)
+        self.alg = alg
+        self.seed = seed
+        self.use_tabu = use_tabu
+
+    @property
+    def m(self) -> int:
+        return len(self.subsets)
+
+    def cover(self) -> List[int]:
+        """Current cover (0-based subset indices), feasible after resolve()."""
+        return sorted(self.sol.members())
+
+    def _replace(self, i: int, subset: frozenset):
+        """Swap in new contents for subset i, keeping the cover counts right if it is selected."""
+        selected = i in self.sol
+        if selected:
+            self.sol.remove(i)
+        self.subsets[i] = subset
+        if selected:
+            self.sol.add(i)
+
+    def add_subset(self, elements: Iterable[int]) -> int:
+        subset = frozenset(elements)
+        bad = [e for e in subset if not 1 <= e <= self.n]
+        if bad:
+            raise ValueError(f"elements out of range 1..{self.n}: {sorted(bad)[:5]}")
+        i = len(self.subsets)
+        self.subsets.append(subset)
+        self.sol.grow_subsets()
+        for e in subset:
+            self.elem_subsets[e].append(i)
+        return i
+
+    def remove_subset(self, i: int):
+        if not 0 <= i < self.m:
+            raise IndexError(f"subset {i} out of range 0..{self.m - 1}")
+        last = self.m - 1
+        last_selected = last in self.sol
+        if i in self.sol:
+            self.sol.remove(i)
+        if last_selected and last != i:
+            self.sol.remove(last)
+
+        for e in self.subsets[i]:
+            self.elem_subsets[e].remove(i)
+        if last != i:
+            for e in self.subsets[last]:
+                owners = self.elem_subsets[e]
+                owners[owners.index(last)] = i
+            self.subsets[i] = self.subsets[last]
+
+        self.subsets.pop()
+        self.sol.shrink_subsets()
+        if last_selected and last != i:
+            self.sol.add(i)
+
+    def add_element(self, subset_ids: Iterable[int]) -> int:
+        ids = sorted(set(subset_ids))
+        bad = [j for j in ids if not 0 <= j < self.m]
+        if bad:
+            raise IndexError(f"subsets out of range 0..{self.m - 1}: {bad[:5]}")
+        self.n += 1
+        e = self.n
+        self.sol.grow_elements()
+        self.elem_subsets.append(ids)
+        for j in ids:
+            self._replace(j, self.subsets[j] | {e})
+        return e
+
+    def remove_element(self, e: int):
+        if not 1 <= e <= self.n:
+            raise IndexError(f"element {e} out of range 1..{self.n}")
+        last = self.n
+        for j in self.elem_subsets[e]:
+            self._replace(j, self.subsets[j] - {e})
+        if last != e:
+            for j in self.elem_subsets[last]:
+                self._replace(j, (self.subsets[j] - {last}) | {e})
+            self.elem_subsets[e] = self.elem_subsets[last]
+        self.elem_subsets.pop()
+        self.sol.shrink_elements()
+        self.n -= 1
+
+    def apply(self, delta: Iterable[Tuple[str, object]]):
+        """Apply a batch of (operation, argument) pairs, e.g. [("add_subset", [1, 4]), ("remove_element", 3)]."""
+        for op, arg in delta:
+            if op not in ("add_subset", "remove_subset", "add_element", "remove_element"):
+                raise ValueError(f"Unknown delta operation {op}")
+            getattr(self, op)(arg)
+
+    def repair(self) -> List[int]:
+        """Cover elements that lost coverage with the Approx greedy, then drop redundant subsets.
+
+        Returns the elements that could not be covered (empty when the cover is feasible).
+        """
+        sol, count = self.sol, self.sol.cover_count
+        if sol.uncovered:
+            uncovered = [e for e in range(1, self.n + 1) if count[e] == 0]
+            for i in greedy_cover(self.subsets, uncovered, self.elem_subsets):
+                sol.add(i)
+        for i in sorted(sol.members(), key=lambda i: len(self.subsets[i])):
+            if all(count[e] > 1 for e in self.subsets[i]):
+                sol.remove(i)
+        return [e for e in range(1, self.n + 1) if count[e] == 0] if sol.uncovered else []
+
+    def resolve(self, cutoff_time: float, start_time: Optional[float] = None
+                ) -> Tuple[int, List[int], List[Tuple[float, int]]]:
+        """Repair the current cover and improve it with the local search for up to cutoff_time seconds."""
+        if start_time is None:
+            start_time = time.time()
+        missing = self.repair()
+        repaired = self.cover()
+        if missing or self.n == 0:
+            # Nothing to search: the instance is trivially or impossibly covered
+            return len(repaired), repaired, [(time.time() - start_time, len(repaired))]
+
+        if self.alg == "LS1":
+            sa = SimulatedAnnealing(self.n, self.subsets, seed=self.seed, use_tabu=self.use_tabu,
+                                    elem_subsets=self.elem_subsets)
+            best_score, best_set, trace = sa.solve(cutoff_time, start_time, repaired)
+        else:
+            offset = time.time() - start_time
+            best_score, best_set, trace = LS2(self.n, self.subsets, cutoff_time - offset, self.seed,
+                                              use_tabu=self.use_tabu, initial_solution=repaired)
+            trace = [(t + offset, q) for t, q in trace]
+
+        if best_score < len(repaired):
+            self.sol = Solution(self.n, self.subsets, best_set)
+        return len(self.sol), self.cover(), trace
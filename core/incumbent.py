@@ -0,0 +1,56 @@
+"""
+Best cover shared by the solvers of one cooperative run (see core/hybrid.py).
+
+The cover lives in a process-shared int array next to its size and a stop event, all created before the
+worker processes start. Solvers given an incumbent offer() every cover that improves on their own best,
+read best_size() at the points where they already check the clock, and fetch() the shared cover when it is
+better than theirs: local searches continue from it and branch and bound tightens its upper bound with it.
+A solver that proves the shared cover optimal calls finish(), which makes every other solver return; so
+does an offered cover that reaches the instance's lower bound (core/bounds.py).
+"""
+import multiprocessing as mp
+from typing import Iterable, List, Optional, Tuple
+
+NO_COVER = 2 ** 31 - 1
+
+
+class SharedIncumbent:
+    """Process-shared best cover with a stop flag."""
+
+    def __init__(self, m: int, lower_bound: Optional[int] = None, ctx=None):
+        ctx = ctx or mp.get_context()
+        self.lower_bound = lower_bound
+        self.size = ctx.Value("i", NO_COVER)        # Its lock guards the cover as well
+        self.cover = ctx.Array("i", max(1, m), lock=False)
+        self.proven = ctx.Value("b", 0, lock=False)
+        self.stop = ctx.Event()
+
+    def best_size(self) -> int:
+        return self.size.value
+
+    def offer(self, cover: Iterable[int]) -> bool:
+        """Publish cover if it is smaller than the shared one; returns whether it was taken."""
+        cover = list(cover)
+        with self.size.get_lock():
+            if len(cover) >= self.size.value:
+                return False
+            self.cover[:len(cover)] = cover
+            self.size.value = len(cover)
+        if self.lower_bound is not None and len(cover) <= self.lower_bound:
+            self.finish(proven=True)
+        return True
+
+    def fetch(self) -> Tuple[int, List[int]]:
+        """(size, cover) of the shared cover; size is NO_COVER while there is none."""
+        with self.size.get_lock():
+            size = self.size.value
+            return size, (self.cover[:size] if size != NO_COVER else [])
+
+    def finish(self, proven: bool = False):
+        """End the run, recording whether the shared cover was proven optimal."""
+        if proven:
+            self.proven.value = 1
+        self.stop.set()
+
+    def finished(self) -> bool:
+        return self.stop.is_set()
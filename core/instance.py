@@ -0,0 +1,134 @@
+"""
+Compact representation of a Minimum Set Cover instance.
+
+Subsets are stored in CSR form: subset i holds the elements
+indices[indptr[i]:indptr[i + 1]]. Element ids stay 1-based, as in the .in files.
+The two buffers can be array.array objects or memoryviews into shared memory
+(see core/shm.py), so the same class serves owned and attached instances.
+"""
+from array import array
+from typing import Iterable, List, Optional, Sequence, Set
+
+
+def build_element_index(n: int, subsets: Sequence[Iterable[int]]) -> List[List[int]]:
+    """List, for every element, the indices of the subsets containing it."""
+    elem_subsets = [[] for _ in range(n + 1)]
+    for idx, subset in enumerate(subsets):
+        for e in subset:
+            elem_subsets[e].append(idx)
+    return elem_subsets
+
+
+class SubsetView:
+    """Read-only sequence of the subsets of an instance as slices of its CSR buffers.
+
+    Items support iteration and len() but no set operations. Nothing is built per subset, so a worker
+    reading an attached instance (core/shm.py) through a view holds no copy of it.
+    """
+
+    __slots__ = ("indptr", "indices", "m")
+
+    def __init__(self, indptr, indices):
+        self.indptr = indptr
+        self.indices = indices
+        self.m = len(indptr) - 1
+
+    def __len__(self) -> int:
+        return self.m
+
+    def __getitem__(self, i: int):
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def __iter__(self):
+        indptr, indices = self.indptr, self.indices
+        for i in range(self.m):
+            yield indices[indptr[i]:indptr[i + 1]]
+
+
+class Instance:
+    """Read-only CSR/bitset view of a set cover instance.
+
+    Indexing an Instance returns the frozenset of subset i, built lazily and cached, so
+    code written against a list of sets (BnB, LS1, LS2, Approx) can consume it unchanged.
+    """
+
+    __slots__ = ("n", "m", "indptr", "indices", "_sets", "_masks", "_owner")
+
+    def __init__(self, n: int, indptr, indices, owner=None):
+        self.n = n
+        self.m = len(indptr) - 1
+        self.indptr = indptr
+        self.indices = indices
+        self._sets: List[Optional[frozenset]] = [None] * self.m
+        self._masks: Optional[List[int]] = None
+        # Keeps the backing buffer (shared memory block or mmap) alive
+        self._owner = owner
+
+    @classmethod
+    def from_subsets(cls, n: int, subsets: Iterable[Iterable[int]]) -> "Instance":
+        """Build an owned instance from a list of subsets."""
+        indptr = array("q", [0])
+        indices = array("i")
+        for subset in subsets:
+            indices.extend(sorted(subset))
+            indptr.append(len(indices))
+        return cls(n, indptr, indices)
+
+    @property
+    def nnz(self) -> int:
+        return self.indptr[self.m]
+
+    def __len__(self) -> int:
+        return self.m
+
+    def __getitem__(self, i: int) -> frozenset:
+        s = self._sets[i]
+        if s is None:
+            s = frozenset(self.elements(i))
+            self._sets[i] = s
+        return s
+
+    def __iter__(self):
+        for i in range(self.m):
+            yield self[i]
+
+    def sets(self) -> List[frozenset]:
+        """All subsets as a shared, cached list of frozensets (plain list indexing in hot loops).
+
+        The list is owned by the instance; callers must not modify it.
+        """
+        for i in range(self.m):
+            if self._sets[i] is None:
+                self._sets[i] = frozenset(self.elements(i))
+        return self._sets
+
+    def views(self) -> SubsetView:
+        """All subsets as slices of the CSR buffers, for solvers that only iterate over them."""
+        return SubsetView(self.indptr, self.indices)
+
+    def elements(self, i: int):
+        """Elements of subset i as a slice of the CSR buffer (no set is built)."""
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def size(self, i: int) -> int:
+        return self.indptr[i + 1] - self.indptr[i]
+
+    def masks(self) -> List[int]:
+        """Bitset of every subset as a Python int, bit e set for element e."""
+        if self._masks is None:
+            masks = []
+            for i in range(self.m):
+                mask = 0
+                for e in self.elements(i):
+                    mask |= 1 << e
+                masks.append(mask)
+            self._masks = masks
+        return self._masks
+
+    def universe_mask(self) -> int:
+        """Bitset with bits 1..n set."""
+        return ((1 << (self.n + 1)) - 1) ^ 1
+
+    def to_sets(self) -> List[Set[int]]:
+        """Materialize the classic list-of-sets form."""
+        return [set(self.elements(i)) for i in range(self.m)]
@@ -0,0 +1,215 @@
+"""
+Lagrangian relaxation of unicost set cover with subgradient optimization.
+
+Relaxing the cover constraints with multipliers u_e >= 0 gives
+    L(u) = sum_e u_e + sum_j min(0, 1 - sum_{e in S_j} u_e),
+a valid lower bound for every u. Subgradient steps push u towards the best such bound, and every
+few iterations the current reduced costs guide a greedy cover, so one run yields both a bound and
+a good upper bound. The same multipliers price columns for BnB pruning, the core-problem mode
+and candidate prioritization in the local searches.
+
+The arithmetic runs in NumPy over the CSR form of the instance (see core/instance.py): the column
+sums of u are one gather and one np.add.reduceat over the rows, and the subgradient 1 - x A is one
+bincount over the rows of the negative-cost columns, so an iteration is a few passes over the
+nonzeros at C speed even for millions of them.
+"""
+import math
+import time
+from itertools import chain
+from typing import List, Optional, Sequence, Set
+
+import numpy as np
+
+from approx.approx import greedy_cover
+from core.instance import build_element_index
+
+DEFAULT_MAX_ITER = 300
+HEURISTIC_EVERY = 10        # Iterations between Lagrangian greedy covers
+STALL_LIMIT = 20            # Iterations without bound improvement before halving the step factor
+MIN_STEP_FACTOR = 1e-4
+EPS = 1e-6
+
+
+class LagrangianResult:
+    """Outcome of a subgradient run."""
+
+    __slots__ = ("lower_bound", "bound_value", "multipliers", "cover", "iterations")
+
+    def __init__(self, lower_bound: int, bound_value: float, multipliers: List[float],
+                 cover: List[int], iterations: int):
+        self.lower_bound = lower_bound          # ceil of the best L(u), a valid bound on the optimum
+        self.bound_value = bound_value          # best L(u) itself
+        self.multipliers = multipliers          # u, indexed by element (index 0 unused)
+        self.cover = cover                      # best cover found by the Lagrangian heuristic
+        self.iterations = iterations
+
+
+class CSR:
+    """Row pointers and element ids of the columns as NumPy arrays, with the row structure reduceat needs."""
+
+    __slots__ = ("indptr", "indices", "sizes", "nonempty", "starts")
+
+    def __init__(self, subsets: Sequence[Set[int]]):
+        if hasattr(subsets, "indptr"):
+            # An Instance already holds its CSR buffers
+            self.indptr = np.asarray(subsets.indptr, dtype=np.int64)
+            self.indices = np.asarray(subsets.indices, dtype=np.int64)
+        else:
+            sizes = np.fromiter(map(len, subsets), dtype=np.int64, count=len(subsets))
+            self.indptr = np.zeros(len(subsets) + 1, dtype=np.int64)
+            np.cumsum(sizes, out=self.indptr[1:])
+            self.indices = np.fromiter(chain.from_iterable(subsets), dtype=np.int64, count=int(self.indptr[-1]))
+        self.sizes = np.diff(self.indptr)
+        # reduceat turns an empty row into the value at its start, so only nonempty rows are reduced
+        self.nonempty = self.sizes > 0
+        self.starts = self.indptr[:-1][self.nonempty]
+
+    def column_sums(self, u: np.ndarray) -> np.ndarray:
+        """sum_{e in S_j} u_e for every column j."""
+        sums = np.zeros(len(self.sizes))
+        if len(self.starts):
+            sums[self.nonempty] = np.add.reduceat(u[self.indices], self.starts)
+        return sums
+
+    def coverage(self, columns: np.ndarray, n: int) -> np.ndarray:
+        """Number of the selected columns (boolean mask) containing each element 0..n."""
+        return np.bincount(self.indices[np.repeat(columns, self.sizes)], minlength=n + 1)
+
+
+def reduced_costs(subsets: Sequence[Set[int]], u: List[float], csr: Optional[CSR] = None) -> List[float]:
+    """1 - sum of multipliers for every column."""
+    if csr is None:
+        csr = CSR(subsets)
+    return (1.0 - csr.column_sums(np.asarray(u, dtype=float))).tolist()
+
+
+def lagrangian_bound(u: List[float], costs: List[float], elements=None) -> float:
+    """L(u) from precomputed reduced costs, over all elements or only the given ones."""
+    total = sum(u) if elements is None else sum(u[e] for e in elements)
+    return total + sum(c for c in costs if c < 0)
+
+
+def residual_bound(u: List[float], subsets: Sequence[Set[int]], remaining: Set[int],
+                   csr: Optional[CSR] = None) -> float:
+    """L(u) for covering only `remaining` with the given columns (valid for any u >= 0)."""
+    if csr is None:
+        csr = CSR(subsets)
+    # Multipliers of covered elements drop out of both terms
+    u_rem = np.zeros(max(len(u), int(csr.indices.max(initial=0)) + 1))
+    rem = np.fromiter(remaining, dtype=np.int64, count=len(remaining))
+    u_rem[rem] = np.asarray(u, dtype=float)[rem]
+    costs = 1.0 - csr.column_sums(u_rem)
+    return float(u_rem.sum() + costs[costs < 0].sum())
+
+
+def lagrangian_cover(n: int, subsets: Sequence[Set[int]], u: List[float],
+                     elem_subsets: Optional[List[List[int]]] = None,
+                     costs: Optional[List[float]] = None) -> List[int]:
+    """Greedy cover guided by reduced costs: negative columns first, then greedy repair, then redundancy removal."""
+    if elem_subsets is None:
+        elem_subsets = build_element_index(n, subsets)
+    if costs is None:
+        costs = reduced_costs(subsets, u)
+
+    count = [0] * (n + 1)
+    cover = [j for j, c in enumerate(costs) if c < 0]
+    for j in cover:
+        for e in subsets[j]:
+            count[e] += 1
+
+    # Repair: among equal gains prefer the column with the lowest reduced cost
+    uncovered = [e for e in range(1, n + 1) if count[e] == 0]
+    for j in greedy_cover(subsets, uncovered, elem_subsets, costs):
+        cover.append(j)
+        for e in subsets[j]:
+            count[e] += 1
+
+    # Drop redundant columns, most expensive first
+    kept = []
+    for j in sorted(cover, key=lambda j: -costs[j]):
+        if all(count[e] > 1 for e in subsets[j]):
+            for e in subsets[j]:
+                count[e] -= 1
+        else:
+            kept.append(j)
+    return sorted(kept)
+
+
+def subgradient(n: int, subsets: Sequence[Set[int]], upper_bound: Optional[int] = None,
+                max_iter: int = DEFAULT_MAX_ITER, time_limit: Optional[float] = None,
+                multipliers: Optional[List[float]] = None) -> LagrangianResult:
+    """Optimize the multipliers with the Held-Karp subgradient method.
+
+    Stops after max_iter iterations, time_limit seconds, or once the bound meets the best cover.
+    """
+    start = time.time()
+    elem_subsets = build_element_index(n, subsets)
+    csr = CSR(subsets)
+
+    # Start from u_e = min over columns containing e of 1 / |S_j|
+    if multipliers is not None:
+        u = np.array(multipliers, dtype=float)
+    else:
+        u = np.full(n + 1, np.inf)
+        np.minimum.at(u, csr.indices, np.repeat(1.0 / np.maximum(csr.sizes, 1), csr.sizes))
+        u[np.isinf(u)] = 0.0
+    u[0] = 0.0
+
+    best_cover = lagrangian_cover(n, subsets, u.tolist(), elem_subsets)
+    ub = len(best_cover) if upper_bound is None else min(upper_bound, len(best_cover))
+    best_value, best_u = -math.inf, u.copy()
+    step_factor, stall, it = 2.0, 0, 0
+
+    for it in range(1, max_iter + 1):
+        if time_limit is not None and time.time() - start >= time_limit:
+            break
+
+        costs = 1.0 - csr.column_sums(u)
+        negative = costs < 0
+        value = float(u.sum() + costs[negative].sum())
+        if value > best_value + EPS:
+            best_value, best_u, stall = value, u.copy(), 0
+        else:
+            stall += 1
+            if stall >= STALL_LIMIT:
+                step_factor /= 2
+                stall = 0
+
+        if it % HEURISTIC_EVERY == 0:
+            cover = lagrangian_cover(n, subsets, u.tolist(), elem_subsets, costs.tolist())
+            if len(cover) < len(best_cover):
+                best_cover = cover
+                ub = min(ub, len(cover))
+
+        # Bound proves the incumbent optimal, or steps have become negligible
+        if math.ceil(best_value - EPS) >= ub or step_factor < MIN_STEP_FACTOR:
+            break
+
+        # Subgradient g = 1 - x A, x the relaxed solution (the negative-cost columns)
+        g = 1.0 - csr.coverage(negative, n)
+        g[0] = 0.0
+        # Elements at u_e = 0 cannot move further down
+        g[(u <= 0) & (g < 0)] = 0.0
+        norm = float(g @ g)
+        if norm == 0:
+            # The relaxed solution is a cover with complementary slackness: u is optimal
+            break
+
+        step = step_factor * (ub - value) / norm
+        u = np.maximum(0.0, u + step * g)
+        u[0] = 0.0
+
+    if n == 0:
+        lower_bound = 0
+    elif best_value == -math.inf:
+        lower_bound = 1
+    else:
+        lower_bound = max(1, math.ceil(best_value - EPS))
+    return LagrangianResult(lower_bound, best_value, best_u.tolist(), best_cover, it)
+
+
+def optimality_gap(score: float, lower_bound: float) -> float:
+    """Relative gap (score - lower_bound) / lower_bound, 0 when proven optimal."""
+    if lower_bound <= 0 or score == math.inf:
+        return math.inf
+    return max(0.0, (score - lower_bound) / lower_bound)
@@ -0,0 +1,62 @@
+"""
+Single parser for the .in format, shared by every solver and script.
+
+Format: a header line "n m", then m lines each holding a count k followed by k element ids.
+The count token is never treated as an element. Parsed instances are memoized per process by
+absolute path, modification time and size, so sweeps and repeated runs parse each file once.
+"""
+import os
+from array import array
+from typing import Dict, Tuple
+
+from core.instance import Instance
+
+_cache: Dict[str, Tuple[int, int, Instance]] = {}
+
+
+def parse_instance(text: str, source: str = "<string>") -> Instance:
+    """Parse and validate the contents of a .in file."""
+    tokens = text.split()
+    if len(tokens) < 2:
+        raise ValueError(f"{source}: missing 'n m' header")
+    n, m = int(tokens[0]), int(tokens[1])
+
+    indptr = array("q", [0])
+    indices = array("i")
+    pos = 2
+    for i in range(m):
+        if pos >= len(tokens):
+            raise ValueError(f"{source}: header announces {m} subsets but only {i} are present")
+        k = int(tokens[pos])
+        end = pos + 1 + k
+        if end > len(tokens):
+            raise ValueError(f"{source}: subset {i + 1} announces {k} elements but the file ends")
+        indices.extend(map(int, tokens[pos + 1:end]))
+        indptr.append(len(indices))
+        pos = end
+
+    if pos != len(tokens):
+        raise ValueError(f"{source}: {len(tokens) - pos} tokens after the {m} announced subsets")
+    if indices and (min(indices) < 1 or max(indices) > n):
+        raise ValueError(f"{source}: element ids must lie in 1..{n}")
+
+    return Instance(n, indptr, indices)
+
+
+def load_instance(path: str) -> Instance:
+    """Load an instance, reusing the parsed copy while the file is unchanged."""
+    full_path = os.path.abspath(path)
+    st = os.stat(full_path)
+    cached = _cache.get(full_path)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+
+    with open(full_path, "r") as f:
+        instance = parse_instance(f.read(), path)
+    _cache[full_path] = (st.st_mtime_ns, st.st_size, instance)
+    return instance
+
+
+def clear_cache():
+    """Forget every memoized instance."""
+    _cache.clear()
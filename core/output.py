@@ -0,0 +1,221 @@
+"""
+Buffered output of solutions and traces.
+
+Writers share one interface, add_run(...) then close(). Trace points are held in typed arrays and
+every file is produced with a single write:
+
+    LegacyWriter   the classic output/<instance>_<alg>_<cutoff>[_<seed>].sol/.trace files, plus a .source
+                   file naming the component behind each trace point when the run labels them (Hybrid)
+    ArchiveWriter  every run of a sweep bundled into one deflate-compressed zip, columnar inside:
+                   runs.tsv has one row per run (its trace is rows first..first+count of the point
+                   columns), points_time.f64 and points_score.i64 hold all trace points back to back,
+                   and points_source.txt, when some run labels its points, one label per point
+
+export_legacy() turns an archive back into the .sol/.trace layout, and read_archive() loads it for
+analysis without unpacking:
+
+    python -m core.output <archive> [<output_dir>]
+"""
+import math
+import os
+import sys
+import zipfile
+from array import array
+from collections import namedtuple
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "output")
+
+RUNS_MEMBER = "runs.tsv"
+TIME_MEMBER = "points_time.f64"
+SCORE_MEMBER = "points_score.i64"
+SOURCE_MEMBER = "points_source.txt"
+PROVEN_MARKER = "proven"
+RUN_COLUMNS = ("name", "instance", "alg", "cutoff", "seed", "score", "lower_bound", "first", "count", "cover",
+               "proven")
+
+# One run; times/scores are None when the run has no trace (Approx), sources when its points are unlabelled
+Run = namedtuple("Run", ["name", "instance", "alg", "cutoff", "seed", "score", "lower_bound", "cover",
+                         "times", "scores", "sources", "proven"], defaults=(None, False))
+
+
+def run_name(instance: str, alg: str, cutoff, seed=None) -> str:
+    """Base name <instance>_<alg>_<cutoff>[_<seed>] shared by the .sol and .trace files of a run."""
+    name_parts = [instance, alg, str(cutoff)]
+    if seed is not None:
+        name_parts.append(str(seed))
+    return "_".join(name_parts)
+
+
+def format_solution(score, cover: Iterable[int]) -> str:
+    """.sol contents: the score, then the 1-based indices of the 0-based cover."""
+    return f"{score}\n" + " ".join(str(i + 1) for i in cover) + "\n"
+
+
+def format_trace(times: Sequence[float], scores: Sequence[int], lower_bound: Optional[int] = None,
+                 proven: bool = False) -> str:
+    """.trace contents, one "time score [gap]" line per point.
+
+    The trace of a run whose cover was proven optimal ends with a line "proven" (PROVEN_MARKER), which
+    analytics.load_traces skips; every other line is numeric.
+    """
+    if lower_bound:
+        # Third column: optimality gap (q - lower_bound) / lower_bound
+        lines = [f"{t:.2f} {q} {(q - lower_bound) / lower_bound:.4f}" for t, q in zip(times, scores)]
+    else:
+        lines = [f"{t:.2f} {q}" for t, q in zip(times, scores)]
+    if proven:
+        lines.append(PROVEN_MARKER)
+    return "".join(line + "\n" for line in lines)
+
+
+def format_sources(sources: Sequence[str]) -> str:
+    """.source contents: the label of each trace point, one per line in trace order.
+
+    Labels stay out of the .trace file so that it remains purely numeric for analytics.py.
+    """
+    return "".join(source + "\n" for source in sources)
+
+
+def trace_columns(trace: Iterable[Tuple[float, int]]) -> Tuple[array, array]:
+    """Split (time, score) pairs into a float and an int column, skipping points without a cover."""
+    times, scores = array("d"), array("q")
+    for t, q in trace:
+        if q != math.inf:
+            times.append(t)
+            scores.append(int(q))
+    return times, scores
+
+
+def source_column(trace: Sequence[Tuple[float, int]], sources: Sequence[str]) -> List[str]:
+    """Labels of the points trace_columns keeps."""
+    return [source for (_, q), source in zip(trace, sources) if q != math.inf]
+
+
+class LegacyWriter:
+    """Writes each run straight to its .sol and .trace files."""
+
+    def __init__(self, output_dir: str = DEFAULT_OUTPUT_DIR):
+        self.output_dir = output_dir
+        os.makedirs(output_dir, exist_ok=True)
+
+    def add_run(self, instance: str, alg: str, cutoff, score, cover: Iterable[int],
+                trace: Optional[Iterable[Tuple[float, int]]] = None, seed=None,
+                lower_bound: Optional[int] = None, sources: Optional[Sequence[str]] = None, proven: bool = False):
+        base = os.path.join(self.output_dir, run_name(instance, alg, cutoff, seed))
+        with open(base + ".sol", "w") as f:
+            f.write(format_solution(score, cover))
+        if trace is not None:
+            with open(base + ".trace", "w") as f:
+                f.write(format_trace(*trace_columns(trace), lower_bound, proven))
+            if sources:
+                with open(base + ".source", "w") as f:
+                    f.write(format_sources(source_column(trace, sources)))
+
+    def close(self):
+        pass
+
+
+class ArchiveWriter:
+    """Collects runs in memory and writes them as one compressed columnar archive on close()."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.rows: List[str] = []
+        self.times = array("d")
+        self.scores = array("q")
+        self.sources: Optional[List[str]] = None     # Only kept once some run labels its points
+
+    def add_run(self, instance: str, alg: str, cutoff, score, cover: Iterable[int],
+                trace: Optional[Iterable[Tuple[float, int]]] = None, seed=None,
+                lower_bound: Optional[int] = None, sources: Optional[Sequence[str]] = None, proven: bool = False):
+        first, count = len(self.times), -1
+        if trace is not None:
+            times, scores = trace_columns(trace)
+            if sources and self.sources is None:
+                # First labelled run: earlier points get empty labels
+                self.sources = [""] * first
+            if self.sources is not None:
+                self.sources.extend(source_column(trace, sources) if sources else [""] * len(times))
+            self.times.extend(times)
+            self.scores.extend(scores)
+            count = len(times)
+        fields = (run_name(instance, alg, cutoff, seed), instance, alg, cutoff, "" if seed is None else seed,
+                  score, lower_bound or "", first, count, " ".join(str(i + 1) for i in cover), int(proven))
+        self.rows.append("\t".join(map(str, fields)))
+
+    def close(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        times, scores = self.times, self.scores
+        if sys.byteorder != "little":
+            times, scores = array("d", times), array("q", scores)
+            times.byteswap()
+            scores.byteswap()
+        with zipfile.ZipFile(self.path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr(RUNS_MEMBER, "\t".join(RUN_COLUMNS) + "\n" + "".join(row + "\n" for row in self.rows))
+            zf.writestr(TIME_MEMBER, times.tobytes())
+            zf.writestr(SCORE_MEMBER, scores.tobytes())
+            if self.sources is not None:
+                zf.writestr(SOURCE_MEMBER, "".join(label + "\n" for label in self.sources))
+
+
+def open_writer(archive: Optional[str] = None, output_dir: str = DEFAULT_OUTPUT_DIR):
+    """ArchiveWriter for the given archive path, or the legacy per-run files."""
+    return ArchiveWriter(archive) if archive else LegacyWriter(output_dir)
+
+
+def read_archive(path: str) -> List[Run]:
+    """Every run stored in an archive, with its trace as array columns."""
+    with zipfile.ZipFile(path, "r") as zf:
+        header, *rows = zf.read(RUNS_MEMBER).decode().splitlines()
+        times, scores = array("d"), array("q")
+        times.frombytes(zf.read(TIME_MEMBER))
+        scores.frombytes(zf.read(SCORE_MEMBER))
+        labels = zf.read(SOURCE_MEMBER).decode().split("\n")[:-1] if SOURCE_MEMBER in zf.namelist() else None
+    if sys.byteorder != "little":
+        times.byteswap()
+        scores.byteswap()
+
+    runs = []
+    columns = header.split("\t")
+    for row in rows:
+        # Read by column name, so archives written before a column was added still load
+        fields = dict(zip(columns, row.split("\t")))
+        seed, lower_bound = fields["seed"], fields["lower_bound"]
+        first, count = int(fields["first"]), int(fields["count"])
+        runs.append(Run(
+            fields["name"], fields["instance"], fields["alg"], fields["cutoff"], int(seed) if seed else None,
+            fields["score"], int(lower_bound) if lower_bound else None,
+            [int(i) - 1 for i in fields["cover"].split()],
+            times[first:first + count] if count >= 0 else None,
+            scores[first:first + count] if count >= 0 else None,
+            labels[first:first + count] if labels is not None and count >= 0 and any(labels[first:first + count])
+            else None,
+            fields.get("proven") == "1",
+        ))
+    return runs
+
+
+def export_legacy(path: str, output_dir: str = DEFAULT_OUTPUT_DIR) -> int:
+    """Write the .sol/.trace files of every run in an archive; returns the number of runs."""
+    os.makedirs(output_dir, exist_ok=True)
+    runs = read_archive(path)
+    for run in runs:
+        base = os.path.join(output_dir, run.name)
+        with open(base + ".sol", "w") as f:
+            f.write(format_solution(run.score, run.cover))
+        if run.times is not None:
+            with open(base + ".trace", "w") as f:
+                f.write(format_trace(run.times, run.scores, run.lower_bound, run.proven))
+            if run.sources is not None:
+                with open(base + ".source", "w") as f:
+                    f.write(format_sources(run.sources))
+    return len(runs)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python -m core.output <archive> [<output_dir>]")
+        sys.exit(1)
+    count = export_legacy(*sys.argv[1:])
+    print(f"Exported {count} runs")
@@ -0,0 +1,112 @@
+"""
+Cache-locality renumbering of an instance's elements and subsets (exec.py -reorder).
+
+The element ids and subset order of a .in file are arbitrary, so the elements of one subset are usually
+scattered over 1..n: every coverage-count update touches counters far apart, and the bitset of a subset is
+as long as the universe. Relabelling so that elements which occur together get nearby ids, and subsets
+sharing elements get nearby indices, makes those loops walk short stretches of memory and shortens the
+masks of most subsets. Two orderings of the element-subset bipartite graph are available:
+- rcm   reverse Cuthill-McKee: breadth-first from a lowest-degree element of each component, visiting
+        neighbours by increasing degree, the visit order reversed; keeps the incidence matrix banded,
+- freq  elements by decreasing frequency, so the busiest counters share cache lines, and subsets by their
+        lowest and then highest new element id.
+
+Both take O(nnz log d) time. Solvers run on Renumbering.instance, and covers are translated with
+to_original() before they are written, cached or compared with the files in data/.
+"""
+from array import array
+from collections import deque
+from typing import Iterable, List, Tuple
+
+from core.instance import Instance, build_element_index
+
+ORDERINGS = ("rcm", "freq")
+
+
+def rcm_order(n: int, subsets) -> Tuple[List[int], List[int]]:
+    """(elements, subset indices), each in reverse Cuthill-McKee order of the bipartite graph."""
+    elem_subsets = build_element_index(n, subsets)
+    freq = [len(owners) for owners in elem_subsets]
+    sizes = [len(s) for s in subsets]
+    seen_elem = bytearray(n + 1)
+    seen_set = bytearray(len(subsets))
+    elements, subset_order = [], []
+
+    # Components are started from their rarest element, the usual cheap stand-in for a peripheral node
+    for root in sorted(range(1, n + 1), key=freq.__getitem__):
+        if seen_elem[root]:
+            continue
+        seen_elem[root] = 1
+        queue = deque([(True, root)])
+        while queue:
+            is_elem, node = queue.popleft()
+            if is_elem:
+                elements.append(node)
+                fresh = [j for j in elem_subsets[node] if not seen_set[j]]
+                fresh.sort(key=sizes.__getitem__)
+                for j in fresh:
+                    seen_set[j] = 1
+                    queue.append((False, j))
+            else:
+                subset_order.append(node)
+                fresh = [e for e in subsets[node] if not seen_elem[e]]
+                fresh.sort(key=freq.__getitem__)
+                for e in fresh:
+                    seen_elem[e] = 1
+                    queue.append((True, e))
+
+    elements.reverse()
+    subset_order.reverse()
+    # Empty subsets are in no component
+    subset_order.extend(j for j in range(len(subsets)) if not seen_set[j])
+    return elements, subset_order
+
+
+def freq_order(n: int, subsets) -> Tuple[List[int], List[int]]:
+    """(elements, subset indices): elements by decreasing frequency, subsets by their span of new ids."""
+    freq = [0] * (n + 1)
+    for s in subsets:
+        for e in s:
+            freq[e] += 1
+    elements = sorted(range(1, n + 1), key=lambda e: -freq[e])
+    label = [0] * (n + 1)
+    for new, e in enumerate(elements, 1):
+        label[e] = new
+    span = [(min(label[e] for e in s), max(label[e] for e in s)) if s else (n + 1, n + 1) for s in subsets]
+    return elements, sorted(range(len(subsets)), key=span.__getitem__)
+
+
+class Renumbering:
+    """A relabelled copy of an instance together with the maps back to the original numbering."""
+
+    __slots__ = ("instance", "elements", "subsets", "_position")
+
+    def __init__(self, instance: Instance, ordering: str = "rcm"):
+        if ordering not in ORDERINGS:
+            raise ValueError(f"Unknown ordering {ordering}, expected one of {', '.join(ORDERINGS)}")
+        n, sets = instance.n, instance.sets()
+        elements, subset_order = (rcm_order if ordering == "rcm" else freq_order)(n, sets)
+
+        # elements[new] is the original id of element new (slot 0 unused), subsets[new] the original index
+        self.elements = array("i", [0] + elements)
+        self.subsets = array("i", subset_order)
+        self._position = array("i", [0]) * len(subset_order)
+        for new, j in enumerate(subset_order):
+            self._position[j] = new
+
+        label = array("i", [0]) * (n + 1)
+        for new, e in enumerate(elements, 1):
+            label[e] = new
+        self.instance = Instance.from_subsets(n, ([label[e] for e in sets[j]] for j in subset_order))
+
+    def to_original(self, cover: Iterable[int]) -> List[int]:
+        """Original 0-based indices of a cover of the renumbered instance, sorted."""
+        return sorted(self.subsets[j] for j in cover)
+
+    def from_original(self, cover: Iterable[int]) -> List[int]:
+        """Indices in the renumbered instance of a cover given in original 0-based indices."""
+        return [self._position[j] for j in cover]
+
+
+def renumber(instance: Instance, ordering: str = "rcm") -> Renumbering:
+    return Renumbering(instance, ordering)
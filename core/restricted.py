@@ -0,0 +1,123 @@
+"""
+Core-problem (restricted master) solving for instances with very many subsets.
+
+A small working set of columns is chosen, the best few per element by reduced cost under a vector
+of element multipliers, and any solver runs on that core. Excluded columns whose reduced cost is
+negative under multipliers derived from the core's cover are then priced in, and the core is
+re-solved until no column prices in or the cutoff is reached. A known cover (cached or from a warm
+start) seeds the core with its columns and is the upper bound the rounds have to beat.
+
+Solvers are passed as callables solver(n, subsets, cutoff_time, start_time, lower_bound=None) returning
+(best_score, best_solution, trace, proven), with solution indices relative to the subsets they were given
+(see core/solvers.py). A cover proven optimal for a core is only optimal for the instance once the core
+holds every column, but a bound of the instance is valid for every core, whose covers are covers of it.
+"""
+import time
+from typing import Callable, List, Optional, Sequence, Set, Tuple
+
+from core.instance import build_element_index
+
+DEFAULT_CORE_SIZE = 5       # Columns kept per element
+DEFAULT_MAX_ROUNDS = 5      # Solve/price rounds
+PRICE_LIMIT = 200           # Most columns priced into the core per round
+
+Solver = Callable[[int, Sequence[Set[int]], float, float], Tuple[int, List[int], List[Tuple[float, int]], bool]]
+
+
+def frequency_multipliers(n: int, elem_subsets: List[List[int]]) -> List[float]:
+    """Cheap multipliers u_e = 1 / (number of subsets containing e): rare elements weigh more."""
+    return [0.0] + [1.0 / len(elem_subsets[e]) if elem_subsets[e] else 0.0 for e in range(1, n + 1)]
+
+
+def cover_multipliers(n: int, subsets: Sequence[Set[int]], cover: List[int]) -> List[float]:
+    """Spread each chosen subset's unit cost over the elements only it covers."""
+    count = [0] * (n + 1)
+    for j in cover:
+        for e in subsets[j]:
+            count[e] += 1
+    u = [0.0] * (n + 1)
+    for j in cover:
+        unique = [e for e in subsets[j] if count[e] == 1]
+        for e in unique:
+            u[e] = 1.0 / len(unique)
+    return u
+
+
+def reduced_cost(subset: Set[int], u: List[float]) -> float:
+    """Lagrangian reduced cost of a unit-cost column: 1 - sum of its elements' multipliers."""
+    return 1.0 - sum(u[e] for e in subset)
+
+
+def select_core(n: int, subsets: Sequence[Set[int]], elem_subsets: List[List[int]],
+                k: int = DEFAULT_CORE_SIZE, multipliers: Optional[List[float]] = None) -> List[int]:
+    """Union over elements of their k lowest reduced cost columns (sorted column indices)."""
+    u = multipliers if multipliers is not None else frequency_multipliers(n, elem_subsets)
+    costs = [reduced_cost(s, u) for s in subsets]
+    core = set()
+    for e in range(1, n + 1):
+        core.update(sorted(elem_subsets[e], key=costs.__getitem__)[:k])
+    return sorted(core)
+
+
+def price_columns(n: int, subsets: Sequence[Set[int]], core: List[int], cover: List[int],
+                  limit: int = PRICE_LIMIT) -> List[int]:
+    """Excluded columns with negative reduced cost under the cover's multipliers, most negative first."""
+    u = cover_multipliers(n, subsets, cover)
+    in_core = set(core)
+    priced = []
+    for j, s in enumerate(subsets):
+        if j not in in_core:
+            rc = reduced_cost(s, u)
+            if rc < 0:
+                priced.append((rc, j))
+    priced.sort()
+    return [j for _, j in priced[:limit]]
+
+
+def solve_restricted(n: int, subsets: Sequence[Set[int]], solver: Solver, cutoff_time: float,
+                     start_time: float, k: int = DEFAULT_CORE_SIZE, max_rounds: int = DEFAULT_MAX_ROUNDS,
+                     multipliers: Optional[List[float]] = None, initial: Optional[List[int]] = None,
+                     lower_bound: Optional[int] = None):
+    """Solve on a core of columns, pricing in improving columns between rounds.
+
+    initial is a cover of the full instance to start from, lower_bound a bound of the full instance: the
+    rounds stop once a cover reaches it. Returns (best_score, best_solution, trace, proven) in the indices
+    of the full instance.
+    """
+    elem_subsets = build_element_index(n, subsets)
+    core = select_core(n, subsets, elem_subsets, k, multipliers)
+
+    best_score, best_solution, trace, proven = float("inf"), [], [], False
+    if initial:
+        # The core always contains the starting cover, so no round can end worse than it
+        core = sorted(set(core).union(initial))
+        best_score, best_solution = len(initial), sorted(initial)
+        trace.append((time.time() - start_time, best_score))
+    for round_idx in range(max_rounds):
+        elapsed = time.time() - start_time
+        if elapsed >= cutoff_time or (lower_bound is not None and best_score <= lower_bound):
+            break
+
+        # Remaining time shared evenly by the rounds still to come
+        round_cutoff = elapsed + (cutoff_time - elapsed) / (max_rounds - round_idx)
+        core_subsets = [subsets[j] for j in core]
+        score, solution, round_trace, round_proven = solver(n, core_subsets, round_cutoff, start_time, lower_bound)
+
+        # Keep only improvements over what earlier rounds already found
+        for t, q in round_trace:
+            if q < best_score:
+                trace.append((t, q))
+                best_score = q
+        if score <= best_score and solution:
+            best_score, best_solution = score, sorted(core[j] for j in solution)
+        if round_proven and len(core) == len(subsets):
+            # Optimal over every column: nothing left to price in
+            proven = True
+            break
+
+        new_columns = price_columns(n, subsets, core, best_solution)
+        if not new_columns:
+            break
+        core = sorted(set(core).union(new_columns))
+
+    return best_score, best_solution, trace, proven or (lower_bound is not None and best_score <= lower_bound)
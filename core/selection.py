@@ -0,0 +1,152 @@
+"""
+Automatic algorithm selection (exec.py -alg Auto) from instance features (core/features.py).
+
+The model is trained on the experiment sweeps in experiment_data/: for every instance they cover it keeps
+the feature vector and, per algorithm, the median final score and median runtime over the runs. Features
+are standardized with the training mean and spread. A new instance is matched to its k nearest training
+instances, and every algorithm is scored by its regret on them at the requested cutoff: its median score
+over the best score any algorithm reached within the cutoff, counting runs that needed longer than the
+cutoff as the worst score on that instance. The algorithm with the smallest distance-weighted regret is
+picked, the faster one on ties.
+
+The sweeps record solver-level results only, so the parameters that go with the choice follow from the
+features: components are solved separately when there are several, and BnB starts from the greedy cover.
+
+The trained model is a small JSON file written by selector.py; exec.py only reads it. Default paths are
+relative to the repository root, so both work from any directory.
+"""
+import csv
+import json
+import math
+import os
+import statistics
+from collections import defaultdict, namedtuple
+from typing import Dict, List, Optional, Tuple
+
+from core.features import MODEL_FEATURES, feature_vector, instance_features
+from core.loader import load_instance
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DATA_DIR = os.path.join(REPO_ROOT, "data")
+DEFAULT_RESULTS_DIR = os.path.join(REPO_ROOT, "experiment_data")
+DEFAULT_MODEL_PATH = os.path.join(DEFAULT_RESULTS_DIR, "selector.json")
+DEFAULT_NEIGHBOURS = 3
+_FORMAT = 1
+
+# alg is the chosen algorithm, params the exec.py options to run it with, neighbours the training
+# instances the choice was based on
+Selection = namedtuple("Selection", ["alg", "params", "neighbours"])
+
+
+def read_results(results_dir: str) -> Dict[str, Dict[str, List[Tuple[float, float]]]]:
+    """instance -> algorithm -> [(score, runtime)] from the <alg>_results.csv files of a sweep directory."""
+    results = defaultdict(lambda: defaultdict(list))
+    for name in sorted(os.listdir(results_dir)):
+        if not name.endswith("_results.csv"):
+            continue
+        alg = name[:-len("_results.csv")]
+        with open(os.path.join(results_dir, name), newline="") as f:
+            reader = csv.reader(f)
+            header = [h.strip().lower() for h in next(reader, [])]
+            # experiment_runner.py writes Score/Runtime, the BnB sweep cost/time
+            col = {key: header.index(key) for key in header}
+            score_col = col.get("score", col.get("cost"))
+            time_col = col.get("runtime", col.get("time"))
+            if "instance" not in col or score_col is None or time_col is None:
+                print(f"Skipping {name}: unrecognized columns {header}")
+                continue
+            for row in reader:
+                if not row:
+                    continue
+                instance = os.path.basename(row[col["instance"]].strip()).split('.')[0]
+                results[instance][alg].append((float(row[score_col]), float(row[time_col])))
+    return results
+
+
+def train_model(data_dir: str = DEFAULT_DATA_DIR, results_dir: str = DEFAULT_RESULTS_DIR) -> dict:
+    """Model from the sweeps in results_dir, on the instances of data_dir they cover."""
+    results = read_results(results_dir)
+    instances = {}
+    for name in sorted(results):
+        path = os.path.join(data_dir, name + ".in")
+        if not os.path.isfile(path):
+            continue
+        runs = results[name]
+        instances[name] = {
+            "features": feature_vector(instance_features(load_instance(path))),
+            "results": {alg: [statistics.median(s for s, _ in r), statistics.median(t for _, t in r)]
+                        for alg, r in sorted(runs.items())},
+        }
+    if not instances:
+        raise ValueError(f"No instance of {data_dir} appears in the results of {results_dir}")
+
+    # Standardize each feature; constant ones get a unit scale so they drop out of the distance
+    columns = list(zip(*(entry["features"] for entry in instances.values())))
+    mean = [statistics.fmean(c) for c in columns]
+    scale = [statistics.pstdev(c) or 1.0 for c in columns]
+    return {"format": _FORMAT, "features": list(MODEL_FEATURES), "mean": mean, "scale": scale,
+            "instances": instances}
+
+
+def save_model(model: dict, path: str):
+    with open(path, "w") as f:
+        json.dump(model, f, indent=1)
+        f.write("\n")
+
+
+def load_model(path: str = DEFAULT_MODEL_PATH) -> dict:
+    """Read a model trained by selector.py."""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No selection model at {path}, train one with selector.py")
+    with open(path, "r") as f:
+        model = json.load(f)
+    if model.get("format") != _FORMAT or model.get("features") != list(MODEL_FEATURES):
+        raise ValueError(f"{path} was trained on other features, retrain it with selector.py")
+    return model
+
+
+def _regrets(results: Dict[str, List[float]], cutoff: float) -> Dict[str, float]:
+    """Per algorithm, its score on one training instance relative to the best one reached within cutoff."""
+    within = [score for score, runtime in results.values() if runtime <= cutoff]
+    worst = max(score for score, _ in results.values())
+    best = min(within) if within else min(score for score, _ in results.values())
+    return {alg: (score if runtime <= cutoff or not within else worst) / max(best, 1)
+            for alg, (score, runtime) in results.items()}
+
+
+def select_algorithm(features: Dict[str, float], cutoff: float, model: dict,
+                     k: int = DEFAULT_NEIGHBOURS) -> Selection:
+    """Algorithm and exec.py options for an instance with these features, run with this cutoff."""
+    x = [(v - mu) / sd for v, mu, sd in zip(feature_vector(features), model["mean"], model["scale"])]
+    distances = []
+    for name, entry in model["instances"].items():
+        y = [(v - mu) / sd for v, mu, sd in zip(entry["features"], model["mean"], model["scale"])]
+        distances.append((math.dist(x, y), name))
+    neighbours = sorted(distances)[:k]
+
+    regret, runtime, weight = defaultdict(float), defaultdict(float), defaultdict(float)
+    for d, name in neighbours:
+        results = model["instances"][name]["results"]
+        w = 1.0 / (d + 1e-6)
+        for alg, r in _regrets(results, cutoff).items():
+            regret[alg] += w * r
+            runtime[alg] += w * results[alg][1]
+            weight[alg] += w
+    # Only algorithms every neighbour has results for are compared
+    total = sum(1.0 / (d + 1e-6) for d, _ in neighbours)
+    candidates = [alg for alg in regret if math.isclose(weight[alg], total)] or list(regret)
+    alg = min(candidates, key=lambda a: (round(regret[a] / weight[a], 9), runtime[a] / weight[a]))
+
+    params = {}
+    if features["components"] > 1 and alg != "Approx":
+        params["decompose"] = True
+    if alg == "BnB":
+        params["warm"] = "Approx"
+    return Selection(alg, params, [name for _, name in neighbours])
+
+
+def select_for_instance(path: str, cutoff: float, model: Optional[dict] = None) -> Selection:
+    """select_algorithm for the instance file at path, with the default model unless one is given."""
+    if model is None:
+        model = load_model()
+    return select_algorithm(instance_features(load_instance(path)), cutoff, model)
@@ -0,0 +1,95 @@
+"""
+Publishing an Instance once so that many worker processes can read it without copies.
+
+The block layout is a small int64 header (magic, n, m, nnz), then indptr as int64[m + 1]
+and indices as int32[nnz]. The same layout is used for POSIX shared memory and for plain
+files that workers mmap, so attach() and attach_file() both hand back an Instance whose
+buffers are memoryviews straight into the block.
+
+Typical use from a process pool:
+
+    shm = publish(instance)
+    with Pool(32, initializer=worker_init, initargs=(shm.name,)) as pool:
+        ...
+    shm.close()
+    shm.unlink()
+
+where worker_init calls attach(name) once and keeps the returned Instance. Workers whose solvers only
+iterate over subsets read them through instance.views(); indexing the instance or calling sets() builds
+frozensets, a private copy in every worker.
+"""
+import mmap
+from array import array
+from multiprocessing import shared_memory
+
+from core.instance import Instance
+
+MAGIC = 0x53435352  # "SCSR"
+HEADER_SIZE = 4 * 8
+
+
+def _block_size(instance: Instance) -> int:
+    return HEADER_SIZE + 8 * (instance.m + 1) + 4 * instance.nnz
+
+
+def _write_block(buf, instance: Instance):
+    """Serialize the instance into a writable buffer of _block_size bytes."""
+    mv = memoryview(buf)
+    mv[:HEADER_SIZE] = array("q", [MAGIC, instance.n, instance.m, instance.nnz]).tobytes()
+    start = HEADER_SIZE
+    end = start + 8 * (instance.m + 1)
+    mv[start:end] = array("q", instance.indptr).tobytes()
+    mv[end:end + 4 * instance.nnz] = array("i", instance.indices).tobytes()
+    mv.release()
+
+
+def _view_block(buf, owner) -> Instance:
+    """Wrap a serialized block in an Instance without copying the CSR buffers."""
+    mv = memoryview(buf)
+    magic, n, m, nnz = mv[:HEADER_SIZE].cast("q")
+    if magic != MAGIC:
+        raise ValueError("Buffer does not hold a published instance.")
+    start = HEADER_SIZE
+    end = start + 8 * (m + 1)
+    indptr = mv[start:end].cast("q")
+    indices = mv[end:end + 4 * nnz].cast("i")
+    return Instance(n, indptr, indices, owner=owner)
+
+
+def publish(instance: Instance, name: str = None) -> shared_memory.SharedMemory:
+    """Copy the instance into a new shared memory block.
+
+    The caller owns the block and must close() and unlink() it once workers are done.
+    """
+    shm = shared_memory.SharedMemory(name=name, create=True, size=_block_size(instance))
+    _write_block(shm.buf, instance)
+    return shm
+
+
+def attach(name: str) -> Instance:
+    """Zero-copy, read-only Instance over a block created by publish()."""
+    shm = shared_memory.SharedMemory(name=name)
+    return _view_block(shm.buf, owner=shm)
+
+
+def detach(instance: Instance):
+    """Release an attached instance's views and close its block (frozensets already built stay valid)."""
+    instance.indptr.release()
+    instance.indices.release()
+    if instance._owner is not None:
+        instance._owner.close()
+
+
+def publish_file(instance: Instance, path: str):
+    """Write the instance to a file that workers can mmap with attach_file()."""
+    with open(path, "w+b") as f:
+        f.truncate(_block_size(instance))
+        with mmap.mmap(f.fileno(), 0) as mm:
+            _write_block(mm, instance)
+
+
+def attach_file(path: str) -> Instance:
+    """Zero-copy, read-only Instance over a file written by publish_file()."""
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return _view_block(mm, owner=mm)
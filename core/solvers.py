@@ -0,0 +1,52 @@
+"""
+The solvers in the common form solver(n, subsets, cutoff_time, start_time, lower_bound=None) -> (best_score,
+best_set, trace, proven), used wherever a mode runs some algorithm on a derived instance (core problems,
+components). A solver stops once its cover reaches lower_bound, a valid bound for the instance it was given.
+proven tells whether best_set is known to be optimal for that instance: BnB proves it by exhausting its tree,
+every algorithm by reaching lower_bound.
+
+AlgorithmSolver is a plain class rather than a closure so it can be sent to worker processes.
+"""
+import time
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from approx.grasp import Grasp
+from bnb.bnb import branch_and_bound
+from LS1.sa_core import SimulatedAnnealing
+from LS2.hillclimbing import LS2
+from lns.lns import IteratedGreedy
+
+SOLVER_ALGORITHMS = ("BnB", "GRASP", "LS1", "LS2", "LNS")
+
+
+class AlgorithmSolver:
+    """One algorithm with its seed and options, callable as a solver."""
+
+    def __init__(self, alg: str, seed: int = 42, tabu: bool = False, config: Optional[Dict[str, Any]] = None):
+        if alg not in SOLVER_ALGORITHMS:
+            raise ValueError(f"Algorithm {alg} has no solver form.")
+        self.alg = alg
+        self.seed = seed
+        self.tabu = tabu
+        self.config = config
+
+    def __call__(self, n: int, subsets: Sequence[Set[int]], cutoff_time: float, start_time: float,
+                 lower_bound: Optional[int] = None) -> Tuple[int, List[int], List[Tuple[float, int]], bool]:
+        if self.alg == "BnB":
+            return branch_and_bound(n, subsets, cutoff_time, start_time, lower_bound=lower_bound)
+        if self.alg == "LS1":
+            sa = SimulatedAnnealing.from_config(n, subsets, self.config or {}, seed=self.seed, use_tabu=self.tabu)
+            best_score, best_set, trace = sa.solve(cutoff_time, start_time, lower_bound=lower_bound)
+        elif self.alg == "LS2":
+            # LS2 times itself from its own start, shift its trace onto the shared clock
+            offset = time.time() - start_time
+            best_score, best_set, trace = LS2(n, subsets, cutoff_time - offset, self.seed, use_tabu=self.tabu,
+                                              lower_bound=lower_bound)
+            trace = [(t + offset, q) for t, q in trace]
+        elif self.alg == "GRASP":
+            best_score, best_set, trace = Grasp(n, subsets, seed=self.seed).solve(cutoff_time, start_time,
+                                                                                  lower_bound=lower_bound)
+        else:
+            best_score, best_set, trace = IteratedGreedy(n, subsets, seed=self.seed).solve(cutoff_time, start_time,
+                                                                                           lower_bound=lower_bound)
+        return best_score, best_set, trace, lower_bound is not None and best_score <= lower_bound
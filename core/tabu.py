@@ -0,0 +1,59 @@
+"""
+Anti-cycling memory shared by the local searches (LS1 and LS2).
+
+Combines three standard rules, each backed by a flat array indexed by subset:
+- tabu tenure: a subset that just flipped may not flip again for `tenure` iterations,
+- configuration checking: a subset may only be (re)added once some subset sharing an
+  element with it has flipped since its own last flip,
+- age: among otherwise equal candidates, prefer the one that has been unmoved longest.
+"""
+from array import array
+from typing import Iterable, List, Optional, Sequence, Set
+
+DEFAULT_TENURE = 10
+
+
+class TabuList:
+    """Per-subset tabu tenure, configuration-change flags and last-move ages."""
+
+    __slots__ = ("subsets", "elem_subsets", "tenure", "tabu_until", "conf_changed", "last_moved")
+
+    def __init__(self, subsets: Sequence[Set[int]], elem_subsets: List[List[int]],
+                 tenure: int = DEFAULT_TENURE):
+        m = len(subsets)
+        self.subsets = subsets
+        self.elem_subsets = elem_subsets
+        self.tenure = tenure
+        self.tabu_until = array("q", [0]) * m
+        self.conf_changed = bytearray(b"\x01") * m
+        self.last_moved = array("q", [-1]) * m
+
+    def can_remove(self, i: int, iter_count: int) -> bool:
+        return self.tabu_until[i] <= iter_count
+
+    def can_add(self, i: int, iter_count: int) -> bool:
+        return self.tabu_until[i] <= iter_count and self.conf_changed[i] == 1
+
+    def record(self, i: int, iter_count: int):
+        """Register that subset i was flipped at iteration iter_count."""
+        self.tabu_until[i] = iter_count + self.tenure
+        self.last_moved[i] = iter_count
+        # Every subset sharing an element with i now sees a changed configuration
+        conf = self.conf_changed
+        for e in self.subsets[i]:
+            for j in self.elem_subsets[e]:
+                conf[j] = 1
+        conf[i] = 0
+
+    def age_key(self, i: int) -> int:
+        """Sort key putting the longest-unmoved subsets first."""
+        return self.last_moved[i]
+
+    def oldest(self, candidates: Iterable[int]) -> Optional[int]:
+        """Candidate that has gone the longest without flipping, or None if there is none."""
+        best, best_age = None, None
+        last_moved = self.last_moved
+        for i in candidates:
+            if best is None or last_moved[i] < best_age:
+                best, best_age = i, last_moved[i]
+        return best
@@ -7,49 +7,193 @@ import argparse
 import os
 import time
 import sys
-from bnb.utils import read_instance, write_solution, write_trace
-from bnb.bnb import branch_and_bound
-from approx.approx import perform_approx
+from core.output import DEFAULT_OUTPUT_DIR, LegacyWriter, open_writer, run_name
+from core.loader import load_instance
+from bnb.bnb import branch_and_bound, warm_start
+from approx.approx import set_cover
+from approx.grasp import Grasp
 from LS2.hillclimbing import LS2
 from LS1.sa_core import SimulatedAnnealing
+from LS1.config import load_config
+from LS1.tempering import ParallelTempering
+from lns.lns import IteratedGreedy
+from core.restricted import solve_restricted
+from core.decompose import solve_components
+from core.hybrid import solve_hybrid
+from core.solvers import AlgorithmSolver, SOLVER_ALGORITHMS
+from core.lagrangian import subgradient, optimality_gap
+from core.bounds import instance_bound
+from core.cache import DEFAULT_PATH as DEFAULT_CACHE_PATH, SolutionCache, instance_key
+from core.checkpoint import DEFAULT_INTERVAL as DEFAULT_CHECKPOINT_INTERVAL, Checkpoint
+from core.features import instance_features
+from core.selection import DEFAULT_MODEL_PATH, load_model, select_algorithm
+from core.reorder import ORDERINGS, renumber
+
+# Share of the cutoff spent optimizing Lagrangian multipliers when -lagrangian is set
+LAGRANGIAN_FRACTION = 0.1
 
 
 """
 Perform the specified algorithm once on that particular instance
 """
-def run_single_instance(inst_path, alg, time_limit, seed):
+def run_single_instance(inst_path, alg, time_limit, seed, warm=None, tabu=False, core=0, lagrangian=False,
+                        cache=None, writer=None, config=None, decompose=False, workers=None, replicas=0,
+                        checkpoint_interval=None, resume=False, model=None, reorder=None):
     instance_name = os.path.basename(inst_path).split('.')[0]
-    n, subsets = read_instance(inst_path)
+    instance = load_instance(inst_path)
+    n, subsets = instance.n, instance.sets()
+
+    # Auto picks the algorithm and its options from the instance features (core/selection.py)
+    if alg == "Auto":
+        selection = select_algorithm(instance_features(instance), time_limit, model or load_model())
+        alg = selection.alg
+        decompose = decompose or selection.params.get("decompose", False)
+        warm = warm or selection.params.get("warm")
+        options = "".join(f", {k}={v}" for k, v in selection.params.items())
+        print(f"Auto selected {alg}{options} (closest to {', '.join(selection.neighbours)})")
 
-    os.makedirs("output", exist_ok=True)
+    # Optionally solve a copy relabelled for memory locality (core/reorder.py); covers are mapped back
+    # to the original indices before they are written or cached
+    renumbering = renumber(instance, reorder) if reorder else None
+    if renumbering is not None:
+        n, subsets = renumbering.instance.n, renumbering.instance.sets()
+
+    # Legacy .sol/.trace files unless the caller bundles runs into an archive
+    if writer is None:
+        writer = LegacyWriter()
     start_time = time.time()
 
-    if alg == "BnB":
-        best_score, best_set, trace = branch_and_bound(n, subsets, time_limit, start_time)
-        write_solution(instance_name, alg, time_limit, best_score, best_set)
-        write_trace(instance_name, alg, time_limit, trace)
+    # A proven optimal cached cover answers right away, any other cached cover is a warm start
+    cached, initial = None, None
+    if cache is not None:
+        key = instance_key(instance)
+        cached = cache.lookup(key)
+        if cached is not None and cached.optimal:
+            print(f"Cache hit: proven optimal cover of size {cached.size} found by {cached.algorithm}")
+            run_seed = None if alg in ("BnB", "Approx") else seed
+            writer.add_run(instance_name, alg, time_limit, cached.size, cached.cover,
+                           [(time.time() - start_time, cached.size)], run_seed, proven=True)
+            return
+        if cached is not None:
+            initial = cached.cover if renumbering is None else renumbering.from_original(cached.cover)
+
+    # Lagrangian lower bound and multipliers guide the solvers and give the trace an optimality gap
+    lag, multipliers, lower_bound = None, None, None
+    if lagrangian:
+        lag = subgradient(n, subsets, time_limit=time_limit * LAGRANGIAN_FRACTION)
+        multipliers, lower_bound = lag.multipliers, lag.lower_bound
+        print(f"Lagrangian lower bound {lower_bound}, cover of size {len(lag.cover)}")
+
+    # Periodic checkpoints of single BnB and LS1 searches, optionally resuming from the last one
+    checkpoint = None
+    if checkpoint_interval is not None or resume:
+        plain = not decompose and core <= 0 and not (alg == "LS1" and replicas > 0)
+        if alg in ("BnB", "LS1") and plain:
+            run_seed = None if alg == "BnB" else seed
+            path = os.path.join(DEFAULT_OUTPUT_DIR, run_name(instance_name, alg, time_limit, run_seed) + ".ckpt")
+            solved = instance if renumbering is None else renumbering.instance
+            checkpoint = Checkpoint(path, instance_key(solved), alg, run_seed,
+                                    checkpoint_interval or DEFAULT_CHECKPOINT_INTERVAL)
+            if resume and checkpoint.load() is not None:
+                print(f"Resuming from {path}")
+        else:
+            print("Checkpoints are only kept for plain BnB and LS1 runs")
+
+    # Cheap lower bound (core/bounds.py), tightened by the Lagrangian one: solvers stop once they reach it
+    target = max(instance_bound(instance).value, lower_bound or 0)
+
+    best_score, trace, sources, proven = None, None, None, False
+    run_seed = None if alg in ("BnB", "Approx") else seed
+    if decompose and alg in SOLVER_ALGORITHMS:
+        # Solve every connected component on its own and stitch the covers
+        best_score, best_set, trace, proven = solve_components(n, subsets, AlgorithmSolver(alg, seed, tabu, config),
+                                                               time_limit, start_time, workers, lower_bound=target)
+    elif core > 0 and alg in SOLVER_ALGORITHMS:
+        # Solve on the k best columns per element, pricing in excluded columns between rounds; the cached
+        # or warm-start cover joins the core as the starting upper bound
+        start_cover = initial
+        if alg == "BnB" and warm is not None:
+            warm_score, warm_set = warm_start(n, subsets, warm, time_limit, start_time, seed)
+            if start_cover is None or warm_score < len(start_cover):
+                start_cover = warm_set
+        best_score, best_set, trace, proven = solve_restricted(n, subsets, AlgorithmSolver(alg, seed, tabu, config),
+                                                               time_limit, start_time, k=core,
+                                                               multipliers=multipliers, initial=start_cover,
+                                                               lower_bound=target)
+    elif alg == "BnB":
+        # Optionally seed the upper bound with a heuristic cover before searching the tree
+        init_score, init_set = float("inf"), []
+        if warm is not None and (checkpoint is None or checkpoint.resumed is None):
+            init_score, init_set = warm_start(n, subsets, warm, time_limit, start_time, seed)
+        if lag is not None and len(lag.cover) < init_score:
+            init_score, init_set = len(lag.cover), lag.cover
+        if cached is not None and cached.size < init_score:
+            init_score, init_set = cached.size, initial
+        best_score, best_set, trace, proven = branch_and_bound(n, subsets, time_limit, start_time, init_score,
+                                                               init_set, multipliers, checkpoint, lower_bound=target)
     elif alg == "Approx":
-        perform_approx(inst_path, time_limit, seed)
+        # Greedy approximation; like before it writes a .sol but no trace
+        best_set = [i - 1 for i in sorted(set_cover(n, subsets))]
+        best_score = len(best_set)
+    elif alg == "GRASP":
+        # Randomized greedy constructions over the whole cutoff
+        grasp = Grasp(n, subsets, seed=seed)
+        best_score, best_set, trace = grasp.solve(time_limit, start_time, lower_bound=target)
+        print(f"GRASP built {grasp.constructions} covers in {time.time() - start_time:.2f} seconds, best {best_score}")
     elif alg == "LS1":
-        # Run Simulated Annealing algorithm
-        sa = SimulatedAnnealing(n, subsets, seed=seed)
-        best_score, best_set, trace = sa.solve(time_limit, start_time)
+        if replicas > 0:
+            # Replica exchange: fixed-temperature chains in separate processes swapping configurations
+            pt = ParallelTempering.from_config(n, subsets, config or {}, replicas=replicas, seed=seed,
+                                               multipliers=multipliers, use_tabu=tabu)
+            best_score, best_set, trace = pt.solve(time_limit, start_time, initial, lower_bound=target)
+        else:
+            # Run Simulated Annealing algorithm, with tuned parameters if a configuration was given
+            sa = SimulatedAnnealing.from_config(n, subsets, config or {}, seed=seed, use_tabu=tabu,
+                                                multipliers=multipliers)
+            best_score, best_set, trace = sa.solve(time_limit, start_time, initial, checkpoint, lower_bound=target)
         
         # Print runtime information
         end_time = time.time()
         runtime = end_time - start_time
         print(f"LS1 completed in {runtime:.2f} seconds with score {best_score}")
-        
-        # Write solution and trace files
-        write_solution(instance_name, alg, time_limit, best_score, best_set, seed)
-        write_trace(instance_name, alg, time_limit, trace, seed)
     elif alg == "LS2":
-        best_score, best_set, trace = LS2(n, subsets, time_limit, start_time)
-        write_solution(instance_name, alg, time_limit, best_score, best_set, seed)
-        write_trace(instance_name, alg, time_limit, trace, seed)
+        best_score, best_set, trace = LS2(n, subsets, time_limit, seed, use_tabu=tabu,
+                                          initial_solution=initial, lower_bound=target)
+    elif alg == "Hybrid":
+        # Greedy, LS1, LS2 and BnB together, sharing the best cover; the trace names who found each point
+        best_score, best_set, trace, sources, proven = solve_hybrid(n, subsets, time_limit, start_time, seed,
+                                                                    lower_bound=target)
+        status = "proven optimal" if proven else "best found"
+        print(f"Hybrid completed in {time.time() - start_time:.2f} seconds with score {best_score} ({status})")
+    elif alg == "LNS":
+        # Iterated greedy destroy-and-repair search
+        lns = IteratedGreedy(n, subsets, seed=seed, multipliers=multipliers)
+        best_score, best_set, trace = lns.solve(time_limit, start_time, initial, lower_bound=target)
     else:
         print(f"Algorithm {alg} not implemented.")
 
+    # A real cover is proven optimal when it meets the lower bound; the trace records it
+    is_cover = best_score is not None and bool(best_set) and len(set().union(*(subsets[i] for i in best_set))) == n
+    proven = proven or (is_cover and len(best_set) <= target)
+    if renumbering is not None and best_score is not None:
+        best_set = renumbering.to_original(best_set)
+    if best_score is not None:
+        writer.add_run(instance_name, alg, time_limit, best_score, best_set, trace, run_seed, lower_bound, sources,
+                       proven)
+
+    # The run finished, so its checkpoint is no longer needed
+    if checkpoint is not None:
+        checkpoint.clear()
+
+    if proven and alg != "Hybrid":
+        print(f"Cover of size {best_score} is proven optimal")
+    if lower_bound and best_score is not None:
+        print(f"Optimality gap: {optimality_gap(best_score, lower_bound) * 100:.2f}%")
+
+    # Remember real covers, marking the proven ones
+    if cache is not None and is_cover:
+        cache.store(key, instance, best_set, proven, alg, time.time() - start_time)
+
 """
 Determine user input from terminal, parse it, and then run a loop through each .in file in the directory specified in -inst argument,
 performing the specified algorithm from -alg on it using the run_single_instance() function
@@ -59,11 +203,33 @@ def main():
     
     parser = argparse.ArgumentParser()
     parser.add_argument("-inst", type=str, required=True)
-    parser.add_argument("-alg", type=str, required=True, choices=["BnB", "Approx", "LS1", "LS2"])
+    parser.add_argument("-alg", type=str, required=True, choices=["BnB", "Approx", "GRASP", "LS1", "LS2", "LNS", "Hybrid", "Auto"])
     parser.add_argument("-time", type=int, required=True)
     parser.add_argument("-seed", type=int, default=42)
+    parser.add_argument("-warm", type=str, default=None, choices=["Approx", "LS1", "LS2"])
+    parser.add_argument("-tabu", action="store_true")
+    parser.add_argument("-core", type=int, default=0)
+    parser.add_argument("-lagrangian", action="store_true")
+    parser.add_argument("-cache", nargs='?', const=DEFAULT_CACHE_PATH, default=None)
+    parser.add_argument("-archive", type=str, default=None)
+    parser.add_argument("-config", type=str, default=None)
+    parser.add_argument("-decompose", action="store_true")
+    parser.add_argument("-j", type=int, default=None)
+    parser.add_argument("-replicas", type=int, default=0)
+    parser.add_argument("-checkpoint", type=float, nargs='?', const=DEFAULT_CHECKPOINT_INTERVAL, default=None)
+    parser.add_argument("-resume", action="store_true")
+    parser.add_argument("-model", type=str, default=DEFAULT_MODEL_PATH)
+    parser.add_argument("-reorder", type=str, nargs='?', const="rcm", default=None, choices=ORDERINGS)
     args = parser.parse_args()
 
+    # Tuned simulated annealing parameters (see tune.py)
+    config = load_config(args.config) if args.config else None
+    # Algorithm selection model for -alg Auto (see selector.py)
+    model = load_model(args.model) if args.alg == "Auto" else None
+
+    cache = SolutionCache(args.cache) if args.cache else None
+    writer = open_writer(args.archive)
+
     inst_path = args.inst
     if os.path.isdir(inst_path):
         for in_file in sorted(os.listdir(inst_path)):
@@ -71,11 +237,12 @@ def main():
                 continue
 
             print(f"Running {args.alg} on: {in_file} with {args.time}s cutoff")
-            run_single_instance(os.path.join(inst_path, in_file), args.alg, args.time, args.seed)
+            run_single_instance(os.path.join(inst_path, in_file), args.alg, args.time, args.seed, args.warm, args.tabu, args.core, args.lagrangian, cache, writer, config, args.decompose, args.j, args.replicas, args.checkpoint, args.resume, model, args.reorder)
     elif os.path.isfile(inst_path):
-        run_single_instance(inst_path, args.alg, args.time, args.seed)
+        run_single_instance(inst_path, args.alg, args.time, args.seed, args.warm, args.tabu, args.core, args.lagrangian, cache, writer, config, args.decompose, args.j, args.replicas, args.checkpoint, args.resume, model, args.reorder)
     else:
         print(f"{inst_path} not valid")
+    writer.close()
 
 if __name__ == "__main__":
     main()
@@ -5,70 +5,84 @@ import time
 import random
 from bnb.bnb import branch_and_bound
 from bnb.utils import read_instance
-from approx.approx import perform_approx
+from approx.approx import set_cover
 from LS2.hillclimbing import LS2
 from LS1.sa_core import SimulatedAnnealing
+from lns.lns import IteratedGreedy
+from core.output import open_writer
 
 # Ensure the 'experiment_data' directory exists
 output_dir = 'experiment_data'
 os.makedirs(output_dir, exist_ok=True)
 
-# Function to write results to CSV
-def write_to_csv(file_path, instance, run, score, runtime):
-    # Check if file exists, if not, write the header
+# Open the results CSV once per sweep, writing the header if the file is new
+def open_csv(file_path):
     file_exists = os.path.isfile(file_path)
-    with open(file_path, mode='a', newline='') as file:
-        writer = csv.writer(file)
-        if not file_exists:
-            writer.writerow(['Instance', 'Run', 'Score', 'Runtime'])  # Writing header
-        writer.writerow([instance, run, score, runtime])  # Writing result
+    file = open(file_path, mode='a', newline='')
+    writer = csv.writer(file)
+    if not file_exists:
+        writer.writerow(['Instance', 'Run', 'Score', 'Runtime'])  # Writing header
+    return file, writer
 
 # Define the algorithm functions
 def run_algorithm(alg, instance_path, time_limit, runs, seed):
-    instance_name = os.path.basename(instance_path).split('.')[0]
     n, subsets = read_instance(instance_path)
 
     start_time = time.time()
 
     if alg == "BnB":
         # Run Branch and Bound
-        best_score, best_set, trace = branch_and_bound(n, subsets, time_limit, start_time)
-        return best_score, trace, start_time
+        best_score, best_set, trace, _ = branch_and_bound(n, subsets, time_limit, start_time)
+        return best_score, best_set, trace, start_time
 
     elif alg == "Approx":
+        # Greedy approximation on the already loaded instance (no trace)
         start_time = time.time()
-        perform_approx(instance_path, time_limit, seed)
-        # Try to read score from output file
-        output_path = f"output/{instance_name}_Approx_{time_limit}.sol"
-        try:
-            with open(output_path, 'r') as f:
-                score_line = f.readline().strip()
-                score = int(score_line)
-        except Exception:
-            score = ""
-        return score, [], start_time
+        best_set = [i - 1 for i in sorted(set_cover(n, subsets))]
+        return len(best_set), best_set, None, start_time
 
     elif alg == "LS1":
         # Run Simulated Annealing (LS1)
         sa = SimulatedAnnealing(n, subsets, seed=seed)
         best_score, best_set, trace = sa.solve(time_limit, start_time)
-        return best_score, trace, start_time
+        return best_score, best_set, trace, start_time
 
     elif alg == "LS2":
         # Run Hill Climbing (LS2)
-        best_score, best_set, trace = LS2(n, subsets, time_limit, start_time)
-        return best_score, trace, start_time
+        best_score, best_set, trace = LS2(n, subsets, time_limit, seed)
+        return best_score, best_set, trace, start_time
+    elif alg == "LNS":
+        # Run Iterated Greedy (LNS)
+        best_score, best_set, trace = IteratedGreedy(n, subsets, seed=seed).solve(time_limit, start_time)
+        return best_score, best_set, trace, start_time
     else:
         raise ValueError(f"Algorithm {alg} not recognized.")
 
+# Run one instance the requested number of times, recording every run
+def run_instance(args, instance_path, csv_writer, archive):
+    instance_name = os.path.basename(instance_path).split('.')[0]
+    for run in range(1, args.runs + 1):
+        print(f"Running {args.alg} on {instance_path} (Run {run}/{args.runs})")
+        best_score, best_set, trace, start_time = run_algorithm(args.alg, instance_path, args.time, args.runs, args.seed)
+        end_time = time.time()
+        runtime = end_time - start_time
+        print(f"Run {run}: Best Score = {best_score}, Runtime = {runtime:.2f}s")
+
+        # Write results to CSV, and the run itself to the archive if one is being built
+        csv_writer.writerow([instance_path, run, best_score, runtime])
+        if archive is not None:
+            run_seed = None if args.alg in ("BnB", "Approx") else args.seed
+            archive.add_run(instance_name, args.alg, args.time, best_score, best_set, trace, run_seed)
+
 # Main function to handle input and execution
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("-inst", type=str, required=True, help="Path to instance file or directory")
-    parser.add_argument("-alg", type=str, required=True, choices=["BnB", "Approx", "LS1", "LS2"], help="Algorithm to run")
+    parser.add_argument("-alg", type=str, required=True, choices=["BnB", "Approx", "LS1", "LS2", "LNS"], help="Algorithm to run")
     parser.add_argument("-time", type=int, required=True, help="Time cutoff in seconds")
     parser.add_argument("-runs", type=int, required=True, help="Number of times to run the algorithm")
     parser.add_argument("-seed", type=int, default=None, help="Random seed for reproducibility")
+    parser.add_argument("-archive", type=str, default=None, help="Bundle every run's solution and trace into this archive")
 
     args = parser.parse_args()
 
@@ -80,41 +94,27 @@ def main():
     # Determine the output CSV file based on the chosen algorithm
     csv_path = os.path.join(output_dir, f'{args.alg}_results.csv')
     print(f"Writing results to: {csv_path}")
+    csv_file, csv_writer = open_csv(csv_path)
+    archive = open_writer(args.archive) if args.archive else None
 
     # Run the algorithm multiple times
     if os.path.isdir(args.inst):
         for in_file in sorted(os.listdir(args.inst)):
             if not in_file.endswith(".in"):
                 continue
-            instance_path = os.path.join(args.inst, in_file)
-
-            # Repeat the algorithm the specified number of times
-            for run in range(1, args.runs + 1):
-                print(f"Running {args.alg} on {instance_path} (Run {run}/{args.runs})")
-                best_score, trace, start_time = run_algorithm(args.alg, instance_path, args.time, args.runs, args.seed)
-                end_time = time.time()
-                runtime = end_time - start_time
-                print(f"Run {run}: Best Score = {best_score}, Runtime = {runtime:.2f}s")
-
-                # Write results to CSV
-                write_to_csv(csv_path, instance_path, run, best_score, runtime)
+            run_instance(args, os.path.join(args.inst, in_file), csv_writer, archive)
+            csv_file.flush()
 
     elif os.path.isfile(args.inst):
         # If instance is a single file, run it as well
-        instance_path = args.inst
-        for run in range(1, args.runs + 1):
-            print(f"Running {args.alg} on {instance_path} (Run {run}/{args.runs})")
-            best_score, trace, start_time = run_algorithm(args.alg, instance_path, args.time, args.runs, args.seed)
-            end_time = time.time()
-            runtime = end_time - start_time
-            print(f"Run {run}: Best Score = {best_score}, Runtime = {runtime:.2f}s")
-
-            # Write results to CSV
-            write_to_csv(csv_path, instance_path, run, best_score, runtime)
+        run_instance(args, args.inst, csv_writer, archive)
 
     else:
         print(f"{args.inst} is not a valid file or directory.")
 
+    csv_file.close()
+    if archive is not None:
+        archive.close()
+
 if __name__ == "__main__":
     main()
-    
@@ -0,0 +1,167 @@
+"""
+Iterated greedy (destroy-and-repair large neighborhood search) for the Minimum Set Cover problem.
+
+Each iteration removes a fraction of the current cover with one of three destroy operators, re-covers
+the freed elements with the Approx greedy (randomized tie-breaking), drops sets made redundant, and
+accepts the result under a threshold of whole sets that shrinks to zero over the cutoff. Operators are
+chosen by roulette wheel with weights adapted from how often they lead to accepted or improving covers.
+"""
+import math
+import random
+import time
+from typing import List, Optional, Set, Tuple
+
+from approx.approx import greedy_cover
+from core.instance import build_element_index
+from core.lagrangian import reduced_costs
+from LS1.solution import Solution
+
+DESTROY_OPERATORS = ("random", "region", "weakest")
+
+# Operator scores (new best / improved current / accepted / rejected) and weight reaction rate
+SCORE_BEST, SCORE_BETTER, SCORE_ACCEPTED, SCORE_REJECTED = 3.0, 2.0, 1.0, 0.0
+REACTION = 0.1
+MIN_WEIGHT = 0.1
+
+
+class IteratedGreedy:
+    """Destroy-and-repair solver built on the greedy from approx.py."""
+
+    def __init__(self, n: int, subsets: List[Set[int]], seed: int = 42,
+                 destroy_fraction: float = 0.2, threshold_ratio: float = 0.01,
+                 multipliers: Optional[List[float]] = None):
+        self.n = n
+        self.subsets = subsets
+        self.seed = seed
+        self.destroy_fraction = destroy_fraction
+        self.threshold_ratio = threshold_ratio
+        self.rng = random.Random(seed)
+        self.elem_subsets = build_element_index(n, subsets)
+
+        # With Lagrangian multipliers, repair ties go to low reduced cost columns
+        self.reduced_costs = reduced_costs(subsets, multipliers) if multipliers is not None else None
+
+    def _tiebreak(self) -> List[float]:
+        """Fresh random tie-break keys so equal-gain subsets are picked in random order."""
+        rand = self.rng.random
+        if self.reduced_costs is not None:
+            # Reduced cost decides, with noise small enough to only reorder near-equal columns
+            return [c + 0.01 * rand() for c in self.reduced_costs]
+        return [rand() for _ in range(len(self.subsets))]
+
+    def _repair(self, sol: Solution, freed, randomized: bool = True) -> List[int]:
+        """Greedily re-cover the freed elements that lost all coverage; returns added subsets."""
+        count = sol.cover_count
+        uncovered = {e for e in freed if count[e] == 0}
+        if not uncovered:
+            return []
+        tiebreak = self._tiebreak() if randomized else None
+        added = greedy_cover(self.subsets, uncovered, self.elem_subsets, tiebreak)
+        for i in added:
+            sol.add(i)
+        return added
+
+    def _drop_redundant(self, sol: Solution) -> List[int]:
+        """Remove subsets whose elements are all covered by others, in random order."""
+        count = sol.cover_count
+        members = sol.members()
+        self.rng.shuffle(members)
+        dropped = []
+        for i in members:
+            if all(count[e] > 1 for e in self.subsets[i]):
+                sol.remove(i)
+                dropped.append(i)
+        return dropped
+
+    def _destroy(self, sol: Solution, operator: str) -> List[int]:
+        """Pick the subsets removed from the cover by the given operator."""
+        members = sol.members()
+        k = max(1, int(math.ceil(self.destroy_fraction * len(members))))
+
+        if operator == "random":
+            return self.rng.sample(members, min(k, len(members)))
+
+        if operator == "region":
+            # Element region: cover subsets sharing elements with a random member, largest overlap first
+            seed_set = self.subsets[self.rng.choice(members)]
+            overlap = {}
+            for e in seed_set:
+                for i in self.elem_subsets[e]:
+                    if i in sol:
+                        overlap[i] = overlap.get(i, 0) + 1
+            region = sorted(overlap, key=lambda i: (-overlap[i], self.rng.random()))
+            return region[:k]
+
+        # "weakest": subsets covering the fewest elements on their own, with random noise
+        count = sol.cover_count
+        weakness = {i: sum(1 for e in self.subsets[i] if count[e] == 1) + self.rng.random()
+                    for i in members}
+        return sorted(members, key=weakness.get)[:k]
+
+    def _pick_operator(self, weights: List[float]) -> int:
+        return self.rng.choices(range(len(DESTROY_OPERATORS)), weights=weights, k=1)[0]
+
+    def solve(self, cutoff_time: float, start_time: float, initial_solution: Optional[List[int]] = None,
+              lower_bound: Optional[int] = None) -> Tuple[int, List[int], List[Tuple[float, int]]]:
+        """Destroy and repair until the cutoff, or until the best cover reaches lower_bound (proven optimal)."""
+        self.rng.seed(self.seed)
+
+        # Given cover (completed if needed) or plain Approx greedy start, then strip redundant sets
+        sol = Solution(self.n, self.subsets, initial_solution or ())
+        self._repair(sol, range(1, self.n + 1), randomized=False)
+        self._drop_redundant(sol)
+        if not sol.is_feasible():
+            # Instance cannot be covered; report the greedy's partial cover
+            return len(sol), sorted(sol.members()), [(time.time() - start_time, len(sol))]
+
+        curr_cost = len(sol)
+        best_cost, best_sol = curr_cost, sol.members()
+        trace = [(time.time() - start_time, best_cost)]
+
+        weights = [1.0] * len(DESTROY_OPERATORS)
+
+        while True:
+            elapsed = time.time() - start_time
+            if elapsed >= cutoff_time or (lower_bound is not None and best_cost <= lower_bound):
+                break
+
+            op = self._pick_operator(weights)
+            removed = self._destroy(sol, DESTROY_OPERATORS[op])
+            freed = set()
+            for i in removed:
+                sol.remove(i)
+                freed.update(self.subsets[i])
+            added = self._repair(sol, freed)
+            dropped = self._drop_redundant(sol)
+            new_cost = len(sol)
+
+            # Threshold accepting: allow slightly worse covers early, none at the end of the cutoff. Costs are
+            # whole sets, so the threshold is rounded and at least one set over the first half of the cutoff,
+            # otherwise small covers (ratio * cost < 1) could never move uphill
+            threshold = round(max(1.0, self.threshold_ratio * best_cost) * (1 - elapsed / cutoff_time))
+            if new_cost < best_cost:
+                score = SCORE_BEST
+            elif new_cost < curr_cost:
+                score = SCORE_BETTER
+            elif new_cost <= curr_cost + threshold:
+                score = SCORE_ACCEPTED
+            else:
+                score = SCORE_REJECTED
+
+            if score > SCORE_REJECTED:
+                curr_cost = new_cost
+                if new_cost < best_cost:
+                    best_cost, best_sol = new_cost, sol.members()
+                    trace.append((time.time() - start_time, best_cost))
+            else:
+                # Undo in reverse order of the changes
+                for i in dropped:
+                    sol.add(i)
+                for i in added:
+                    sol.remove(i)
+                for i in removed:
+                    sol.add(i)
+
+            weights[op] = max(MIN_WEIGHT, (1 - REACTION) * weights[op] + REACTION * score)
+
+        return best_cost, sorted(best_sol), trace
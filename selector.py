@@ -0,0 +1,47 @@
+"""
+This file trains the algorithm selector used by exec.py -alg Auto (core/selection.py) on the experiment
+sweeps, and shows what it would pick. The features of every instance the sweeps cover are extracted, the
+per-algorithm median scores and runtimes are attached to them, and the model is written as JSON. With
+-inst, the selection for each instance at the given cutoff is printed along with the training instances
+it was based on.
+
+Usage:
+python selector.py [-data data] [-results experiment_data] [-out experiment_data/selector.json] [-inst <file_or_directory> -time <cutoff>]
+
+The default directories are those of the repository, wherever the script is run from.
+"""
+
+import os
+import argparse
+
+from core.selection import (DEFAULT_DATA_DIR, DEFAULT_MODEL_PATH, DEFAULT_RESULTS_DIR, save_model,
+                            select_for_instance, train_model)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-data", type=str, default=DEFAULT_DATA_DIR, help="Directory containing the .in files of the sweeps")
+    parser.add_argument("-results", type=str, default=DEFAULT_RESULTS_DIR, help="Directory containing <alg>_results.csv")
+    parser.add_argument("-out", type=str, default=DEFAULT_MODEL_PATH, help="Model file to write")
+    parser.add_argument("-inst", type=str, default=None, help="Instance file or directory to select for")
+    parser.add_argument("-time", type=float, default=600, help="Cutoff the selection is made for")
+    args = parser.parse_args()
+
+    model = train_model(args.data, args.results)
+    save_model(model, args.out)
+    print(f"Trained on {len(model['instances'])} instances, model written to {args.out}")
+
+    if args.inst is None:
+        return
+    if os.path.isdir(args.inst):
+        paths = [os.path.join(args.inst, f) for f in sorted(os.listdir(args.inst)) if f.endswith(".in")]
+    else:
+        paths = [args.inst]
+    for path in paths:
+        selection = select_for_instance(path, args.time, model)
+        options = " ".join(f"-{k}" if v is True else f"-{k} {v}" for k, v in selection.params.items())
+        print(f"{os.path.basename(path):<15} {selection.alg:<7} {options:<20} like {', '.join(selection.neighbours)}")
+
+
+if __name__ == "__main__":
+    main()
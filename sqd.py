@@ -1,45 +1,26 @@
 import os
+import numpy as np
 import matplotlib.pyplot as plt
-import csv
+from analytics import read_optima, load_traces, solution_quality_distribution
 
 # Constants
-trace_dir = "experiment_data"  # Location where the CSV files are stored
+trace_dir = "output"  # Location where the .trace files are stored
+data_dir = "data"
 output_dir = "graphs"
 os.makedirs(output_dir, exist_ok=True)
 
-# Read results from the CSV file
-def read_results(filename):
-    results = []
-    with open(filename, 'r') as file:
-        reader = csv.reader(file)
-        header = next(reader)  # Skip the header row
-        for row in reader:
-            if len(row) == 4:
-                instance, run_id, optimal, runtime = row
-                try:
-                    run_id = int(run_id)
-                    optimal = int(optimal)
-                    runtime = float(runtime)
-                    results.append((instance, run_id, optimal, runtime))
-                except ValueError:
-                    # Handle any rows where conversion fails
-                    print(f"[!] Skipping invalid row: {row}")
-    return results
-
-# Read LS1 and LS2 result files
-ls1_results = read_results("experiment_data/LS1_results.csv")
-ls2_results = read_results("experiment_data/LS2_results.csv")
-
-# Combine the results of both LS1 and LS2
-results = ls1_results + ls2_results
+# Read LS1 and LS2 traces together with the known optima
+optima = read_optima(data_dir)
+runs = [run for run in load_traces(trace_dir, algorithms=["LS1", "LS2"]) if run.instance in optima]
 
 # Function to compute solution quality distribution
-def compute_sqd(results, time_threshold):
+def compute_sqd(runs, time_threshold):
+    # Relative error of each run's best solution found by the time threshold
     solution_qualities = []
-    for instance, run_id, optimal, runtime in results:
-        if runtime <= time_threshold:  # Only consider runs completed within the time threshold
-            solution_quality = (optimal - runtime) / optimal  # Define solution quality as relative difference
-            solution_qualities.append(solution_quality)
+    for run in runs:
+        quality = solution_quality_distribution([run], optima[run.instance], [time_threshold])[0, 0]
+        if not np.isnan(quality):  # Only consider runs that had a solution by the time threshold
+            solution_qualities.append(quality)
     return solution_qualities
 
 # Plot Solution Quality Distributions (SQD)
@@ -47,14 +28,14 @@ time_thresholds = [5, 10, 15, 20]  # Define time thresholds in seconds
 for time_threshold in time_thresholds:
     plt.figure(figsize=(8, 6))
 
-    # Compute solution quality for all runs under the time threshold
-    solution_qualities = compute_sqd(results, time_threshold)
+    # Compute solution quality for all runs at the time threshold
+    solution_qualities = compute_sqd(runs, time_threshold)
 
     # Plot the distribution of solution qualities
     plt.hist(solution_qualities, bins=20, alpha=0.75, color='blue', label=f'Time ≤ {time_threshold}s')
 
     plt.title(f"Solution Quality Distribution for Time ≤ {time_threshold}s")
-    plt.xlabel("Solution Quality (Relative to Optimal)")
+    plt.xlabel("Relative Error (Score - Optimal) / Optimal")
     plt.ylabel("Frequency")
     plt.grid(True)
     plt.legend()
@@ -0,0 +1,36 @@
+"""
+Runs written by core/output.py must stay readable by analytics.load_traces, whatever extra they record.
+"""
+from analytics import load_traces
+from certify import read_solution
+from core.output import ArchiveWriter, LegacyWriter, export_legacy
+
+
+def test_proven_trace_loads(tmp_path):
+    LegacyWriter(str(tmp_path)).add_run("large1", "LS1", 60, 50, [0, 2], [(0.1, 52), (0.4, 50)], 42,
+                                        lower_bound=50, proven=True)
+    runs = load_traces(str(tmp_path))
+    assert len(runs) == 1
+    assert list(runs[0].scores) == [52, 50]
+    assert (tmp_path / "large1_LS1_60_42.trace").read_text().splitlines()[-1] == "proven"
+    assert (tmp_path / "large1_LS1_60_42.sol").read_text() == "50\n1 3\n"
+    assert read_solution(str(tmp_path / "large1_LS1_60_42.sol")) == (50, [1, 3])
+
+
+def test_labelled_trace_loads(tmp_path):
+    LegacyWriter(str(tmp_path)).add_run("large12", "Hybrid", 10, 17, [1], [(0.01, 18), (0.39, 17)], 42,
+                                        sources=["Approx", "LS1"], proven=True)
+    runs = load_traces(str(tmp_path))
+    assert [list(run.scores) for run in runs] == [[18, 17]]
+    assert (tmp_path / "large12_Hybrid_10_42.source").read_text().split() == ["Approx", "LS1"]
+
+
+def test_exported_archive_loads(tmp_path):
+    archive = str(tmp_path / "runs.zip")
+    writer = ArchiveWriter(archive)
+    writer.add_run("large12", "Hybrid", 10, 17, [1], [(0.01, 18), (0.39, 17)], 42, sources=["Approx", "LS1"],
+                   proven=True)
+    writer.close()
+    out = tmp_path / "out"
+    assert export_legacy(archive, str(out)) == 1
+    assert [list(run.scores) for run in load_traces(str(out))] == [[18, 17]]
@@ -0,0 +1,303 @@
+"""
+This file tunes the simulated annealing parameters (LS1/config.py) for a class of instances with iterated
+racing, in the style of irace. Each iteration races a population of configurations over a stream of
+(instance, seed) pairs: every surviving configuration is run on the next pair, runs are ranked per pair by
+final cover size and then by the time the cover was first reached, and once enough pairs are in, a
+Friedman test followed by a rank-sum post-hoc comparison drops the configurations that are significantly
+worse than the best one. The next iteration keeps the elites and samples new configurations around them
+with a shrinking spread. Runs of one stage go to a process pool in parallel, and results are reused when
+an elite meets the same pair again. The best configuration is written as a JSON file for
+exec.py -alg LS1 -config <file>.
+
+Usage:
+python tune.py -inst <training_directory> -time <cutoff_per_run> -budget <runs> [-configs <k>] [-iterations <i>] [-j <workers>] [-seed <seed>] [-out <file>]
+"""
+
+import os
+import math
+import time
+import random
+import argparse
+from statistics import NormalDist
+from concurrent.futures import ProcessPoolExecutor
+
+from core.loader import load_instance
+from LS1.config import DEFAULT_CONFIG, PARAM_SPACE, save_config, validate_config
+from LS1.sa_core import SimulatedAnnealing
+
+DEFAULT_CONFIGS = 16        # Configurations raced per iteration
+DEFAULT_ITERATIONS = 3
+DEFAULT_ELITES = 4          # Survivors carried into the next iteration
+FIRST_TEST = 5              # Pairs every configuration sees before the first elimination test
+ALPHA = 0.05
+
+
+"""
+Random configuration drawn uniformly from the parameter space
+"""
+def sample_config(rng):
+    config = {}
+    for name, (kind, low, high) in PARAM_SPACE.items():
+        if kind == "log":
+            config[name] = math.exp(rng.uniform(math.log(low), math.log(high)))
+        elif kind == "int":
+            config[name] = rng.randint(low, high)
+        elif kind == "real":
+            config[name] = rng.uniform(low, high)
+        else:
+            # Move probabilities: adaptive half of the time, otherwise a random point of the simplex
+            config[name] = None if rng.random() < 0.5 else _normalize([rng.uniform(low, high) for _ in range(3)])
+    return validate_config(config)
+
+
+"""
+Configuration sampled around a parent, each parameter moved by a normal step of `spread` times its range
+"""
+def perturb_config(parent, rng, spread):
+    config = {}
+    for name, (kind, low, high) in PARAM_SPACE.items():
+        value = parent[name]
+        if kind == "log":
+            step = rng.gauss(0, spread * (math.log(high) - math.log(low)))
+            config[name] = min(high, max(low, math.exp(math.log(value) + step)))
+        elif kind == "int":
+            config[name] = int(round(min(high, max(low, value + rng.gauss(0, spread * (high - low))))))
+        elif kind == "real":
+            config[name] = min(high, max(low, value + rng.gauss(0, spread * (high - low))))
+        elif value is None or rng.random() < spread:
+            # Occasionally flip between adaptive and fixed move probabilities
+            config[name] = _normalize([rng.uniform(low, high) for _ in range(3)]) if value is None else None
+        else:
+            config[name] = _normalize([min(high, max(low, p + rng.gauss(0, spread))) for p in value])
+    return validate_config(config)
+
+
+def _normalize(probs):
+    total = sum(probs)
+    probs = [p / total for p in probs]
+    # Absorb rounding so validate_config sees an exact sum of 1
+    probs[2] = 1.0 - probs[0] - probs[1]
+    return tuple(probs)
+
+
+"""
+Run LS1 with one configuration on one instance; returns (cover size, time the cover was first reached).
+Runs in a worker process, where the loader keeps each instance parsed across runs
+"""
+def evaluate(config, inst_path, seed, cutoff):
+    instance = load_instance(inst_path)
+    sa = SimulatedAnnealing.from_config(instance.n, instance.sets(), config, seed=seed)
+    best_score, _, trace = sa.solve(cutoff, time.time())
+    return best_score, trace[-1][0] if trace else cutoff
+
+
+"""
+Average ranks (1 = best) of the results of one (instance, seed) pair, ties sharing their mean rank
+"""
+def rank_block(results):
+    order = sorted(range(len(results)), key=results.__getitem__)
+    ranks = [0.0] * len(results)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and results[order[j + 1]] == results[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2 + 1
+        i = j + 1
+    return ranks
+
+
+def _gamma_q(a, x):
+    """Regularized upper incomplete gamma function Q(a, x)."""
+    if x <= 0:
+        return 1.0
+    log_prefix = a * math.log(x) - x - math.lgamma(a)
+    if x < a + 1:
+        # Series for P(a, x)
+        term = total = 1.0 / a
+        ap = a
+        for _ in range(1000):
+            ap += 1
+            term *= x / ap
+            total += term
+            if abs(term) < abs(total) * 1e-12:
+                break
+        return max(0.0, 1.0 - total * math.exp(log_prefix))
+    # Continued fraction for Q(a, x) (modified Lentz)
+    tiny = 1e-300
+    b = x + 1 - a
+    c, d = 1 / tiny, 1 / b
+    h = d
+    for i in range(1, 1000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-12:
+            break
+    return min(1.0, h * math.exp(log_prefix))
+
+
+"""
+Friedman test over blocks (one list of results per pair, one result per configuration).
+Returns (p-value, rank sums); ties are corrected for
+"""
+def friedman(blocks):
+    b, k = len(blocks), len(blocks[0])
+    rank_sums = [0.0] * k
+    ties = 0.0
+    for block in blocks:
+        ranks = rank_block(block)
+        for j, r in enumerate(ranks):
+            rank_sums[j] += r
+        for r in set(ranks):
+            t = ranks.count(r)
+            ties += t ** 3 - t
+    denom = 1 - ties / (b * (k ** 3 - k))
+    if denom <= 0:
+        # Every pair is a complete tie
+        return 1.0, rank_sums
+    stat = (12 / (b * k * (k + 1)) * sum(r * r for r in rank_sums) - 3 * b * (k + 1)) / denom
+    return _gamma_q((k - 1) / 2, stat / 2), rank_sums
+
+
+"""
+Race configs over the pairs; returns the surviving config indices, best first, and the runs spent.
+`results` caches (config key, pair index) -> result across races
+"""
+def race(configs, pairs, cutoff, budget, pool, results, alpha=ALPHA):
+    keys = [repr(sorted(c.items())) for c in configs]
+    alive = list(range(len(configs)))
+    spent, seen = 0, 0
+
+    def run_stage(stage_pairs):
+        nonlocal spent
+        jobs = {}
+        for p in stage_pairs:
+            for c in alive:
+                if (keys[c], p) not in results:
+                    inst_path, seed = pairs[p]
+                    jobs[(keys[c], p)] = pool.submit(evaluate, configs[c], inst_path, seed, cutoff)
+        for key, job in jobs.items():
+            results[key] = job.result()
+        spent += len(jobs)
+
+    while seen < len(pairs) and len(alive) > 1:
+        # All configurations see the first pairs together, then one pair per stage
+        stage = range(seen, min(len(pairs), FIRST_TEST if seen == 0 else seen + 1))
+        if spent + len(alive) * len(stage) > budget:
+            break
+        run_stage(stage)
+        seen = stage[-1] + 1
+        if seen < FIRST_TEST:
+            continue
+
+        blocks = [[results[(keys[c], p)] for c in alive] for p in range(seen)]
+        p_value, rank_sums = friedman(blocks)
+        if p_value < alpha:
+            # Drop configurations whose rank sum is significantly above the best one
+            k = len(alive)
+            critical = NormalDist().inv_cdf(1 - alpha) * math.sqrt(seen * k * (k + 1) / 6)
+            best = min(rank_sums)
+            alive = [c for c, r in zip(alive, rank_sums) if r - best <= critical]
+
+    blocks = [[results[(keys[c], p)] for c in alive] for p in range(seen)]
+    rank_sums = [0.0] * len(alive)
+    for block in blocks:
+        for j, r in enumerate(rank_block(block)):
+            rank_sums[j] += r
+    ordered = [c for _, c in sorted(zip(rank_sums, alive))]
+    return ordered, spent, seen
+
+
+"""
+Smallest budget with which every iteration can run its first stage, all configurations on FIRST_TEST pairs
+"""
+def min_budget(n_configs, iterations):
+    return n_configs * FIRST_TEST * iterations
+
+
+"""
+Iterated racing from the default configuration plus random ones; returns (best config, metadata)
+"""
+def tune(inst_paths, cutoff, budget, n_configs=DEFAULT_CONFIGS, iterations=DEFAULT_ITERATIONS,
+         workers=None, seed=42, n_elites=DEFAULT_ELITES):
+    # With less, a race stops before its first stage and the untouched default would come out as tuned
+    if n_configs < 2 or budget < min_budget(n_configs, iterations):
+        raise ValueError(f"Racing {n_configs} configurations over {iterations} iterations needs at least 2 "
+                         f"configurations and a budget of {min_budget(max(n_configs, 2), iterations)} runs")
+    rng = random.Random(seed)
+
+    # Stream of (instance, seed) pairs: the training set in shuffled rounds, with a fresh seed per pair
+    max_pairs = max(FIRST_TEST, budget // 2)
+    pairs = []
+    while len(pairs) < max_pairs:
+        round_paths = list(inst_paths)
+        rng.shuffle(round_paths)
+        pairs.extend((path, rng.randrange(2 ** 31)) for path in round_paths)
+    pairs = pairs[:max_pairs]
+
+    configs = [validate_config(DEFAULT_CONFIG)] + [sample_config(rng) for _ in range(n_configs - 1)]
+    results, used, seen = {}, 0, 0
+    elites = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for it in range(iterations):
+            if it > 0:
+                # Keep the elites, refill around them with a spread that shrinks every iteration
+                spread = 0.2 * (1 - it / iterations)
+                configs = elites + [perturb_config(rng.choice(elites), rng, spread)
+                                    for _ in range(n_configs - len(elites))]
+            iteration_budget = (budget - used) // (iterations - it)
+            ordered, spent, seen = race(configs, pairs, cutoff, iteration_budget, pool, results)
+            used += spent
+            elites = [configs[c] for c in ordered[:n_elites]]
+            print(f"Iteration {it + 1}: {spent} runs over {seen} pairs, {len(ordered)} survivors")
+            if used >= budget:
+                break
+
+    meta = {"instances": sorted(inst_paths), "cutoff": cutoff, "runs": used, "pairs": seen, "seed": seed}
+    return elites[0], meta
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-inst", type=str, required=True, help="Directory of training .in files")
+    parser.add_argument("-time", type=float, required=True, help="Cutoff of every tuning run in seconds")
+    parser.add_argument("-budget", type=int, required=True, help="Total number of tuning runs")
+    parser.add_argument("-configs", type=int, default=DEFAULT_CONFIGS, help="Configurations raced per iteration")
+    parser.add_argument("-iterations", type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument("-j", type=int, default=None, help="Number of worker processes")
+    parser.add_argument("-seed", type=int, default=42)
+    parser.add_argument("-out", type=str, default=os.path.join("output", "LS1_tuned.json"))
+    args = parser.parse_args()
+    # Every iteration races at least two configurations through the first stage
+    if args.iterations < 1:
+        parser.error("-iterations must be at least 1")
+    if args.configs < 2:
+        parser.error("-configs must be at least 2")
+    if args.budget < min_budget(args.configs, args.iterations):
+        parser.error(f"-budget must be at least {min_budget(args.configs, args.iterations)} for {args.configs} "
+                     f"configurations over {args.iterations} iterations (configs * {FIRST_TEST} * iterations)")
+
+    inst_paths = [os.path.join(args.inst, f) for f in sorted(os.listdir(args.inst)) if f.endswith(".in")]
+    if not inst_paths:
+        print(f"No .in files in {args.inst}")
+        return
+
+    start_time = time.time()
+    best, meta = tune(inst_paths, args.time, args.budget, args.configs, args.iterations, args.j, args.seed)
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    save_config(best, args.out, meta)
+    print(f"Wrote {args.out} after {meta['runs']} runs in {time.time() - start_time:.1f} seconds")
+    for name, value in best.items():
+        print(f"  {name} = {value}")
+
+
+if __name__ == "__main__":
+    main()